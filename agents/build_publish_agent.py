@@ -1,13 +1,6 @@
 import json
-from langchain.agents import create_agent
-from tools.build_publish_tool import build_push_tool
-from langchain_core.messages import HumanMessage
 
-from helpers.config_loader import get_llm
-
-llm = get_llm()
-
-TOOLS_BUILD_PUSH = [build_push_tool]
+from helpers.registry import register, get_resource
 
 SYSTEM_PROMPT_BUILD_PUSH = """
 You are BuildPushAgent.
@@ -25,21 +18,32 @@ If you have already called `build_push_tool` and received its result, STOP.
 Return it as-is and end the run.
 """
 
-# Create the agent
-build_push_agent = create_agent(
-    model=llm,
-    tools=TOOLS_BUILD_PUSH,
-    system_prompt=SYSTEM_PROMPT_BUILD_PUSH
-)
 
-# Prevent recursion
-build_push_agent.config = {"recursion_limit": 10}
+def _build_agent():
+    from langchain.agents import create_agent
+    from tools.build_publish_tool import build_push_tool
+    from helpers.config_loader import get_llm
+
+    # Create the agent
+    build_push_agent = create_agent(
+        model=get_llm("build_push"),
+        tools=[build_push_tool],
+        system_prompt=SYSTEM_PROMPT_BUILD_PUSH
+    )
+
+    # Prevent recursion
+    build_push_agent.config = {"recursion_limit": 10}
+    return build_push_agent
+
+
+register("agent:build_push", _build_agent)
 
 
 def run_build_push_agent(app_type: str, image_name_tag: str, workspace_path: str, raw_dockerfile: str = None):
     """
     Run the build & push agent once safely.
     """
+    from langchain_core.messages import HumanMessage
     payload = {
         "app_type": app_type,
         "image_name_tag": image_name_tag,
@@ -47,7 +51,7 @@ def run_build_push_agent(app_type: str, image_name_tag: str, workspace_path: str
         "raw_dockerfile": raw_dockerfile
     }
 
-    result = build_push_agent.invoke({"messages": [HumanMessage(content=json.dumps(payload))]})
+    result = get_resource("agent:build_push").invoke({"messages": [HumanMessage(content=json.dumps(payload))]})
     # Extract the content safely
     if isinstance(result, HumanMessage):
         output = result.content
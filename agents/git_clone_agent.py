@@ -1,11 +1,4 @@
-from langchain_groq import ChatGroq
-from langchain.agents import create_agent
-from langchain_core.messages import HumanMessage
-from tools.git_clone_tool import clone_repository_tool
-
-# Initialize Groq LLM (ensure your GROQ_API_KEY is set)
-from helpers.config_loader import get_llm
-llm = get_llm()
+from helpers.registry import register, get_resource
 
 system_prompt = """
 You are an AI DevOps assistant.
@@ -13,15 +6,26 @@ When the user asks to clone a repository, call the clone_repository_tool.
 Ensure you are running only ONCE and return the response quick
 """
 
-# Create the agent
-git_clone_agent = create_agent(
-    model=llm,
-    tools=[clone_repository_tool],
-    system_prompt=system_prompt,
-)
 
-# Prevent recursion
-git_clone_agent.config = {"recursion_limit": 5, "stop_on_first_tool": True, }
+def _build_agent():
+    # Imported here: langchain, the tool and the LLM client load on first use, not with the page
+    from langchain.agents import create_agent
+    from tools.git_clone_tool import clone_repository_tool
+    from helpers.config_loader import get_llm
+
+    # Create the agent
+    git_clone_agent = create_agent(
+        model=get_llm("git_clone"),
+        tools=[clone_repository_tool],
+        system_prompt=system_prompt,
+    )
+
+    # Prevent recursion
+    git_clone_agent.config = {"recursion_limit": 5, "stop_on_first_tool": True, }
+    return git_clone_agent
+
+
+register("agent:git_clone", _build_agent)
 
 import re
 
@@ -62,6 +66,7 @@ def run_git_clone_agent(git_url: str, app_type: str):
     """
     Executes the agent to perform Git clone operation.
     """
+    from langchain_core.messages import HumanMessage
     query = f"Clone the repository from {git_url} for a {app_type} application."
-    result = git_clone_agent.invoke({"messages": [HumanMessage(content=query)]})
+    result = get_resource("agent:git_clone").invoke({"messages": [HumanMessage(content=query)]})
     return _extract_tool_output(result)
@@ -1,7 +1,4 @@
 # agents/git_pr_agent.py
-from langchain_groq import ChatGroq
-from langchain.agents import create_agent
-from langchain_core.messages import HumanMessage
 from helpers.git_pr_helper import create_pull_request
 
 import logging
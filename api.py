@@ -0,0 +1,282 @@
+# api.py
+"""
+Headless HTTP API for the onboarding pipeline.
+
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+Every POST /jobs/<stage> submits a job and returns 202 with its id; the work runs on a
+thread pool in the replica that accepted it. Poll GET /jobs/{id} or stream
+GET /jobs/{id}/events (server-sent events). Job state lives only in the job store
+(JOB_STORE), so replicas sharing a store can sit behind one load balancer.
+An identical submission while the first is still running returns the running job.
+"""
+import os
+import json
+import asyncio
+import tempfile
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+
+from helpers.job_store import get_job_store, StageCache, TERMINAL_STATUSES, JOB_STORE
+from helpers.onboarding_pipeline import build_onboarding_pipeline
+from helpers.registry import warm_up, loaded_resources, WARMUP_ON_START
+from helpers.metrics import render as render_metrics
+from helpers.profiling import profile_stages
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# API configuration
+# -------------------------------
+API_WORKERS = int(os.getenv("API_WORKERS", 8))
+API_EVENT_POLL_SECONDS = float(os.getenv("API_EVENT_POLL_SECONDS", 0.5))
+# Directories a client-supplied workspace_path may live in (os.pathsep separated); clones go to the temp dir
+API_WORKSPACE_ROOTS = [os.path.realpath(p) for p in
+                       os.getenv("API_WORKSPACE_ROOTS", tempfile.gettempdir()).split(os.pathsep) if p]
+
+# pipeline values returned to clients; loaded classes and raw templates stay server side
+RESULT_VALUES = ["workspace_path", "app_type", "dockerfile_path", "dockerfile_source", "build_result",
+                 "generated", "pull_request"]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # clients/models load lazily; warm them in the background so startup stays fast
+    if WARMUP_ON_START:
+        warm_up(background=True)
+    yield
+
+
+app = FastAPI(title="AI Application Onboarding API", lifespan=lifespan)
+store = get_job_store()
+# clone / docker / LLM work blocks; keep it off the event loop
+executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="api-job")
+_tasks = set()
+
+
+# -------------------------------
+# Request models
+# -------------------------------
+class JobOptions(BaseModel):
+    # stage names (or "all") to profile; artifacts are listed under "profiles" in the result
+    profile: List[str] = Field(default_factory=list)
+
+
+class WorkspaceRequest(JobOptions):
+    workspace_path: str
+
+    @field_validator("workspace_path")
+    @classmethod
+    def _checkout_under_workspace_roots(cls, value: str) -> str:
+        # stages read, write and push from this path: only accept checkouts the clone stage could have made
+        path = os.path.realpath(value)
+        if not any(path != root and os.path.commonpath([path, root]) == root for root in API_WORKSPACE_ROOTS):
+            raise ValueError(f"workspace_path must be inside {os.pathsep.join(API_WORKSPACE_ROOTS)}")
+        if not os.path.isdir(os.path.join(path, ".git")):
+            raise ValueError("workspace_path is not a cloned repository")
+        return path
+
+
+class CloneRequest(JobOptions):
+    git_url: str
+
+
+class DockerfileRequest(WorkspaceRequest):
+    app_type: str = "auto"
+
+
+class BuildRequest(WorkspaceRequest):
+    image_tag: str
+    app_type: str = "auto"
+
+
+class YamlsRequest(WorkspaceRequest):
+    app_name: str
+    image_tag: str
+    envs: List[str] = Field(default_factory=lambda: ["dev"])
+    app_type: str = "auto"
+
+
+class PullRequestRequest(WorkspaceRequest):
+    git_url: str
+
+
+class PipelineRequest(JobOptions):
+    git_url: str
+    app_name: str
+    image_tag: str
+    envs: List[str] = Field(default_factory=lambda: ["dev"])
+    app_type: str = "auto"
+    build: bool = True
+    create_pr: bool = False
+
+
+# -------------------------------
+# Job execution
+# -------------------------------
+def _event_payload(event: Dict) -> Dict:
+    outputs = {k: v for k, v in (event.get("outputs") or {}).items() if k in RESULT_VALUES}
+    return dict({k: v for k, v in event.items() if k != "outputs"}, **({"outputs": outputs} if outputs else {}))
+
+
+def _execute(job_id: str, initial: Dict, targets: Optional[List[str]], build: bool, create_pr: bool,
+             profile: List[str]) -> Dict:
+    # stages already completed with identical inputs (by any earlier job) are reused
+    pipeline = build_onboarding_pipeline(build=build, create_pr=create_pr, stage_cache=StageCache(store, job_id))
+    if targets:
+        pipeline = pipeline.subset(targets, list(initial))
+    with profile_stages(profile):
+        run = pipeline.run(initial, on_event=lambda event: store.add_event(job_id, _event_payload(event)))
+    return {
+        "status": run["status"],
+        "failed_stage": run["failed_stage"],
+        "error": run["error"],
+        "values": {k: run["values"][k] for k in RESULT_VALUES if k in run["values"]},
+        "timeline": run["timeline"],
+        "wall_s": run["wall_s"],
+        "breakdown": run["breakdown"],
+        "profiles": run["profiles"],
+    }
+
+
+# The store is synchronous (SQLite waits up to busy_timeout on a lock): never call it on the event loop
+async def _store(method: str, *args, **kwargs):
+    return await asyncio.to_thread(getattr(store, method), *args, **kwargs)
+
+
+async def _run_job(job_id: str, initial: Dict, targets: Optional[List[str]], build: bool, create_pr: bool,
+                   profile: List[str]):
+    await _store("update", job_id, status="running")
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(executor, _execute, job_id, initial, targets, build, create_pr, profile)
+        await _store("update", job_id, status=result["status"], result=result, error=result["error"])
+    except Exception as e:
+        logger.error(f"❌ Job {job_id} crashed: {e}", exc_info=True)
+        await _store("update", job_id, status="failed", error=str(e))
+
+
+async def _submit(kind: str, request: JobOptions, initial: Dict, targets: Optional[List[str]] = None,
+                  build: bool = True, create_pr: bool = False) -> JSONResponse:
+    job = await _store("create", kind, request.model_dump())
+    if job.get("attached"):
+        # identical request already queued/running (double click, client retry): join it
+        return JSONResponse(status_code=202, content={
+            "job_id": job["id"],
+            "status": job["status"],
+            "attached": True,
+            "status_url": f"/jobs/{job['id']}",
+            "events_url": f"/jobs/{job['id']}/events",
+        })
+    task = asyncio.get_running_loop().create_task(_run_job(job["id"], initial, targets, build, create_pr,
+                                                           request.profile))
+    # keep a reference until done so the task is not garbage collected mid-run
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return JSONResponse(status_code=202, content={
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": f"/jobs/{job['id']}",
+        "events_url": f"/jobs/{job['id']}/events",
+    })
+
+
+# -------------------------------
+# Endpoints
+# -------------------------------
+@app.post("/jobs/clone", status_code=202)
+async def submit_clone(req: CloneRequest):
+    return await _submit("clone", req, {"git_url": req.git_url}, targets=["clone"])
+
+
+@app.post("/jobs/dockerfile", status_code=202)
+async def submit_dockerfile(req: DockerfileRequest):
+    return await _submit("dockerfile", req, {"workspace_path": req.workspace_path, "app_type_hint": req.app_type},
+                         targets=["dockerfile"])
+
+
+@app.post("/jobs/build", status_code=202)
+async def submit_build(req: BuildRequest):
+    # build against the Dockerfile already in the workspace rather than regenerating it
+    dockerfile_path = os.path.join(req.workspace_path, "Dockerfile")
+    initial = {"workspace_path": req.workspace_path, "app_type_hint": req.app_type, "image_tag": req.image_tag}
+    if os.path.exists(dockerfile_path):
+        initial["dockerfile_path"] = dockerfile_path
+    return await _submit("build", req, initial, targets=["build"])
+
+
+@app.post("/jobs/yamls", status_code=202)
+async def submit_yamls(req: YamlsRequest):
+    return await _submit("yamls", req, {"workspace_path": req.workspace_path, "app_type_hint": req.app_type,
+                                        "app_name": req.app_name, "envs": req.envs, "image_tag": req.image_tag},
+                         targets=["yamls"])
+
+
+@app.post("/jobs/pull-request", status_code=202)
+async def submit_pull_request(req: PullRequestRequest):
+    # the artefacts are already in the workspace; mark their stages as done
+    initial = {"workspace_path": req.workspace_path, "git_url": req.git_url, "generated": {}, "build_result": {}}
+    return await _submit("pull_request", req, initial, targets=["pull_request"], create_pr=True)
+
+
+@app.post("/jobs/pipeline", status_code=202)
+async def submit_pipeline(req: PipelineRequest):
+    return await _submit("pipeline", req, {"git_url": req.git_url, "app_type_hint": req.app_type,
+                                           "app_name": req.app_name, "envs": req.envs, "image_tag": req.image_tag},
+                         build=req.build, create_pr=req.create_pr)
+
+
+@app.get("/jobs")
+async def list_jobs(limit: int = 50):
+    return await _store("list", limit=limit)
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await _store("get", job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"job {job_id} not found")
+    return job
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, since: int = 0):
+    """Server-sent events: one `data:` line per stage event, then `event: end` with the final job."""
+    if not await _store("get", job_id):
+        raise HTTPException(status_code=404, detail=f"job {job_id} not found")
+
+    async def stream():
+        seq = since
+        while True:
+            # read the status first so events written just before completion are not missed
+            job = await _store("get", job_id)
+            for event in await _store("events", job_id, since=seq):
+                seq = event["seq"] + 1
+                yield f"id: {event['seq']}\ndata: {json.dumps(event, default=str)}\n\n"
+            if job["status"] in TERMINAL_STATUSES:
+                yield f"event: end\ndata: {json.dumps(job, default=str)}\n\n"
+                return
+            await asyncio.sleep(API_EVENT_POLL_SECONDS)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint: stage durations, external call latencies, LLM tokens."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok", "job_store": JOB_STORE, "workers": API_WORKERS, "running_jobs": len(_tasks),
+            "loaded_resources": loaded_resources()}
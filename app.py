@@ -1,12 +1,21 @@
 import streamlit as st
 from agents.git_clone_agent import run_git_clone_agent
-from agents.dockerfile_agent import run_dockerfile_agent
 from agents.build_publish_agent import run_build_push_agent
 from agents.generate_env_yamls_agent import run_generate_env_yamls_agent
 from agents.git_pr_agent import run_git_pr_agent
+from helpers.app_type_detector import detect_app_type
+from helpers.service_discovery import discover_services
+from helpers.monorepo_onboarding import onboard_services
+from helpers.onboarding_pipeline import run_onboarding_pipeline
+from helpers.pipeline import format_timeline
+from helpers.background_jobs import get_background_runner
+from helpers.registry import warm_up, WARMUP_ON_START
+from helpers.metrics import serve_metrics
+from helpers.profiling import profile_stages
 
 import os
 import json
+import threading
 from dotenv import load_dotenv
 # Load environment variables from .env
 load_dotenv()
@@ -17,141 +26,450 @@ st.title("🤖 AI Application Onboarding Platform")
 st.markdown("Seamlessly onboard your applications into Kubernetes!")
 
 # -------------------------------
-# Step 1: Get Inputs
+# Background jobs
 # -------------------------------
-st.header("1️⃣ Repository Details")
+# Slow steps run on the shared background runner; the page only polls their progress.
+# Job ids are mirrored into the URL so a refreshed page picks them up again.
+@st.cache_resource
+def get_runner():
+    # one runner (thread pool + job store handle) for every session of this server
+    return get_background_runner()
+
+
+runner = get_runner()
+
+
+@st.cache_resource
+def start_warm_up():
+    # agents, LLM clients, the embedder and the Qdrant client are built on first use;
+    # build them in the background now so the first click doesn't pay for it
+    return warm_up(background=True) if WARMUP_ON_START else None
+
+
+start_warm_up()
+
+
+@st.cache_resource
+def start_metrics_server():
+    # Prometheus text on METRICS_PORT (if set), shared by every session of this server
+    return serve_metrics()
+
+
+start_metrics_server()
+JOB_LABELS = {
+    "clone": "📦 Clone",
+    "build": "🚀 Build & publish",
+    "yamls": "📄 Kubernetes YAMLs",
+    "services": "🧭 All services",
+    "pull_request": "🔀 Pull request",
+    "pipeline": "⚡ Pipeline",
+}
+if "jobs" not in st.session_state:
+    st.session_state.jobs = {kind: st.query_params[kind] for kind in JOB_LABELS if kind in st.query_params}
+    st.session_state.handled_jobs = set()
+
+
+def start_job(kind: str, request: dict, fn, *args, **kwargs):
+    job = runner.submit(kind, request, fn, *args, **kwargs)
+    st.session_state.jobs[kind] = job["id"]
+    st.query_params[kind] = job["id"]
+    if job.get("attached"):
+        st.info(f"⏳ {JOB_LABELS[kind]} with the same inputs is already running, following it.")
+
+
+def _progress(kind: str, progress: dict):
+    """(fraction or None, text) for the latest progress of a job."""
+    if kind == "clone" and "clone" in progress:
+        p = progress["clone"]
+        return p.get("percent", 0) / 100, f"{p.get('phase', 'cloning')} {p.get('percent', 0)}%"
+    if kind == "build" and "build" in progress:
+        p = progress["build"]
+        if p.get("phase") == "push":
+            return 1.0, "pushing image"
+        if p.get("total"):
+            return p["step"] / p["total"], f"step {p['step']}/{p['total']}: {p.get('line', '')}"
+    if "yamls" in progress and progress["yamls"].get("total"):
+        p = progress["yamls"]
+        return p["done"] / p["total"], f"{p['done']}/{p['total']} files rendered"
+    if progress:
+        latest = max(progress.values(), key=lambda e: e.get("ts", 0))
+        return None, f"{latest['stage']}: " + ", ".join(f"{k}={v}" for k, v in latest.items()
+                                                      if k not in ("type", "stage", "seq", "ts"))
+    return None, ""
+
+
+def on_job_done(kind: str, job: dict):
+    """Copy a finished job's result into the session so the step sections can show it."""
+    result = job.get("result")
+    if job["status"] != "success":
+        st.session_state[f"{kind}_error"] = job.get("error") or job["status"]
+        return
+    st.session_state.pop(f"{kind}_error", None)
+    if kind == "clone":
+        st.session_state.clone_output = result
+        for output in result or []:
+            # Extract workspace path
+            st.session_state.workspace_path = output.get("workspace_path", None)
+        if st.session_state.get("workspace_path"):
+            st.session_state.detected_app_type = detect_app_type(st.session_state.workspace_path)
+            st.session_state.services = discover_services(st.session_state.workspace_path)
+    elif kind == "pipeline" and result:
+        if result["values"].get("workspace_path"):
+            st.session_state.workspace_path = result["values"]["workspace_path"]
+        st.session_state.pipeline_result = result
+    else:
+        st.session_state[f"{kind}_result"] = result
+
+
+def jobs_panel():
+    for kind, job_id in list(st.session_state.jobs.items()):
+        job = runner.status(job_id)
+        if not job:
+            continue
+        fraction, text = _progress(kind, job["progress"])
+        cols = st.columns([5, 1])
+        with cols[0]:
+            if not job["done"]:
+                st.progress(fraction or 0.0, text=f"{JOB_LABELS[kind]} — {job['status']} {text}")
+            elif job["status"] == "success":
+                st.caption(f"✅ {JOB_LABELS[kind]} finished")
+            else:
+                st.caption(f"❌ {JOB_LABELS[kind]} {job['status']}: {job.get('error') or ''}")
+        with cols[1]:
+            if not job["done"] and st.button("Cancel", key=f"cancel-{job_id}"):
+                runner.cancel(job_id)
+        if job["done"] and job_id not in st.session_state.handled_jobs:
+            st.session_state.handled_jobs.add(job_id)
+            on_job_done(kind, job)
+            st.rerun()
+
+
+PREVIEW_CACHE_ENTRIES = int(os.getenv("PREVIEW_CACHE_ENTRIES", 512))
+
+
+@st.cache_resource
+def _preview_cache():
+    # path -> (mtime_ns, text), shared by all sessions; a plain dict because a
+    # st.cache_data lookup per file costs more than reading a small YAML
+    return {}, threading.Lock()
+
+
+previews, previews_lock = _preview_cache()
+
+
+def read_preview(path: str) -> str:
+    """File contents for st.code, re-read only when the file changes (keyed by path + mtime)."""
+    mtime = os.stat(path).st_mtime_ns
+    hit = previews.get(path)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    with open(path, "r", encoding="utf-8") as fh:
+        text = fh.read()
+    with previews_lock:
+        if len(previews) >= PREVIEW_CACHE_ENTRIES:
+            previews.pop(next(iter(previews)), None)
+        previews[path] = (mtime, text)
+    return text
+
+
+def current_app_type() -> str:
+    # Auto-detect resolves to the type found in the cloned workspace
+    choice = st.session_state.get("app_type_choice", "Auto-detect")
+    if choice == "Auto-detect":
+        return (st.session_state.get("detected_app_type") or {}).get("app_type") or "Auto-detect"
+    return choice
+
+
+active = any(not (runner.status(j) or {"done": True})["done"] for j in st.session_state.jobs.values())
+if st.session_state.jobs:
+    st.subheader("⏳ Jobs")
+    # poll once a second while something runs; a finished job reruns the whole page once
+    st.fragment(jobs_panel, run_every=1.0 if active else None)()
+
+# Every step is a fragment: a widget change reruns only its own step, not the YAML
+# previews and the other sections. Values other steps need live in st.session_state
+# (widget keys); actions that change what other steps show rerun the whole page.
 
-git_url = st.text_input("🔗 Enter your Git Repository URL", placeholder="https://github.com/org/sample-app.git")
-app_type = st.selectbox("⚙️ Select Application Type", ["Select Type", "NodeJS", "Python", "Java", ".NET"], index=0)
-st.session_state.app_type = app_type
-st.session_state.git_url = git_url
 # -------------------------------
-# Step 2: Clone Button
+# Step 1: Get Inputs
 # -------------------------------
-if st.button("📦 Clone Repository"):
-    if not git_url or app_type == "Select Type":
-        st.warning("⚠️ Please provide both Git URL and Application Type.")
-    else:
-        with st.spinner("🧠 Cloning repository... please wait..."):
-            try:
-                result = run_git_clone_agent(git_url, app_type)
-                st.success("✅ Clone Completed Successfully!")
-                for output in result:
-                    st.text_area("Agent Output", value=output, height=150)
-                    # Extract workspace path
-                    workspace_path = output.get('workspace_path', None)
-                    st.session_state.workspace_path = workspace_path
-            except Exception as e:
-                st.error(f"❌ Clone Failed: {e}")
+@st.fragment
+def repository_step():
+    st.header("1️⃣ Repository Details")
 
+    git_url = st.text_input("🔗 Enter your Git Repository URL", placeholder="https://github.com/org/sample-app.git",
+                            key="git_url")
+    app_type_choice = st.selectbox("⚙️ Select Application Type", ["Auto-detect", "NodeJS", "Python", "Java", ".NET"],
+                                   index=0, key="app_type_choice")
+    # -------------------------------
+    # Step 2: Clone Button
+    # -------------------------------
+    if st.button("📦 Clone Repository"):
+        if not git_url:
+            st.warning("⚠️ Please provide the Git URL.")
+        else:
+            start_job("clone", {"git_url": git_url, "app_type": app_type_choice}, run_git_clone_agent, git_url, app_type_choice)
+            st.rerun()
 
-st.header("2️⃣ Dockerfile Generation")
+    if st.session_state.get("clone_error"):
+        st.error(f"❌ Clone Failed: {st.session_state.clone_error}")
+    elif st.session_state.get("clone_output"):
+        st.success("✅ Clone Completed Successfully!")
+        for output in st.session_state.clone_output:
+            st.text_area("Agent Output", value=output, height=150)
+        detected = st.session_state.get("detected_app_type") or {}
+        if detected.get("app_type"):
+            st.info(f"🔎 Detected **{detected['app_type']}** (confidence {detected['confidence']:.0%}) "
+                    f"from {', '.join(detected['markers'][:5])} in {detected['elapsed_ms']} ms")
+        elif detected:
+            st.warning("⚠️ Could not detect the application type, please select it manually.")
+        services = st.session_state.get("services") or []
+        if len(services) > 1:
+            st.info(f"🧭 Found {len(services)} services: "
+                    + ", ".join(f"{s['name']} ({s['app_type']}, `{s['path']}`)" for s in services))
 
-if st.button("🛠️ Generate Dockerfile"):
-    if not git_url or app_type == "Select Type":
-        st.warning("⚠️ Please provide Git URL and Application Type first.")
-    else:
-        with st.spinner("Generating Dockerfile..."):
+    detected = st.session_state.get("detected_app_type") or {}
+    if app_type_choice != "Auto-detect" and detected.get("app_type") and detected["app_type"] != app_type_choice:
+        st.warning(f"⚠️ Selected {app_type_choice} but the workspace looks like {detected['app_type']}.")
+
+
+@st.fragment
+def dockerfile_step():
+    st.header("2️⃣ Dockerfile Generation")
+
+    app_type = current_app_type()
+    workspace_path = st.session_state.get("workspace_path", None)
+    if st.button("🛠️ Generate Dockerfile"):
+        if not st.session_state.get("git_url") or app_type == "Auto-detect":
+            st.warning("⚠️ Please clone the repository (or select the Application Type) first.")
+        else:
             try:
-                workspace_path = st.session_state.get("workspace_path", None)
+                from tools.dockerfile_tool import DockerfileGeneration
                 st.code(workspace_path, language="dockerfile")
-                dockerfile_path = run_dockerfile_agent(app_type, workspace_path)  # workspace_path from clone step
-                st.success(f"✅ Dockerfile saved at: {dockerfile_path}")
-                st.code(open(dockerfile_path).read(), language="dockerfile")
+                # Stream tokens into the page as they arrive; the file is finalized once complete
+                generation = DockerfileGeneration(app_type, workspace_path)  # workspace_path from clone step
+                preview = st.empty()
+                text = ""
+                for chunk in generation:
+                    text += chunk
+                    preview.code(text, language="dockerfile")
+                st.success(f"✅ Dockerfile saved at: {generation.file_path}")
+                st.caption(
+                    f"Source: {generation.metrics['source']} · first token {generation.metrics['time_to_first_token_s']}s"
+                    f" · total {generation.metrics['total_s']}s"
+                )
+                return
             except Exception as e:
                 st.error(f"❌ Dockerfile generation failed: {e}")
 
+    dockerfile_path = os.path.join(workspace_path, "Dockerfile") if workspace_path else None
+    if dockerfile_path and os.path.exists(dockerfile_path):
+        with st.expander("📄 Current Dockerfile"):
+            st.code(read_preview(dockerfile_path), language="dockerfile")
+
+
 # ===========================================
 # Step 3: Build & Publish Image
 # ===========================================
-st.header("3 Build & Publish Docker Image")
-
-registry_input = st.text_input("🏷️ Enter Image Tag (e.g., shan5a6/myapp:v1.0.0)")
-workspace_path = st.session_state.get("workspace_path", None)
-st.session_state.image_tag = registry_input
-if st.button("🚀 Build & Publish Image"):
-    if not registry_input or not workspace_path:
-        st.warning("⚠️ Please provide Image Tag and ensure the repo is cloned.")
-    else:
-        with st.spinner("Building and pushing Docker image..."):
-            try:
-                result = run_build_push_agent(app_type, registry_input, workspace_path)
-                st.success("✅ Build & Publish Completed!")
-            except Exception as e:
-                st.error(f"❌ Build & Publish Failed: {e}")
+@st.fragment
+def build_step():
+    st.header("3 Build & Publish Docker Image")
+
+    registry_input = st.text_input("🏷️ Enter Image Tag (e.g., shan5a6/myapp:v1.0.0)", key="image_tag")
+    workspace_path = st.session_state.get("workspace_path", None)
+    app_type = current_app_type()
+    if st.button("🚀 Build & Publish Image"):
+        if not registry_input or not workspace_path:
+            st.warning("⚠️ Please provide Image Tag and ensure the repo is cloned.")
+        else:
+            start_job("build", {"app_type": app_type, "image_tag": registry_input, "workspace_path": workspace_path},
+                      run_build_push_agent, app_type, registry_input, workspace_path)
+            st.rerun()
+
+    if st.session_state.get("build_error"):
+        st.error(f"❌ Build & Publish Failed: {st.session_state.build_error}")
+    elif st.session_state.get("build_result"):
+        st.success("✅ Build & Publish Completed!")
+
 
 # ===========================================
 # Step 4: Generate YAML Files
 # ===========================================
+@st.fragment
+def yamls_step():
+    st.header("Generate environment-specific Kubernetes YAMLs")
 
-st.markdown('<div class="card">', unsafe_allow_html=True)
-st.header("Generate environment-specific Kubernetes YAMLs")
+    app_name = st.text_input("Application Name", placeholder="myapp", key="app_name")
+    app_type = current_app_type()
+    envs = st.multiselect("Select environments", ["dev", "sit", "uat", "pt", "preprod", "prod"], default=["dev"],
+                          key="envs")
+    workspace_path = st.session_state.get("workspace_path", None)
+    image_tag = st.session_state.get("image_tag")
 
-app_name = st.text_input("Application Name", placeholder="myapp")
-app_type = st.session_state.get("app_type")
-envs = st.multiselect("Select environments", ["dev", "sit", "uat", "pt", "preprod", "prod"], default=["dev"])
-workspace_path = st.session_state.get("workspace_path", None)
-image_tag = st.session_state.image_tag
-
-if st.button("Generate YAMLs for environments"):
-    if not app_name or not envs:
-        st.warning("Provide application name and select environments.")
-    else:
-        if not os.path.exists(workspace_path):
+    if st.button("Generate YAMLs for environments"):
+        if not app_name or not envs:
+            st.warning("Provide application name and select environments.")
+        elif not workspace_path or not os.path.exists(workspace_path):
             st.error(f"Workspace path not found: {workspace_path}")
         else:
-            with st.spinner("Generating YAMLs..."):
-                try:
-                    print("Calling run_generate_env_yamls_agent")
-                    result = run_generate_env_yamls_agent(app_type, app_name, envs, workspace_path, image_tag=image_tag )
-                    # result is JSON string
+            print("Calling run_generate_env_yamls_agent")
+            start_job("yamls", {"app_type": app_type, "app_name": app_name, "envs": envs,
+                                "workspace_path": workspace_path, "image_tag": image_tag},
+                      run_generate_env_yamls_agent, app_type, app_name, envs, workspace_path, image_tag=image_tag)
+            st.rerun()
+
+
+@st.fragment
+def yamls_preview():
+    if st.session_state.get("yamls_error"):
+        st.error(f"Error: {st.session_state.yamls_error}")
+    elif st.session_state.get("yamls_result"):
+        result = st.session_state.yamls_result
+        # result is JSON string
+        try:
+            j = json.loads(result)
+        except Exception:
+            j = None
+            st.error("Agent returned non-JSON output.")
+            st.text_area("Raw output", value=str(result), height=300)
+
+        if j and j.get("status") == "success":
+            st.success("YAMLs generated successfully.")
+            generated = j.get("generated", {})
+            for env, files in generated.items():
+                st.subheader(f"{env} — {len(files)} files")
+                for f in files:
+                    st.markdown(f"**{os.path.basename(f)}** — `{f}`")
                     try:
-                        j = json.loads(result)
-                    except Exception:
-                        st.error("Agent returned non-JSON output.")
-                        st.text_area("Raw output", value=str(result), height=300)
-                        st.markdown('</div>', unsafe_allow_html=True)
-                        raise st.stop()
-
-                    if j.get("status") == "success":
-                        st.success("YAMLs generated successfully.")
-                        generated = j.get("generated", {})
-                        for env, files in generated.items():
-                            st.subheader(f"{env} — {len(files)} files")
-                            for f in files:
-                                st.markdown(f"**{os.path.basename(f)}** — `{f}`")
-                                try:
-                                    st.code(open(f, "r", encoding="utf-8").read(), language="yaml")
-                                except Exception as e:
-                                    st.text(f"Could not read file: {e}")
-                        st.session_state.k8s_generated = generated
-                    else:
-                        st.error(f"Generation failed: {j.get('error')}")
-                        st.text_area("Tool output", value=json.dumps(j, indent=2), height=300)
-                except Exception as e:
-                    st.error(f"Error: {e}")
+                        st.code(read_preview(f), language="yaml")
+                    except Exception as e:
+                        st.text(f"Could not read file: {e}")
+            st.session_state.k8s_generated = generated
+        elif j:
+            st.error(f"Generation failed: {j.get('error')}")
+            st.text_area("Tool output", value=json.dumps(j, indent=2), height=300)
+
+
+# ===========================================
+# Monorepo: onboard every service in parallel
+# ===========================================
+@st.fragment
+def services_step():
+    services = st.session_state.get("services") or []
+    if len(services) <= 1:
+        return
+    st.header("🧭 Onboard all services")
+    st.caption("Dockerfile, image and manifests per service, written under each service directory.")
+    build_images = st.checkbox("Build & push images", value=True)
+    workspace_path = st.session_state.get("workspace_path")
+    app_name, envs, image_tag = (st.session_state.get(k) for k in ("app_name", "envs", "image_tag"))
+    if st.button("Onboard all services"):
+        if not app_name or not envs or not image_tag:
+            st.warning("Provide image tag, application name and environments first.")
+        else:
+            start_job("services", {"workspace_path": workspace_path, "app_name": app_name, "envs": envs,
+                                   "image_tag": image_tag, "build": build_images},
+                      onboard_services, workspace_path, app_name, envs, image_tag, services=services, build=build_images)
+            st.rerun()
+    summary = st.session_state.get("services_result")
+    if st.session_state.get("services_error"):
+        st.error(f"❌ {st.session_state.services_error}")
+    elif summary:
+        st.caption(f"Wall time {summary['wall_s']}s vs {summary['sum_s']}s sequential")
+        for res in summary["services"]:
+            if res["status"] == "success":
+                st.success(f"✅ {res['service']} → {res['image']} {res['timings']}")
+            else:
+                st.error(f"❌ {res['service']}: {res.get('step', '')} {res.get('error')}")
+
 
-st.markdown('</div>', unsafe_allow_html=True)
 # ===========================================
 # Step 5: Raise a Pull Request
 # ===========================================
+@st.fragment
+def pull_request_step():
+    st.header("🚀 AI Onboarding: Create Git Pull Request")
 
-st.header("🚀 AI Onboarding: Create Git Pull Request")
+    workspace_path = st.session_state.get("workspace_path")
+    git_remote = st.session_state.get("git_url")  # dynamically from UI session
+    print(f"provide giturl is {git_remote}")
 
-workspace_path = st.session_state.get("workspace_path")
-git_remote = st.session_state.get("git_url")  # dynamically from UI session
-print(f"provide giturl is {git_remote}")
+    if st.button("Create Pull Request"):
+        if not workspace_path or not git_remote:
+            st.warning("⚠️ Workspace path or Git URL not set.")
+        else:
+            start_job("pull_request", {"workspace_path": workspace_path, "git_remote": git_remote},
+                      run_git_pr_agent, workspace_path, git_remote)
+            st.rerun()
 
-if st.button("Create Pull Request"):
-    if not workspace_path or not git_remote:
-        st.warning("⚠️ Workspace path or Git URL not set.")
-    else:
-        with st.spinner("Creating pull request..."):
-            result = run_git_pr_agent(workspace_path, git_remote)
-            if result.get("success"):
-                st.success(result.get("message"))
-            else:
-                st.error(result.get("message") or result.get("error") or "❌ Unknown failure.")
+    result = st.session_state.get("pull_request_result")
+    if st.session_state.get("pull_request_error"):
+        st.error(f"❌ {st.session_state.pull_request_error}")
+    elif result:
+        if result.get("success"):
+            st.success(result.get("message"))
+        else:
+            st.error(result.get("message") or result.get("error") or "❌ Unknown failure.")
+
+
+# ===========================================
+# One click: every step as a parallel pipeline
+# ===========================================
+def _pipeline_job(git_url, app_name, envs, image_tag, app_type, create_pr, profile):
+    with profile_stages(["all"] if profile else []):
+        run = run_onboarding_pipeline(git_url, app_name, envs, image_tag, app_type=app_type, create_pr=create_pr)
+    # the loaded generator class and raw templates are not worth keeping in the job store
+    run["values"] = {k: v for k, v in run["values"].items() if k not in ("dockerfile_generator", "k8s_templates")}
+    return run
+
+
+@st.fragment
+def pipeline_step():
+    st.header("⚡ Run the whole onboarding")
+    st.caption("Clone, Dockerfile, build and YAMLs in one go; YAMLs render while the image builds.")
+    create_pr = st.checkbox("Raise the pull request at the end", value=False)
+    profile = st.checkbox("Profile every stage", value=False,
+                          help="Writes a .pstats and a collapsed-stack flamegraph file per stage next to the workspace")
+    git_url, app_name, envs, image_tag, app_type_choice = (
+        st.session_state.get(k) for k in ("git_url", "app_name", "envs", "image_tag", "app_type_choice"))
+
+    if st.button("Run pipeline"):
+        if not git_url or not app_name or not envs or not image_tag:
+            st.warning("⚠️ Provide Git URL, image tag, application name and environments first.")
+        else:
+            start_job("pipeline", {"git_url": git_url, "app_name": app_name, "envs": envs, "image_tag": image_tag,
+                                   "app_type": app_type_choice, "create_pr": create_pr, "profile": profile},
+                      _pipeline_job, git_url, app_name, envs, image_tag, app_type_choice, create_pr, profile)
+            st.rerun()
+
+    run = st.session_state.get("pipeline_result")
+    if st.session_state.get("pipeline_error"):
+        st.error(f"❌ {st.session_state.pipeline_error}")
+    elif run:
+        if run["status"] == "success":
+            st.success(f"✅ Onboarding finished in {run['wall_s']}s ({run['values'].get('app_type')})")
+        else:
+            st.error(f"❌ Stage {run['failed_stage']} failed: {run['error']}")
+        st.code(format_timeline(run["timeline"]), language="text")
+        if run.get("breakdown"):
+            with st.expander("⏱️ Where the time went"):
+                st.json(run["breakdown"], expanded=False)
+        if run.get("profiles"):
+            with st.expander("🔥 Stage profiles"):
+                st.caption("Open .pstats with `python -m pstats` or snakeviz, .collapsed with flamegraph.pl or speedscope.")
+                st.json(run["profiles"], expanded=True)
+
+
+repository_step()
+dockerfile_step()
+build_step()
+st.markdown('<div class="card">', unsafe_allow_html=True)
+yamls_step()
+yamls_preview()
+st.markdown('</div>', unsafe_allow_html=True)
+services_step()
+pull_request_step()
+pipeline_step()
 
 st.markdown("---")
 st.caption("© 2025 AI DevOps Onboarding | Powered by LangChain + Streamlit")
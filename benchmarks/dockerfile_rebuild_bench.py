@@ -0,0 +1,98 @@
+# benchmarks/dockerfile_rebuild_bench.py
+"""
+Compare rebuild time after a one-line source change between the stored template
+(dockerfiles/<app_type>/Dockerfile) and the dependency-first rendered Dockerfile.
+
+Usage:
+    python benchmarks/dockerfile_rebuild_bench.py --workspace /tmp/workspace-x1234 --app-type java \
+        --touch src/main/java/App.java --out bench_rebuild.json
+
+Needs a reachable docker daemon (DOCKER_BIN / DOCKER_HOST are honored).
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers.build_scheduler import DOCKER_BIN
+from helpers.dockerfile_renderer import render_dockerfile, normalize_app_type
+
+MANIFESTS = {"pom.xml", "build.gradle", "build.gradle.kts", "package.json", "package-lock.json",
+             "yarn.lock", "pnpm-lock.yaml", "requirements.txt", "pyproject.toml", "Dockerfile", ".dockerignore"}
+
+
+def _pick_source_file(workspace: str) -> str:
+    for root, dirs, files in os.walk(workspace):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in ("node_modules", "target", "build"))
+        for fname in sorted(files):
+            if fname not in MANIFESTS and fname.endswith((".java", ".js", ".ts", ".py")):
+                return os.path.relpath(os.path.join(root, fname), workspace)
+    raise SystemExit("No source file found to modify; pass --touch")
+
+
+def _build(context: str, tag: str) -> float:
+    start = time.perf_counter()
+    proc = subprocess.run([DOCKER_BIN, "build", "-t", tag, context], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"docker build failed for {tag}:\n{proc.stderr[-2000:]}")
+    return elapsed
+
+
+def bench_variant(name: str, workspace: str, dockerfile_text: str, touch: str) -> dict:
+    ctx = tempfile.mkdtemp(prefix=f"bench-{name}-")
+    try:
+        shutil.copytree(workspace, ctx, dirs_exist_ok=True, ignore=shutil.ignore_patterns(".git"))
+        with open(os.path.join(ctx, "Dockerfile"), "w") as fh:
+            fh.write(dockerfile_text)
+        tag = f"ai-onboard-bench-{name}:latest"
+
+        cold = _build(ctx, tag)
+        with open(os.path.join(ctx, touch), "a") as fh:
+            fh.write("\n// bench edit\n" if not touch.endswith(".py") else "\n# bench edit\n")
+        rebuild = _build(ctx, tag)
+        return {"variant": name, "cold_build_seconds": round(cold, 2), "rebuild_seconds": round(rebuild, 2)}
+    finally:
+        shutil.rmtree(ctx, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workspace", required=True, help="Cloned repository to build")
+    parser.add_argument("--app-type", required=True)
+    parser.add_argument("--touch", help="Source file (relative) to edit between builds")
+    parser.add_argument("--templates", default="dockerfiles", help="Stored templates dir")
+    parser.add_argument("--out", help="Write JSON results here")
+    args = parser.parse_args()
+
+    app_type = normalize_app_type(args.app_type)
+    touch = args.touch or _pick_source_file(args.workspace)
+
+    with open(os.path.join(args.templates, app_type, "Dockerfile")) as fh:
+        template = fh.read()
+    rendered = render_dockerfile(app_type, args.workspace)
+    if not rendered:
+        raise SystemExit(f"No renderer / build manifest for app_type={app_type}")
+
+    results = {
+        "app_type": app_type,
+        "touched_file": touch,
+        "runs": [
+            bench_variant("template", args.workspace, template, touch),
+            bench_variant("rendered", args.workspace, rendered, touch),
+        ],
+    }
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Offline stand-in for the docker CLI calls the build step makes (build, push, tag,
+images, image inspect, history, buildx imagetools inspect, manifest inspect), for
+benchmarks and runs without a daemon. Images live in a small JSON state file:
+
+    DOCKER_BIN=$(python benchmarks/fake_docker.py --install /tmp/fake-docker) python onboard_bulk.py ...
+
+FAKE_DOCKER_BUILD_SECONDS  simulated build time (default 0)
+FAKE_DOCKER_LAYER_MB       uncompressed size reported per Dockerfile instruction (default 10)
+FAKE_DOCKER_STATE          state file (default <tmp>/fake-docker-state.json)
+"""
+import os
+import sys
+import json
+import time
+import stat
+import hashlib
+import argparse
+import tempfile
+from typing import Dict, List
+
+BUILD_SECONDS = float(os.getenv("FAKE_DOCKER_BUILD_SECONDS", 0))
+LAYER_MB = float(os.getenv("FAKE_DOCKER_LAYER_MB", 10))
+STATE_FILE = os.getenv("FAKE_DOCKER_STATE", os.path.join(tempfile.gettempdir(), "fake-docker-state.json"))
+
+
+def install(directory: str) -> str:
+    """Write an executable `docker` shim running this module; returns its path for DOCKER_BIN."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "docker")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(f"#!/bin/sh\nexec \"{sys.executable}\" \"{os.path.abspath(__file__)}\" \"$@\"\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+def _load() -> Dict:
+    try:
+        with open(STATE_FILE, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"images": {}, "pushed": {}}
+
+
+def _save(state: Dict):
+    tmp = f"{STATE_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, STATE_FILE)
+
+
+def _option(args: List[str], name: str) -> List[str]:
+    return [args[i + 1] for i, a in enumerate(args[:-1]) if a == name]
+
+
+def _build(args: List[str], state: Dict) -> int:
+    context = args[-1]
+    dockerfile = (_option(args, "-f") or [os.path.join(context, "Dockerfile")])[0]
+    try:
+        with open(dockerfile, encoding="utf-8") as fh:
+            steps = [l.strip() for l in fh if l.strip() and not l.lstrip().startswith("#")]
+    except OSError as e:
+        print(f"ERROR: failed to read dockerfile: {e}", file=sys.stderr)
+        return 1
+    for n, step in enumerate(steps, 1):
+        # BuildKit plain progress, which the build tool parses into step n/m
+        print(f"#{n + 4} [{n}/{len(steps)}] {step}", file=sys.stderr, flush=True)
+        time.sleep(BUILD_SECONDS / max(1, len(steps)))
+    labels = dict(l.split("=", 1) for l in _option(args, "--label") if "=" in l)
+    image_id = "sha256:" + hashlib.sha256(json.dumps([steps, labels]).encode("utf-8")).hexdigest()
+    for tag in _option(args, "-t"):
+        state["images"][tag] = {"id": image_id, "labels": labels, "steps": steps}
+    _save(state)
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    state = _load()
+    cmd, args = (argv[0], argv[1:]) if argv else ("", [])
+    if cmd == "build":
+        return _build(args, state)
+    if cmd == "push":
+        image = state["images"].get(args[-1])
+        if not image:
+            print(f"An image does not exist locally with the tag: {args[-1]}", file=sys.stderr)
+            return 1
+        state["pushed"][args[-1]] = image
+        _save(state)
+        return 0
+    if cmd == "tag":
+        source = next((i for t, i in state["images"].items() if args[0] in (t, i["id"])), None)
+        if not source:
+            return 1
+        state["images"][args[1]] = source
+        _save(state)
+        return 0
+    if cmd == "images":
+        wanted = dict(f.split("=", 1)[1].split("=", 1) for f in _option(args, "--filter") if f.startswith("label="))
+        ids = {i["id"] for i in state["images"].values() if all(i["labels"].get(k) == v for k, v in wanted.items())}
+        print("\n".join(sorted(ids)))
+        return 0
+    if cmd == "image" and args[:1] == ["inspect"]:
+        image = state["images"].get(args[-1])
+        print(json.dumps(image["labels"]) if image else "null")
+        return 0 if image else 1
+    if cmd == "history":
+        image = state["images"].get(args[-1])
+        if not image:
+            return 1
+        for step in reversed(image["steps"]):
+            print(f"{int(LAYER_MB * 1024 * 1024)}\t{step}")
+        return 0
+    if cmd == "buildx" and args[:2] == ["imagetools", "inspect"]:
+        image = state["pushed"].get(args[-1])
+        if not image:
+            return 1
+        print(json.dumps({"config": {"Labels": image["labels"]}}))
+        return 0
+    if cmd == "manifest" and args[:1] == ["inspect"]:
+        image = state["pushed"].get(args[-1])
+        if not image:
+            return 1
+        print(json.dumps({"layers": [{"size": int(LAYER_MB * 1024 * 1024 / 3)} for _ in image["steps"]]}))
+        return 0
+    return 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--install"]:
+        parser = argparse.ArgumentParser(description="Install a fake docker CLI shim")
+        parser.add_argument("--install", required=True, metavar="DIR")
+        print(install(parser.parse_args().install))
+        sys.exit(0)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,389 @@
+# benchmarks/pipeline_bench.py
+"""
+Offline micro-benchmarks for the onboarding pipeline's hot paths. Nothing external is
+needed: Qdrant runs in local mode (QDRANT_LOCATION=:memory:), the LLM is the fake
+provider, docker is benchmarks/fake_docker.py and the embedder is a deterministic hash
+embedder (--real-embedder loads sentence-transformers instead).
+
+Suites:
+    ingest     k8s template ingest (per template count) and Dockerfile ingest
+    retrieval  fetch_k8s_by_app_and_kind / get_k8s_file / list_all_k8s / fetch_dockerfile
+    yamls      _replace_placeholders, _set_namespace_in_yaml, generate_env_yamls (templates x envs)
+    clone      clone_repository from a local bare repository, full and shallow
+    pr         stage_artifacts on a workspace with generated artefacts and build junk
+    build      build_push_tool against the fake docker CLI
+    dockerfile LLM fallback of DockerfileGeneration (miss and cache hit)
+
+Usage:
+    python benchmarks/pipeline_bench.py --out bench_pipeline.json
+    python benchmarks/pipeline_bench.py --only yamls --templates 10,100 --envs 1,3,6
+    # compare with a result saved on another commit; exit 1 if a median regressed > 20%
+    python benchmarks/pipeline_bench.py --baseline bench_main.json --fail-over 20
+"""
+import io
+import os
+import math
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import platform
+import statistics
+import subprocess
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Everything the helpers read from the environment at import time points into one scratch dir
+WORK = tempfile.mkdtemp(prefix="bench-pipeline-")
+os.environ.update({
+    "QDRANT_LOCATION": ":memory:",
+    "LLM_PROVIDER": "fake",
+    "WARMUP_ON_START": "0",
+    "FAKE_DOCKER_STATE": os.path.join(WORK, "fake-docker-state.json"),
+    "IMAGE_SIZE_HISTORY_FILE": os.path.join(WORK, "image-sizes.json"),
+    "LLM_CACHE_LOCAL_PATH": os.path.join(WORK, "llm-cache.json"),
+    "DIGEST_CACHE_DIR": os.path.join(WORK, "digests"),
+})
+import fake_docker
+os.environ["DOCKER_BIN"] = fake_docker.install(os.path.join(WORK, "bin"))
+
+import logging
+logging.disable(logging.WARNING)
+
+SUITES = ["ingest", "retrieval", "yamls", "clone", "pr", "build", "dockerfile"]
+APP_TYPES = ["java", "nodejs", "python"]
+KINDS = ["deployments", "services", "configmaps", "hpa", "ingress"]
+
+
+class HashEmbedder:
+    """Deterministic 384-dim unit vectors from a text hash: embedding cost without a model download."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def encode(self, text: str):
+        import numpy as np
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dim).astype("float32")
+        return vector / np.linalg.norm(vector)
+
+
+def measure(fn, repeat: int, setup=None, warmup: int = 1) -> dict:
+    """Median / p90 / min of `repeat` timed calls; `setup` runs untimed before every call."""
+    timings = []
+    for n in range(warmup + repeat):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+        if n >= warmup:
+            timings.append(elapsed)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        # nearest rank: never below the median, the slowest run when there are few
+        "p90_ms": round(timings[math.ceil(0.9 * len(timings)) - 1] * 1000, 3),
+        "min_ms": round(timings[0] * 1000, 3),
+        "runs": repeat,
+    }
+
+
+def template_text(app_type: str, kind: str, i: int, lines: int = 40) -> str:
+    body = "".join(f"            - name: VAR_{n}\n              value: \"value-{n}\"\n" for n in range(lines // 2))
+    return (f"apiVersion: apps/v1\nkind: Deployment\nmetadata:\n  name: __APP_NAME__-{kind}-{i}\n"
+            f"  namespace: __NAMESPACE__\n  labels:\n    app: __APP_NAME__\n    tier: {app_type}\n"
+            f"spec:\n  replicas: 2\n  template:\n    spec:\n      containers:\n        - name: __APP_NAME__\n"
+            f"          image: __IMAGE_TAG__\n          env:\n{body}")
+
+
+def make_templates(root: str, count: int) -> str:
+    """k8s-templates/<app_type>/<kind>/<name>.yaml, `count` files spread over app types and kinds."""
+    base = os.path.join(root, f"k8s-templates-{count}")
+    for i in range(count):
+        app_type, kind = APP_TYPES[i % len(APP_TYPES)], KINDS[(i // len(APP_TYPES)) % len(KINDS)]
+        out = os.path.join(base, app_type, kind)
+        os.makedirs(out, exist_ok=True)
+        with open(os.path.join(out, f"object-{i}.yaml"), "w", encoding="utf-8") as fh:
+            fh.write(template_text(app_type, kind, i))
+    return base
+
+
+def template_payloads(count: int):
+    """What fetch_k8s_by_app_and_kind returns, without Qdrant."""
+    return [{"id": i, "payload": {"file_content": template_text("python", KINDS[i % len(KINDS)], i),
+                                  "kind": KINDS[i % len(KINDS)], "object_name": f"object-{i}"}}
+            for i in range(count)]
+
+
+def git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def make_bare_repo(root: str, files: int) -> str:
+    src = os.path.join(root, "src-repo")
+    os.makedirs(os.path.join(src, "app"), exist_ok=True)
+    with open(os.path.join(src, "requirements.txt"), "w") as fh:
+        fh.write("flask==3.0.0\ngunicorn==22.0.0\n")
+    for i in range(files):
+        with open(os.path.join(src, "app", f"module_{i}.py"), "w") as fh:
+            fh.write(f"def handler_{i}(event):\n    return {{'id': {i}, 'ok': True}}\n" * 20)
+    git("init", "-q", "-b", "main", cwd=src)
+    git("-c", "user.email=bench@example.com", "-c", "user.name=bench", "add", ".", cwd=src)
+    git("-c", "user.email=bench@example.com", "-c", "user.name=bench", "commit", "-q", "-m", "initial", cwd=src)
+    bare = os.path.join(root, "bare-repo.git")
+    git("clone", "-q", "--bare", src, bare)
+    return bare
+
+
+def seed_dockerfiles():
+    from helpers.qdrant_helper import inject_dockerfiles_to_qdrant
+    with contextlib.redirect_stdout(io.StringIO()):
+        inject_dockerfiles_to_qdrant(base_dir=os.path.join(ROOT, "dockerfiles"))
+
+
+# -------------------------------
+# Suites: each returns {case name: stats}
+# -------------------------------
+def bench_ingest(args) -> dict:
+    from helpers.qdrant_k8s_helper import inject_k8s_templates
+    from helpers.qdrant_helper import inject_dockerfiles_to_qdrant
+    results = {}
+    for count in args.templates:
+        base = make_templates(WORK, count)
+        results[f"ingest_k8s[templates={count}]"] = measure(
+            lambda: inject_k8s_templates(base_dir=base, collection_name=f"bench_k8s_{count}"), args.repeat)
+    results["ingest_dockerfiles"] = measure(
+        lambda: inject_dockerfiles_to_qdrant(base_dir=os.path.join(ROOT, "dockerfiles")), args.repeat)
+    return results
+
+
+def bench_retrieval(args) -> dict:
+    from helpers.qdrant_k8s_helper import inject_k8s_templates, fetch_k8s_by_app_and_kind, get_k8s_file, list_all_k8s
+    from helpers.qdrant_helper import fetch_dockerfile
+    results = {}
+    seed_dockerfiles()
+    for count in args.templates:
+        collection = f"bench_k8s_{count}"
+        with contextlib.redirect_stdout(io.StringIO()):
+            inject_k8s_templates(base_dir=make_templates(WORK, count), collection_name=collection)
+        results[f"fetch_k8s_by_app[templates={count}]"] = measure(
+            lambda: fetch_k8s_by_app_and_kind("python", limit=500, collection_name=collection), args.repeat)
+        results[f"fetch_k8s_by_app_and_kind[templates={count}]"] = measure(
+            lambda: fetch_k8s_by_app_and_kind("python", "deployments", limit=500, collection_name=collection), args.repeat)
+        results[f"get_k8s_file[templates={count}]"] = measure(
+            lambda: get_k8s_file("python", "deployments", "object-2", collection_name=collection), args.repeat)
+        results[f"list_all_k8s[templates={count}]"] = measure(
+            lambda: list_all_k8s(collection_name=collection, limit=count), args.repeat)
+    results["fetch_dockerfile"] = measure(lambda: fetch_dockerfile("python"), args.repeat)
+    return results
+
+
+def bench_yamls(args) -> dict:
+    from helpers.k8s_env_generator import _replace_placeholders, _set_namespace_in_yaml, generate_env_yamls
+    results = {}
+    sample = template_text("python", "deployments", 0)
+    results["replace_placeholders"] = measure(
+        lambda: [_replace_placeholders(sample, "orders", "orders-dev", image_tag="org/orders:1") for _ in range(100)],
+        args.repeat)
+    results["set_namespace_in_yaml"] = measure(
+        lambda: [_set_namespace_in_yaml(sample, "orders-dev") for _ in range(100)], args.repeat)
+    workspace = os.path.join(WORK, "yamls-workspace")
+    os.makedirs(workspace, exist_ok=True)
+    envs_all = ["dev", "sit", "uat", "pt", "preprod", "prod"]
+    for count in args.templates:
+        templates = template_payloads(count)
+        for n_envs in args.envs:
+            envs = envs_all[:n_envs]
+            results[f"generate_env_yamls[templates={count},envs={n_envs}]"] = measure(
+                lambda: generate_env_yamls("python", "orders", envs, workspace, "org/orders:1", templates=templates),
+                args.repeat)
+    return results
+
+
+def bench_clone(args) -> dict:
+    import helpers.git_helper as git_helper
+    bare = make_bare_repo(WORK, args.files)
+    results = {}
+    for name, depth in (("clone_full", 0), ("clone_depth1", 1)):
+        workspaces = []
+
+        def run():
+            workspaces.append(git_helper.clone_repository(f"file://{bare}"))
+
+        def cleanup():
+            while workspaces:
+                shutil.rmtree(workspaces.pop(), ignore_errors=True)
+
+        git_helper.GIT_CLONE_DEPTH = depth
+        try:
+            results[f"{name}[files={args.files}]"] = measure(run, args.repeat, setup=cleanup)
+        finally:
+            cleanup()
+            git_helper.GIT_CLONE_DEPTH = 0
+    return results
+
+
+def bench_pr(args) -> dict:
+    from git import Repo
+    from helpers.git_pr_helper import stage_artifacts
+    bare = os.path.join(WORK, "bare-repo.git")
+    if not os.path.exists(bare):
+        make_bare_repo(WORK, args.files)
+    workspace = os.path.join(WORK, "pr-workspace")
+    shutil.rmtree(workspace, ignore_errors=True)
+    git("clone", "-q", bare, workspace)
+    generated = [os.path.join(workspace, "Dockerfile"), os.path.join(workspace, ".dockerignore")]
+    for path in generated:
+        with open(path, "w") as fh:
+            fh.write("FROM python:3.12-slim\n" if path.endswith("Dockerfile") else ".git\n")
+    for env in ["dev", "uat", "prod"]:
+        out = os.path.join(workspace, "k8s_configs", env)
+        os.makedirs(out, exist_ok=True)
+        for i in range(max(args.templates)):
+            path = os.path.join(out, f"object-{i}.yaml")
+            with open(path, "w") as fh:
+                fh.write(template_text("python", "deployments", i))
+            generated.append(path)
+    # build outputs the PR must not pick up
+    os.makedirs(os.path.join(workspace, "target"), exist_ok=True)
+    for i in range(args.files):
+        with open(os.path.join(workspace, "target", f"out-{i}.class"), "wb") as fh:
+            fh.write(os.urandom(256))
+
+    repo = Repo(workspace)
+    reset = lambda: repo.git.reset("-q")
+    files = len(generated)
+    return {
+        f"stage_artifacts_pathspecs[files={files}]": measure(lambda: stage_artifacts(repo), args.repeat, setup=reset),
+        f"stage_artifacts_paths[files={files}]": measure(lambda: stage_artifacts(repo, generated), args.repeat,
+                                                         setup=reset),
+    }
+
+
+def bench_build(args) -> dict:
+    from tools.build_publish_tool import build_push_tool
+    workspace = os.path.join(WORK, "build-workspace")
+    os.makedirs(workspace, exist_ok=True)
+    with open(os.path.join(workspace, "requirements.txt"), "w") as fh:
+        fh.write("flask==3.0.0\n")
+    payload = {"workspace_path": workspace, "image_name_tag": "bench/app:1", "app_type": "Python",
+               "raw_dockerfile": "FROM python:3.12-slim\nWORKDIR /app\nCOPY . .\nCMD [\"python\", \"app.py\"]\n"}
+
+    def run(force):
+        result = json.loads(build_push_tool.invoke(json.dumps(dict(payload, force_rebuild=force))))
+        if result.get("status") != "success":
+            raise RuntimeError(f"build failed: {result}")
+
+    return {
+        "build_push_tool[rebuild]": measure(lambda: run(True), args.repeat),
+        # same context hash: retag + push of the local image, no build
+        "build_push_tool[reuse]": measure(lambda: run(False), args.repeat),
+    }
+
+
+def bench_dockerfile(args) -> dict:
+    from tools.dockerfile_tool import DockerfileGeneration
+    seed_dockerfiles()
+    workspace = os.path.join(WORK, "dockerfile-workspace")
+    os.makedirs(workspace, exist_ok=True)
+    with open(os.path.join(workspace, "main.cob"), "w") as fh:
+        fh.write("       IDENTIFICATION DIVISION.\n       PROGRAM-ID. HELLO.\n")
+
+    def run(bypass_cache, expected):
+        generation = DockerfileGeneration("cobol", workspace, bypass_cache=bypass_cache)
+        generation.run()
+        if generation.source != expected:
+            raise RuntimeError(f"expected a {expected} Dockerfile, got {generation.source}")
+
+    # an app type with neither a renderer nor a Qdrant template goes to the LLM
+    return {
+        "dockerfile_llm[miss]": measure(lambda: run(True, "llm"), args.repeat),
+        "dockerfile_llm[cache_hit]": measure(lambda: run(False, "cache"), args.repeat),
+    }
+
+
+BENCHES = {"ingest": bench_ingest, "retrieval": bench_retrieval, "yamls": bench_yamls, "clone": bench_clone,
+           "pr": bench_pr, "build": bench_build, "dockerfile": bench_dockerfile}
+
+
+def _commit() -> dict:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return {"commit": rev or None, "dirty": dirty}
+    except OSError:
+        return {"commit": None, "dirty": None}
+
+
+def compare(report: dict, baseline: dict, fail_over: float) -> bool:
+    """Print median deltas against `baseline`; False if any case got slower than `fail_over` percent."""
+    ok = True
+    print(f"\n📊 vs {baseline.get('commit', '?')[:12] if baseline.get('commit') else 'baseline'}")
+    for name, now in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            print(f"  {name:<55} {now['median_ms']:>10.3f} ms   (new)")
+            continue
+        delta = (now["median_ms"] - before["median_ms"]) / before["median_ms"] * 100 if before["median_ms"] else 0.0
+        flag = ""
+        if fail_over and delta > fail_over:
+            ok, flag = False, "  ❌ regression"
+        print(f"  {name:<55} {before['median_ms']:>10.3f} -> {now['median_ms']:>10.3f} ms  {delta:+6.1f}%{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", choices=SUITES, help="suite to run (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--templates", default="10,100", help="template counts, comma separated")
+    parser.add_argument("--envs", default="1,3,6", help="environment counts, comma separated")
+    parser.add_argument("--files", type=int, default=200, help="source files in the cloned repository")
+    parser.add_argument("--real-embedder", action="store_true", help="use sentence-transformers instead of hashing")
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--fail-over", type=float, default=0.0, help="exit 1 if a median is this many %% slower")
+    args = parser.parse_args()
+    args.templates = [int(n) for n in args.templates.split(",") if n.strip()]
+    args.envs = [int(n) for n in args.envs.split(",") if n.strip()]
+
+    if not args.real_embedder:
+        from helpers.registry import register, EMBED_MODEL_NAME
+        from tools.dockerfile_tool import DOCKERFILE_EMBED_MODEL
+        for model in {EMBED_MODEL_NAME, DOCKERFILE_EMBED_MODEL}:
+            register(f"embedder:{model}", HashEmbedder)
+
+    report = dict(_commit(), python=platform.python_version(), timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                  params={"repeat": args.repeat, "templates": args.templates, "envs": args.envs, "files": args.files,
+                          "embedder": "sentence-transformers" if args.real_embedder else "hash"},
+                  results={})
+    try:
+        for suite in args.only or SUITES:
+            start = time.perf_counter()
+            results = BENCHES[suite](args)
+            report["results"].update(results)
+            print(f"⏱️  {suite} ({time.perf_counter() - start:.1f}s)")
+            for name, stats in results.items():
+                print(f"  {name:<55} median {stats['median_ms']:>10.3f} ms  p90 {stats['p90_ms']:>10.3f} ms")
+    finally:
+        shutil.rmtree(WORK, ignore_errors=True)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            if not compare(report, json.load(fh), args.fail_over):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/repo_digest_bench.py
+"""
+Measure repository digest build time and prompt size.
+
+Usage:
+    # synthetic monorepo: 40 services x 500 source files each
+    python benchmarks/repo_digest_bench.py --services 40 --files-per-service 500 --out bench_digest.json
+    # or real clones
+    python benchmarks/repo_digest_bench.py --workspace /tmp/workspace-x1234 --workspace /tmp/workspace-y5678
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers.repo_digest import build_repo_digest, estimate_tokens
+
+
+def make_monorepo(root: str, services: int, files_per_service: int) -> str:
+    kinds = ["java", "nodejs", "python"]
+    for s in range(services):
+        kind = kinds[s % len(kinds)]
+        svc = os.path.join(root, "services", f"svc-{s:03d}")
+        src = os.path.join(svc, "src")
+        os.makedirs(src, exist_ok=True)
+        if kind == "java":
+            with open(os.path.join(svc, "pom.xml"), "w") as fh:
+                fh.write("<project>\n" + "  <dependency><artifactId>lib</artifactId></dependency>\n" * 200 + "</project>\n")
+        elif kind == "nodejs":
+            with open(os.path.join(svc, "package.json"), "w") as fh:
+                json.dump({"name": f"svc-{s}", "scripts": {"start": "node index.js"},
+                           "dependencies": {f"dep{i}": "^1.0.0" for i in range(100)}}, fh, indent=2)
+            with open(os.path.join(svc, "package-lock.json"), "w") as fh:
+                fh.write(json.dumps({"lockfileVersion": 3, "packages": {f"node_modules/dep{i}": {"version": "1.0.0"}
+                                                                           for i in range(2000)}}, indent=2))
+            os.makedirs(os.path.join(svc, "node_modules", "dep0"), exist_ok=True)
+        else:
+            with open(os.path.join(svc, "requirements.txt"), "w") as fh:
+                fh.write("".join(f"package{i}==1.0.{i}\n" for i in range(80)))
+            with open(os.path.join(svc, "app.py"), "w") as fh:
+                fh.write("print('hello')\n")
+        for f in range(files_per_service):
+            with open(os.path.join(src, f"file_{f}.txt"), "w") as fh:
+                fh.write("x = 1\n" * 20)
+    subprocess.run(["git", "init", "-q", root], check=True)
+    subprocess.run(["git", "-C", root, "add", "-A"], check=True)
+    subprocess.run(["git", "-C", root, "-c", "user.email=bench@local", "-c", "user.name=bench",
+                    "commit", "-q", "-m", "bench"], check=True)
+    return root
+
+
+def bench(workspace: str, budget: int) -> dict:
+    total_bytes = 0
+    for dirpath, _, files in os.walk(workspace):
+        if "/.git" in dirpath:
+            continue
+        total_bytes += sum(os.path.getsize(os.path.join(dirpath, f)) for f in files)
+
+    start = time.perf_counter()
+    cold = build_repo_digest(workspace, token_budget=budget, use_cache=False)
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = build_repo_digest(workspace, token_budget=budget)
+    warm_s = time.perf_counter() - start
+
+    return {
+        "workspace": workspace,
+        "repo_size_mb": round(total_bytes / (1024 * 1024), 2),
+        "naive_prompt_tokens": total_bytes // 4,
+        "digest_tokens": estimate_tokens(cold["text"]),
+        "cold_build_seconds": round(cold_s, 4),
+        "cached_build_seconds": round(warm_s, 4),
+        "cached": warm.get("cached"),
+        "stats": cold["stats"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workspace", action="append", default=[], help="Existing clone(s) to digest")
+    parser.add_argument("--services", type=int, default=30)
+    parser.add_argument("--files-per-service", type=int, default=300)
+    parser.add_argument("--budget", type=int, default=3000)
+    parser.add_argument("--out", help="Write JSON results here")
+    args = parser.parse_args()
+
+    tmp = None
+    workspaces = args.workspace
+    if not workspaces:
+        tmp = tempfile.mkdtemp(prefix="bench-monorepo-")
+        workspaces = [make_monorepo(tmp, args.services, args.files_per_service)]
+    try:
+        results = [bench(w, args.budget) for w in workspaces]
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/startup_bench.py
+"""
+Measure process startup: import time, peak RSS and which heavy libraries get loaded
+for the Streamlit page, the HTTP API and the bulk CLI. Every target runs in a fresh
+interpreter, `--repeat` times; the median is reported.
+
+Usage:
+    python benchmarks/startup_bench.py --out bench_startup.json
+    # also build every registered resource (agents, LLM clients, embedder, Qdrant client)
+    python benchmarks/startup_bench.py --warm
+    # measure another checkout of the repository, e.g. the previous revision
+    git worktree add /tmp/before HEAD~1 && python benchmarks/startup_bench.py --root /tmp/before
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "qdrant_client", "langchain", "langchain_core",
+                 "langchain_groq", "groq", "fastapi"]
+
+# app.py is a Streamlit script: "import" it the way the server does, with a first script run
+TARGETS = {
+    "app": "from streamlit.testing.v1 import AppTest\n"
+           "at = AppTest.from_file('app.py', default_timeout=300).run()\n"
+           "assert not at.exception, at.exception[0].message",
+    "api": "import api",
+    "onboard_bulk": "import onboard_bulk",
+}
+
+PROBE = """
+import sys, time, json, resource
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{code}
+result = {{
+    "import_s": time.perf_counter() - start,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}
+if {warm!r}:
+    start = time.perf_counter()
+    from helpers.registry import warm_up, loaded_resources
+    warm_up(background=False)
+    result["warm_s"] = time.perf_counter() - start
+    result["warm_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result["resources"] = loaded_resources()
+print(json.dumps(result))
+"""
+
+def measure(root: str, name: str, warm: bool) -> dict:
+    code = PROBE.format(root=root, code=TARGETS[name], warm=warm, heavy=HEAVY_MODULES)
+    # background warm-up would race the measurement; --warm times it synchronously instead
+    env = dict(os.environ, WARMUP_ON_START="0")
+    proc = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=ROOT, help="repository checkout to measure")
+    parser.add_argument("--target", action="append", choices=list(TARGETS), help="default: all")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warm", action="store_true", help="also time a synchronous warm-up after import")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.target or list(TARGETS):
+        runs = [measure(os.path.abspath(args.root), name, args.warm) for _ in range(args.repeat)]
+        results[name] = {
+            "import_s": round(statistics.median(r["import_s"] for r in runs), 3),
+            "max_rss_mb": round(statistics.median(r["max_rss_mb"] for r in runs), 1),
+            "modules": runs[-1]["modules"],
+            "heavy_modules": runs[-1]["heavy"],
+        }
+        if args.warm:
+            results[name]["warm_s"] = round(statistics.median(r["warm_s"] for r in runs), 3)
+            results[name]["warm_rss_mb"] = round(statistics.median(r["warm_rss_mb"] for r in runs), 1)
+            results[name]["resources"] = runs[-1]["resources"]
+        print(f"⏱️  {name}: {results[name]}")
+
+    report = {"root": os.path.abspath(args.root), "python": sys.version.split()[0], "results": results}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# benchmarks/ui_rerun_bench.py
+"""
+Measure Streamlit rerun latency of the onboarding UI after a widget change.
+
+Runs the page headless (streamlit.testing) against a generated workspace whose
+envs x files Kubernetes YAMLs are already "generated" and previewed, then edits the
+"Application Name" input repeatedly and times every rerun:
+
+- full: the whole script reruns (what every interaction cost before fragments)
+- fragment: only the fragment holding the input reruns (what Streamlit does now)
+
+Unlike plain AppTest, st.cache_*, registered fragments and the compiled script survive
+between runs here, as they do in a live server.
+
+Usage:
+    python benchmarks/ui_rerun_bench.py --envs 6 --files 12 --runs 20 --out bench_ui.json
+    # compare with another revision of the page
+    git show HEAD~1:app.py > /tmp/app_before.py
+    python benchmarks/ui_rerun_bench.py --app /tmp/app_before.py
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from unittest.mock import MagicMock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.fragment import MemoryFragmentStorage
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.pages_manager import PagesManager
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import parse_tree_from_messages
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner, require_widgets_deltas
+from streamlit.testing.v1.util import patch_config_options
+
+ENVS = ["dev", "sit", "uat", "pt", "preprod", "prod"]
+WIDGET_LABEL = "Application Name"
+
+
+class PersistentAppTest(AppTest):
+    """AppTest whose caches and fragment registry live as long as the test, like a server session."""
+
+    def __init__(self, script_path, default_timeout):
+        super().__init__(script_path, default_timeout=default_timeout)
+        self._runtime = MagicMock(spec=Runtime)
+        self._runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+        self._runtime.cache_storage_manager = MemoryCacheStorageManager()
+        self._fragments = MemoryFragmentStorage()
+        self._script_cache = ScriptCache()
+        self.last_messages = []
+
+    def _runner(self):
+        Runtime._instance = self._runtime
+        pages_manager = PagesManager(self._script_path, self._script_cache, setup_watcher=False)
+        runner = LocalScriptRunner(self._script_path, self.session_state, pages_manager,
+                                   args=self.args, kwargs=self.kwargs)
+        runner._fragment_storage = self._fragments
+        runner._script_cache = self._script_cache
+        return runner
+
+    def _run(self, widget_state=None, timeout=None):
+        runner = self._runner()
+        with patch_config_options({"global.appTest": True}):
+            self._tree = runner.run(widget_state, self.query_params, timeout or self.default_timeout)
+            self._tree._runner = self
+        self.last_messages = runner.forward_msgs()
+        return self
+
+    def run_fragment(self, fragment_id: str, widget_state=None):
+        """Rerun only `fragment_id`, as the browser requests after a widget change inside it."""
+        runner = self._runner()
+        with patch_config_options({"global.appTest": True}):
+            runner.request_rerun(RerunData(widget_states=widget_state, fragment_id_queue=[fragment_id],
+                                           is_fragment_scoped_rerun=True))
+            runner.start()
+            require_widgets_deltas(runner, self.default_timeout)
+        # keep the full page tree; a fragment run only re-sends that fragment's elements
+        return parse_tree_from_messages(runner.forward_msgs())
+
+    def fragment_of(self, label: str):
+        for msg in self.last_messages:
+            if msg.HasField("delta") and msg.delta.new_element.text_input.label == label:
+                return msg.delta.fragment_id or None
+        return None
+
+
+def make_workspace(root: str, envs: int, files: int, lines: int) -> dict:
+    generated = {}
+    for env in ENVS[:envs]:
+        out = os.path.join(root, "k8s", env)
+        os.makedirs(out, exist_ok=True)
+        generated[env] = []
+        for i in range(files):
+            path = os.path.join(out, f"object-{i}.yaml")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(f"apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: object-{i}\ndata:\n")
+                fh.write("".join(f"  key{n}: value-{n}-{'x' * 40}\n" for n in range(lines)))
+            generated[env].append(path)
+    with open(os.path.join(root, "Dockerfile"), "w", encoding="utf-8") as fh:
+        fh.write("FROM python:3.12-slim\nWORKDIR /app\nCOPY . .\nCMD [\"python\", \"app.py\"]\n")
+    return generated
+
+
+def _stats(timings):
+    if not timings:
+        return None
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 1),
+        "p90_ms": round(sorted(timings)[int(0.9 * (len(timings) - 1))] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--envs", type=int, default=6)
+    parser.add_argument("--files", type=int, default=12, help="generated YAML files per environment")
+    parser.add_argument("--lines", type=int, default=200, help="lines per generated YAML file")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    workspace = tempfile.mkdtemp(prefix="bench-ui-")
+    try:
+        generated = make_workspace(workspace, args.envs, args.files, args.lines)
+        os.chdir(ROOT)
+        at = PersistentAppTest(args.app, default_timeout=60)
+        at.session_state["workspace_path"] = workspace
+        at.session_state["yamls_result"] = json.dumps({"status": "success", "generated": generated})
+        start = time.perf_counter()
+        at.run()
+        first = time.perf_counter() - start
+        if at.exception:
+            raise SystemExit(f"app raised: {at.exception[0].message}")
+        fragment_id = at.fragment_of(WIDGET_LABEL)
+
+        full, scoped = [], []
+        for n in range(args.runs):
+            widget = next(w for w in at.text_input if w.label == WIDGET_LABEL)
+            start = time.perf_counter()
+            widget.set_value(f"myapp{n}").run()
+            full.append(time.perf_counter() - start)
+        if fragment_id:
+            for n in range(args.runs):
+                widget = next(w for w in at.text_input if w.label == WIDGET_LABEL)
+                widget.set_value(f"other{n}")
+                start = time.perf_counter()
+                at.run_fragment(fragment_id, at._tree.get_widget_states())
+                scoped.append(time.perf_counter() - start)
+            if at.session_state["app_name"] != f"other{args.runs - 1}":
+                raise SystemExit("fragment rerun did not apply the widget change")
+
+        result = {
+            "app": args.app,
+            "yaml_files": sum(len(v) for v in generated.values()),
+            "first_run_ms": round(first * 1000, 1),
+            "full_rerun": _stats(full),
+            # None: the input is not inside a fragment, every change reruns the full page
+            "fragment_rerun": _stats(scoped),
+            "runs": args.runs,
+        }
+        print(json.dumps(result, indent=2))
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as fh:
+                json.dump(result, fh, indent=2)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import os
+import time
+from typing import Dict, List, Optional
+
+from helpers.repo_digest import SKIP_DIRS
+
+# -------------------------------
+# Detection configuration
+# -------------------------------
+DETECT_MAX_DEPTH = int(os.getenv("DETECT_MAX_DEPTH", 3))
+DETECT_MAX_ENTRIES = int(os.getenv("DETECT_MAX_ENTRIES", 5000))
+
+# Values that mean "work it out from the workspace"
+AUTO_APP_TYPES = {"", "auto", "auto-detect", "select type"}
+
+# marker file -> (app_type as shown in the UI, weight)
+MARKERS = {
+    "pom.xml": ("Java", 1.0),
+    "build.gradle": ("Java", 1.0),
+    "build.gradle.kts": ("Java", 1.0),
+    "settings.gradle": ("Java", 0.5),
+    "mvnw": ("Java", 0.5),
+    "package.json": ("NodeJS", 1.0),
+    "package-lock.json": ("NodeJS", 0.5),
+    "yarn.lock": ("NodeJS", 0.5),
+    "pnpm-lock.yaml": ("NodeJS", 0.5),
+    "requirements.txt": ("Python", 1.0),
+    "pyproject.toml": ("Python", 1.0),
+    "setup.py": ("Python", 0.8),
+    "Pipfile": ("Python", 0.8),
+    "manage.py": ("Python", 0.5),
+}
+SUFFIX_MARKERS = {
+    ".csproj": (".NET", 1.0),
+    ".sln": (".NET", 0.8),
+    ".fsproj": (".NET", 1.0),
+}
+
+
+def _marker(name: str):
+    hit = MARKERS.get(name)
+    if hit:
+        return hit
+    return SUFFIX_MARKERS.get(os.path.splitext(name)[1].lower())
+
+
+def detect_app_type(workspace_path: str, max_depth: int = DETECT_MAX_DEPTH, max_entries: int = DETECT_MAX_ENTRIES) -> Dict:
+    """
+    Breadth-first scan for build marker files. Markers closer to the root weigh more,
+    and the scan stops after the first depth level that contains any marker, after
+    `max_depth` levels, or after `max_entries` directory entries.
+
+    Returns:
+        {"app_type": "Java" | "NodeJS" | "Python" | ".NET" | None,
+         "confidence": 0..1, "ranked": [{"app_type", "score"}...],
+         "markers": ["pom.xml", ...], "entries_scanned": int, "elapsed_ms": float}
+    """
+    start = time.perf_counter()
+    scores: Dict[str, float] = {}
+    markers: List[str] = []
+    scanned = 0
+    level = [""]
+
+    for depth in range(max_depth + 1):
+        next_level = []
+        for rel_dir in level:
+            try:
+                entries = list(os.scandir(os.path.join(workspace_path, rel_dir)))
+            except OSError:
+                continue
+            for entry in entries:
+                scanned += 1
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+                        next_level.append(rel)
+                    continue
+                hit = _marker(entry.name)
+                if hit:
+                    app_type, weight = hit
+                    scores[app_type] = scores.get(app_type, 0.0) + weight / (1 + depth)
+                    markers.append(rel)
+            if scanned >= max_entries:
+                break
+        # the shallowest markers decide; deeper ones are usually examples or tooling
+        if scores or scanned >= max_entries or not next_level:
+            break
+        level = next_level
+
+    total = sum(scores.values())
+    ranked = sorted(({"app_type": t, "score": round(s, 3)} for t, s in scores.items()), key=lambda r: -r["score"])
+    return {
+        "app_type": ranked[0]["app_type"] if ranked else None,
+        "confidence": round(ranked[0]["score"] / total, 2) if ranked else 0.0,
+        "ranked": ranked,
+        "markers": markers,
+        "entries_scanned": scanned,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+def resolve_app_type(app_type: Optional[str], workspace_path: str) -> Optional[str]:
+    """Return app_type as given, or the detected one when it is empty / "auto"."""
+    if (app_type or "").strip().lower() not in AUTO_APP_TYPES:
+        return app_type
+    detected = detect_app_type(workspace_path)
+    print(f"🔎 Detected app_type={detected['app_type']} (confidence {detected['confidence']}) from {detected['markers']}")
+    return detected["app_type"]
@@ -0,0 +1,115 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from helpers.job_store import JobStore, get_job_store, TERMINAL_STATUSES
+from helpers.progress import ProgressReporter, JobCancelled, use_reporter
+from helpers.metrics import collect_timings
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Background execution configuration
+# -------------------------------
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", 8))
+
+
+def _jsonable(value: Any) -> Any:
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return json.loads(json.dumps(value, default=str))
+
+
+class BackgroundRunner:
+    """
+    Runs slow onboarding steps off the caller's thread (the Streamlit script thread) and
+    records them as jobs in the job store, so a page can poll status/progress, start the
+    next independent step meanwhile, or cancel, and a refreshed page can find them again.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, max_workers: int = BACKGROUND_WORKERS):
+        self.store = store or get_job_store()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bg-job")
+        self._reporters: Dict[str, ProgressReporter] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, request: Dict, fn: Callable, *args, **kwargs) -> Dict:
+        """
+        Queue fn(*args, **kwargs) as a job of `kind`. `request` identifies it: an identical
+        request still queued/running is returned instead (double click). Returns the job.
+        """
+        job = self.store.create(kind, request)
+        if job.get("attached"):
+            return job
+        job_id = job["id"]
+        reporter = ProgressReporter(sink=lambda event: self.store.add_event(job_id, event))
+        with self._lock:
+            self._reporters[job_id] = reporter
+        self.executor.submit(self._run, job_id, reporter, fn, args, kwargs)
+        return job
+
+    def _run(self, job_id: str, reporter: ProgressReporter, fn: Callable, args, kwargs):
+        if reporter.cancelled.is_set():
+            self.store.update(job_id, status="cancelled", error="cancelled before start")
+            return
+        self.store.update(job_id, status="running")
+        try:
+            with use_reporter(reporter), collect_timings() as timings:
+                try:
+                    result = fn(*args, **kwargs)
+                finally:
+                    # where the time went, also for failed / cancelled jobs
+                    self.store.add_event(job_id, {"type": "timings", "breakdown": timings.breakdown()})
+            status = "cancelled" if reporter.cancelled.is_set() else "success"
+            self.store.update(job_id, status=status, result=_jsonable(result))
+        except Exception as e:
+            if reporter.cancelled.is_set() or isinstance(e, JobCancelled):
+                self.store.update(job_id, status="cancelled", error="cancelled by user")
+            else:
+                logger.error(f"❌ Background job {job_id} failed: {e}", exc_info=True)
+                self.store.update(job_id, status="failed", error=str(e))
+        finally:
+            with self._lock:
+                self._reporters.pop(job_id, None)
+
+    def cancel(self, job_id: str) -> bool:
+        """Stop a queued/running job of this process: no new steps start, subprocesses are terminated."""
+        with self._lock:
+            reporter = self._reporters.get(job_id)
+        if not reporter:
+            return False
+        reporter.cancel()
+        return True
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """The job plus "progress" (the latest progress update per stage) and "timings" once done."""
+        job = self.store.get(job_id)
+        if not job:
+            return None
+        progress = {}
+        for event in self.store.events(job_id):
+            if event.get("type") == "progress":
+                progress[event["stage"]] = event
+            elif event.get("type") == "timings":
+                job["timings"] = event["breakdown"]
+        job["progress"] = progress
+        job["done"] = job["status"] in TERMINAL_STATUSES
+        return job
+
+
+_runner: Optional[BackgroundRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_background_runner() -> BackgroundRunner:
+    """Process-wide runner shared by every Streamlit session."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = BackgroundRunner()
+        return _runner
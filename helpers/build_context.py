@@ -0,0 +1,177 @@
+import os
+import re
+import hashlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Image label carrying the content hash of the build context
+CONTEXT_HASH_LABEL = "ai-onboard.context-hash"
+
+
+# -------------------------------
+# .dockerignore handling
+# -------------------------------
+def _pattern_to_regex(pattern: str) -> re.Pattern:
+    """
+    Translate a .dockerignore pattern into a regex over '/'-separated relative paths.
+    `**` matches any number of directories, `*`, `?` and character classes (`[abc]`,
+    `[a-z]`, `[!abc]` / `[^abc]`, as in Go's filepath.Match) stay within one path segment.
+    """
+    i, out = 0, []
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "[":
+            cls, i = _class_to_regex(pattern, i)
+            out.append(cls)
+            continue
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("^" + "".join(out) + "$")
+
+
+def _class_to_regex(pattern: str, start: int) -> Tuple[str, int]:
+    """Regex for the character class opening at pattern[start]; an unclosed `[` is a literal."""
+    i = start + 1
+    negated = i < len(pattern) and pattern[i] in "!^"
+    if negated:
+        i += 1
+    body = []
+    # a `]` right after the opening (or the negation) belongs to the class
+    first = True
+    while i < len(pattern) and (pattern[i] != "]" or first):
+        c = pattern[i]
+        if c == "\\" and i + 1 < len(pattern):
+            i += 1
+            body.append(re.escape(pattern[i]))
+        elif c == "-" and body and i + 1 < len(pattern) and pattern[i + 1] != "]":
+            body.append("-")
+        else:
+            body.append(re.escape(c))
+        first = False
+        i += 1
+    if i >= len(pattern):
+        return re.escape("["), start + 1
+    # like `*` and `?`, a class never matches the separator
+    return ("[^/" if negated else "(?!/)[") + "".join(body) + "]", i + 1
+
+
+def load_dockerignore(context_dir: str) -> List[Tuple[re.Pattern, bool]]:
+    """
+    Parse <context_dir>/.dockerignore into (regex, negated) rules, in file order.
+    Missing file -> no rules.
+    """
+    path = os.path.join(context_dir, ".dockerignore")
+    rules = []
+    if not os.path.exists(path):
+        return rules
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:].strip()
+            line = os.path.normpath(line).replace(os.sep, "/").lstrip("/")
+            if line in ("", "."):
+                continue
+            rules.append((_pattern_to_regex(line), negated))
+    return rules
+
+
+def is_ignored(rel_path: str, rules: List[Tuple[re.Pattern, bool]]) -> bool:
+    """
+    Docker semantics: the last matching rule wins, and a rule matching a parent
+    directory also matches everything below it.
+    """
+    parts = rel_path.split("/")
+    prefixes = ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+    ignored = False
+    for regex, negated in rules:
+        if any(regex.match(p) for p in prefixes):
+            ignored = not negated
+    return ignored
+
+
+def iter_context_files(context_dir: str) -> Iterator[str]:
+    """
+    Yield '/'-separated relative paths of every file docker would send as build context,
+    in sorted order. Excluded directories are pruned unless a negation rule could re-include
+    something below them.
+    """
+    rules = load_dockerignore(context_dir)
+    can_prune = not any(negated for _, negated in rules)
+    for root, dirs, files in os.walk(context_dir):
+        rel_root = os.path.relpath(root, context_dir).replace(os.sep, "/")
+        rel_root = "" if rel_root == "." else rel_root + "/"
+        if can_prune:
+            dirs[:] = [d for d in dirs if not is_ignored(rel_root + d, rules)]
+        dirs.sort()
+        for fname in sorted(files):
+            rel = rel_root + fname
+            # docker always sends the Dockerfile and .dockerignore
+            if fname in ("Dockerfile", ".dockerignore") and not rel_root:
+                yield rel
+            elif not is_ignored(rel, rules):
+                yield rel
+
+
+# -------------------------------
+# Context size
+# -------------------------------
+def measure_context(context_dir: str) -> Dict:
+    """
+    Size of the build context docker would upload: file count, total bytes and the
+    relative file list (reused by compute_context_hash to avoid a second walk).
+    """
+    files, total = [], 0
+    for rel in iter_context_files(context_dir):
+        full = os.path.join(context_dir, rel)
+        try:
+            total += os.lstat(full).st_size
+        except OSError:
+            continue
+        files.append(rel)
+    return {"file_count": len(files), "size_bytes": total, "files": files}
+
+
+# -------------------------------
+# Content hash
+# -------------------------------
+def compute_context_hash(context_dir: str, dockerfile_path: str = None, files: Optional[List[str]] = None) -> str:
+    """
+    Deterministic sha256 over the build context (honoring .dockerignore) plus the Dockerfile.
+    Each file contributes its relative path, executable bit, size and content, so renames and
+    chmods change the hash while mtimes do not.
+    """
+    h = hashlib.sha256()
+    dockerfile_path = dockerfile_path or os.path.join(context_dir, "Dockerfile")
+    with open(dockerfile_path, "rb") as fh:
+        h.update(b"dockerfile\0" + fh.read() + b"\0")
+
+    for rel in (files if files is not None else iter_context_files(context_dir)):
+        full = os.path.join(context_dir, rel)
+        if os.path.islink(full):
+            h.update(f"link\0{rel}\0{os.readlink(full)}\0".encode("utf-8"))
+            continue
+        if not os.path.isfile(full):
+            continue
+        executable = os.access(full, os.X_OK)
+        size = os.path.getsize(full)
+        h.update(f"file\0{rel}\0{int(executable)}\0{size}\0".encode("utf-8"))
+        with open(full, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,148 @@
+import os
+import time
+import threading
+import subprocess
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Build pool configuration
+# -------------------------------
+# Comma separated DOCKER_HOST endpoints, e.g. "unix:///var/run/docker.sock,tcp://builder-2:2375".
+# An empty entry ("") means "whatever the local docker CLI talks to by default".
+DOCKER_HOSTS = os.getenv("DOCKER_HOSTS", "")
+DOCKER_HOST_MAX_CONCURRENCY = int(os.getenv("DOCKER_HOST_MAX_CONCURRENCY", 2))
+# Docker CLI binary; point this at a fake script to exercise the scheduler without a daemon.
+DOCKER_BIN = os.getenv("DOCKER_BIN", "docker")
+
+
+def _parse_hosts(raw: str) -> List[str]:
+    hosts = [h.strip() for h in raw.split(",")] if raw else []
+    hosts = [h for h in hosts if h]
+    return hosts or [""]
+
+
+class BuildScheduler:
+    """
+    Queue in front of docker builds.
+    Each host runs at most `max_per_host` builds at once. A new build goes to the host that
+    last built the same repo (warm layer cache) if it has a free slot, otherwise to the
+    least loaded host. Callers block in FIFO order until a slot frees up.
+    """
+
+    def __init__(self, hosts: Optional[List[str]] = None, max_per_host: int = DOCKER_HOST_MAX_CONCURRENCY):
+        self.hosts = list(hosts) if hosts else _parse_hosts(DOCKER_HOSTS)
+        self.max_per_host = max(1, int(max_per_host))
+        self._cond = threading.Condition()
+        self._load: Dict[str, int] = {h: 0 for h in self.hosts}
+        self._affinity: Dict[str, str] = {}
+        self._waiting: List[int] = []
+        self._ticket = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _pick_host(self, repo_key: Optional[str]) -> Optional[str]:
+        free = [h for h in self.hosts if self._load[h] < self.max_per_host]
+        if not free:
+            return None
+        preferred = self._affinity.get(repo_key) if repo_key else None
+        if preferred in free:
+            return preferred
+        # least load; ties broken by pool order so results are deterministic
+        return min(free, key=lambda h: (self._load[h], self.hosts.index(h)))
+
+    def acquire(self, repo_key: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Block until a host slot is free. Returns (host, wait_seconds).
+        Raises TimeoutError if no slot became free within `timeout`.
+        """
+        start = time.monotonic()
+        with self._cond:
+            self._ticket += 1
+            ticket = self._ticket
+            self._waiting.append(ticket)
+            try:
+                while True:
+                    host = self._pick_host(repo_key) if self._waiting[0] == ticket else None
+                    if host is not None:
+                        break
+                    remaining = None if timeout is None else timeout - (time.monotonic() - start)
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No docker host slot free after {timeout}s")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting.remove(ticket)
+                # let the next waiter re-check now that the queue head moved
+                self._cond.notify_all()
+
+            self._load[host] += 1
+            if repo_key:
+                self._affinity[repo_key] = host
+            waited = time.monotonic() - start
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            return host, waited
+
+    def release(self, host: str):
+        with self._cond:
+            self._load[host] = max(0, self._load[host] - 1)
+            self._completed += 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, repo_key: Optional[str] = None, timeout: Optional[float] = None):
+        host, waited = self.acquire(repo_key, timeout=timeout)
+        logger.info(f"🏗️  Build slot on host={host or 'default'} after {waited:.2f}s wait")
+        try:
+            yield host, waited
+        finally:
+            self.release(host)
+
+    def stats(self) -> Dict:
+        """Queue depth, per-host load and wait time counters."""
+        with self._cond:
+            acquired = self._completed + sum(self._load.values())
+            return {
+                "queue_depth": len(self._waiting),
+                "running": sum(self._load.values()),
+                "max_per_host": self.max_per_host,
+                "hosts": {h or "default": n for h, n in self._load.items()},
+                "completed": self._completed,
+                "avg_wait_seconds": round(self._total_wait / acquired, 3) if acquired else 0.0,
+                "max_wait_seconds": round(self._max_wait, 3),
+            }
+
+
+def docker_env(host: str) -> Dict[str, str]:
+    """Environment for a docker CLI call pinned to `host` (empty host = inherit)."""
+    env = os.environ.copy()
+    if host:
+        env["DOCKER_HOST"] = host
+    return env
+
+
+def repo_key_for_workspace(workspace_path: str) -> str:
+    """Affinity key for a workspace: its origin URL, falling back to the path."""
+    try:
+        proc = subprocess.run(
+            ["git", "-C", workspace_path, "config", "--get", "remote.origin.url"],
+            capture_output=True, text=True
+        )
+        if proc.returncode == 0 and proc.stdout.strip():
+            return proc.stdout.strip()
+    except Exception:
+        pass
+    return os.path.abspath(workspace_path)
+
+
+# Process-wide scheduler shared by every build_push_tool call
+_scheduler = BuildScheduler()
+
+
+def get_build_scheduler() -> BuildScheduler:
+    """Return the process-wide build scheduler."""
+    return _scheduler
@@ -0,0 +1,245 @@
+import os
+import re
+import csv
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import yaml
+
+from helpers.onboarding_pipeline import build_onboarding_pipeline
+from helpers.profiling import profile_stages
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Bulk onboarding configuration
+# -------------------------------
+# stage name -> how many repositories may run it at the same time
+DEFAULT_STAGE_LIMITS = {
+    "clone": int(os.getenv("BULK_CLONE_WORKERS", 8)),
+    "dockerfile": int(os.getenv("BULK_DOCKERFILE_WORKERS", 4)),
+    "build": int(os.getenv("BULK_BUILD_WORKERS", 4)),
+    "yamls": int(os.getenv("BULK_YAML_WORKERS", 8)),
+    "pull_request": int(os.getenv("BULK_PR_WORKERS", 2)),
+}
+BULK_REPO_WORKERS = int(os.getenv("BULK_REPO_WORKERS", 16))
+
+# values worth keeping between runs; the rest (loaded classes, prefetched templates) is rebuilt
+RESUMABLE_VALUES = ["workspace_path", "app_type", "dockerfile_path", "build_result", "generated", "pull_request"]
+
+
+def _repo_id(entry: Dict) -> str:
+    if entry.get("app_name"):
+        return entry["app_name"]
+    name = entry["git_url"].rstrip("/").rsplit("/", 1)[-1]
+    return re.sub(r"\.git$", "", name)
+
+
+def _envs(value) -> List[str]:
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [e for e in re.split(r"[;,\s]+", str(value or "dev")) if e]
+
+
+def load_manifest(path: str) -> List[Dict]:
+    """
+    Read a YAML (list, or {"repos": [...]}) or CSV manifest with columns
+    git_url, app_type, app_name, image_tag, envs. app_type defaults to auto-detect and
+    envs ("dev;uat" in CSV) to dev. Returns normalized entries with a unique "id".
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(fh))
+        else:
+            data = yaml.safe_load(fh) or []
+            rows = data.get("repos", []) if isinstance(data, dict) else data
+
+    entries, seen = [], set()
+    for i, row in enumerate(rows, start=1):
+        row = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+        missing = [k for k in ("git_url", "image_tag") if not row.get(k)]
+        if missing:
+            raise ValueError(f"{path} entry {i}: missing {', '.join(missing)}")
+        entry = {
+            "git_url": row["git_url"],
+            "app_type": row.get("app_type") or "auto",
+            "app_name": row.get("app_name") or "",
+            "image_tag": row["image_tag"],
+            "envs": _envs(row.get("envs")),
+        }
+        entry["app_name"] = entry["app_name"] or _repo_id(entry)
+        entry["id"] = _repo_id(entry)
+        if entry["id"] in seen:
+            raise ValueError(f"{path} entry {i}: duplicate app_name '{entry['id']}'")
+        seen.add(entry["id"])
+        entries.append(entry)
+    return entries
+
+
+class BulkState:
+    """
+    Per-repository progress persisted to a JSON file after every finished stage,
+    so an interrupted bulk run resumes where each repository stopped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fh:
+                self.data = json.load(fh)
+
+    def _save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.data, fh, indent=2)
+        os.replace(tmp, self.path)
+
+    def resume_values(self, repo_id: str) -> Dict:
+        """Outputs of stages that finished earlier and whose files still exist."""
+        values = dict(self.data.get(repo_id, {}).get("values", {}))
+        if values.get("workspace_path") and not os.path.isdir(values["workspace_path"]):
+            # the clone is gone (tmp cleaned up): everything derived from it has to be redone
+            return {}
+        if values.get("dockerfile_path") and not os.path.exists(values["dockerfile_path"]):
+            for key in ("dockerfile_path", "build_result", "pull_request"):
+                values.pop(key, None)
+        return values
+
+    def record_stage(self, repo_id: str, outputs: Dict):
+        with self._lock:
+            repo = self.data.setdefault(repo_id, {"values": {}})
+            repo["values"].update({k: v for k, v in outputs.items() if k in RESUMABLE_VALUES})
+            self._save()
+
+    def record_result(self, repo_id: str, result: Dict):
+        with self._lock:
+            repo = self.data.setdefault(repo_id, {"values": {}})
+            repo.update({k: result[k] for k in ("status", "failed_stage", "error", "wall_s", "stages", "breakdown",
+                                                "profiles")})
+            self._save()
+
+    def is_done(self, repo_id: str) -> bool:
+        return self.data.get(repo_id, {}).get("status") == "success"
+
+
+def _onboard_one(entry: Dict, pipeline, state: BulkState, resume: bool, profile: Optional[List[str]] = None) -> Dict:
+    initial = {
+        "git_url": entry["git_url"],
+        "app_type_hint": entry["app_type"],
+        "app_name": entry["app_name"],
+        "envs": entry["envs"],
+        "image_tag": entry["image_tag"],
+    }
+    if resume:
+        initial.update(state.resume_values(entry["id"]))
+
+    def on_event(event):
+        if event.get("status") == "success":
+            state.record_stage(entry["id"], event.get("outputs", {}))
+
+    with profile_stages(profile):
+        run = pipeline.run(initial, on_event=on_event)
+    result = {
+        "id": entry["id"],
+        "git_url": entry["git_url"],
+        "status": run["status"],
+        "failed_stage": run["failed_stage"],
+        "error": run["error"],
+        "wall_s": run["wall_s"],
+        "app_type": run["values"].get("app_type"),
+        "workspace_path": run["values"].get("workspace_path"),
+        "stages": {t["stage"]: {k: t[k] for k in ("status", "duration_s", "queued_s") if k in t}
+                   for t in run["timeline"]},
+        "breakdown": run["breakdown"],
+        "profiles": run["profiles"],
+    }
+    state.record_result(entry["id"], result)
+    return result
+
+
+def run_bulk(entries: List[Dict], state_path: str, resume: bool = True, build: bool = True,
+             create_pr: bool = False, stage_limits: Optional[Dict[str, int]] = None,
+             repo_workers: int = BULK_REPO_WORKERS, profile: Optional[List[str]] = None) -> Dict:
+    """
+    Onboard many repositories. Up to `repo_workers` repositories are in flight; each runs
+    the DAG from build_onboarding_pipeline, and every stage is additionally capped across
+    repositories by `stage_limits`. With `resume`, repositories that already succeeded are
+    skipped and the others continue from their last finished stage. `profile` names stages
+    to profile in every repository (see helpers.profiling).
+
+    Returns {"summary": {...}, "repos": [...per repo result...]}.
+    """
+    limits = dict(DEFAULT_STAGE_LIMITS, **(stage_limits or {}))
+    semaphores = {name: threading.BoundedSemaphore(max(1, n)) for name, n in limits.items()}
+    pipeline = build_onboarding_pipeline(build=build, create_pr=create_pr, limits=semaphores)
+    state = BulkState(state_path)
+
+    todo = [e for e in entries if not (resume and state.is_done(e["id"]))]
+    skipped = [e["id"] for e in entries if e not in todo]
+    print(f"📋 {len(entries)} repositories: {len(todo)} to onboard, {len(skipped)} already done; limits {limits}")
+
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, repo_workers), thread_name_prefix="repo") as pool:
+        futures = {pool.submit(_onboard_one, e, pipeline, state, resume, profile): e for e in todo}
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                res = future.result()
+            except Exception as e:
+                logger.error(f"❌ {entry['id']} crashed: {e}", exc_info=True)
+                res = {"id": entry["id"], "git_url": entry["git_url"], "status": "failed",
+                       "failed_stage": None, "error": str(e), "wall_s": 0.0, "stages": {}}
+            results.append(res)
+            print(f"{'✅' if res['status'] == 'success' else '❌'} [{len(results)}/{len(todo)}] {res['id']} "
+                  f"{res['wall_s']}s{'' if res['status'] == 'success' else ' ' + str(res['failed_stage']) + ': ' + str(res['error'])}")
+
+    for repo_id in skipped:
+        previous = state.data[repo_id]
+        results.append({"id": repo_id, "status": "skipped", "failed_stage": None, "error": None,
+                        "wall_s": previous.get("wall_s", 0.0), "stages": previous.get("stages", {})})
+
+    order = {e["id"]: i for i, e in enumerate(entries)}
+    results.sort(key=lambda r: order.get(r["id"], 0))
+    stage_totals: Dict[str, float] = {}
+    for r in results:
+        if r["status"] == "skipped":
+            continue
+        for name, s in r["stages"].items():
+            stage_totals[name] = round(stage_totals.get(name, 0.0) + s.get("duration_s", 0.0), 3)
+    summary = {
+        "total": len(entries),
+        "succeeded": sum(r["status"] == "success" for r in results),
+        "failed": sum(r["status"] == "failed" for r in results),
+        "skipped": len(skipped),
+        "wall_s": round(time.perf_counter() - start, 3),
+        "stage_seconds": stage_totals,
+        "stage_limits": limits,
+    }
+    return {"summary": summary, "repos": results}
+
+
+def write_report(report: Dict, report_dir: str) -> Dict[str, str]:
+    """report.json (summary + repos) and report.csv (one row per repo, one column per stage)."""
+    os.makedirs(report_dir, exist_ok=True)
+    json_path = os.path.join(report_dir, "report.json")
+    csv_path = os.path.join(report_dir, "report.csv")
+    with open(json_path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+    stages = []
+    for r in report["repos"]:
+        stages += [s for s in r["stages"] if s not in stages]
+    with open(csv_path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["id", "status", "failed_stage", "error", "wall_s"] + [f"{s}_s" for s in stages])
+        for r in report["repos"]:
+            writer.writerow([r["id"], r["status"], r.get("failed_stage") or "", r.get("error") or "", r["wall_s"]]
+                            + [r["stages"].get(s, {}).get("duration_s", "") for s in stages])
+    return {"json": json_path, "csv": csv_path}
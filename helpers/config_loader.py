@@ -1,30 +1,29 @@
 import os
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 
 # Load environment variables once
 load_dotenv()
 
+from helpers.llm_router import LLM_PROVIDER, get_chat_model
+
 # --------------------------------------------------
 # ✅ Global Configuration Setup
 # --------------------------------------------------
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-if not GROQ_API_KEY:
-    raise EnvironmentError("❌ GROQ_API_KEY not found. Please set it in your .env file.")
-
-# Initialize Groq LLM once globally
-llm = ChatGroq(
-    model="llama-3.3-70b-versatile",
-    api_key=GROQ_API_KEY
-)
-
 # --------------------------------------------------
 # ✅ Helper Accessors
 # --------------------------------------------------
-def get_llm():
-    """Return the globally initialized LLM client."""
-    return llm
+def get_llm(agent: str = None):
+    """
+    Return the LLM client routed for `agent` (see helpers/llm_router.py); without an
+    agent, the default (generation) model. Dispatch-only agents get the small model,
+    Dockerfile synthesis the large one. Clients are built on first use, so a missing
+    GROQ_API_KEY fails the first LLM call rather than the import.
+    """
+    if not GROQ_API_KEY and LLM_PROVIDER == "groq":
+        raise EnvironmentError("❌ GROQ_API_KEY not found. Please set it in your .env file.")
+    return get_chat_model(agent)
 
 def get_env(var_name: str, default=None):
     """Get any environment variable with optional default."""
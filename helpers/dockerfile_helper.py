@@ -1,5 +1,8 @@
 import os
 
+from helpers.dockerfile_renderer import normalize_app_type
+from helpers.metrics import timed
+
 def save_dockerfile(workspace_path: str, content: str, filename="Dockerfile"):
     """
     Saves the Dockerfile content to the specified workspace.
@@ -8,7 +11,75 @@ def save_dockerfile(workspace_path: str, content: str, filename="Dockerfile"):
     if not os.path.exists(workspace_path):
         os.makedirs(workspace_path)
     file_path = os.path.join(workspace_path, filename)
-    with open(file_path, "w") as f:
+    with timed("file_write", "dockerfile"), open(file_path, "w") as f:
         f.write(content)
     print(f"file path is {file_path}")
     return file_path
+
+
+def stream_dockerfile(workspace_path: str, chunks, filename="Dockerfile"):
+    """
+    Writes Dockerfile chunks to <filename>.partial as they arrive and yields them on.
+    The partial file replaces <filename> atomically once the stream is exhausted;
+    on error or early close it is removed and any previous Dockerfile is left untouched.
+    """
+    if not os.path.exists(workspace_path):
+        os.makedirs(workspace_path)
+    file_path = os.path.join(workspace_path, filename)
+    partial_path = file_path + ".partial"
+    try:
+        with open(partial_path, "w") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                f.flush()
+                yield chunk
+        os.replace(partial_path, file_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+
+# Build-context exclusions per app type; COMMON applies to every app
+DOCKERIGNORE_COMMON = [
+    ".git",
+    "k8s_configs/",
+    "**/.DS_Store",
+    ".idea/",
+    ".vscode/",
+    "**/*.log",
+    ".env",
+]
+
+DOCKERIGNORE_BY_APP = {
+    "java": ["target/", "**/target/", "build/", ".gradle/", "out/", "**/*.class"],
+    "nodejs": ["**/node_modules/", "coverage/", ".npm/", "npm-debug.log*", "yarn-error.log*"],
+    "python": ["**/__pycache__/", "**/*.py[cod]", ".venv/", "venv/", ".pytest_cache/", ".mypy_cache/",
+               ".tox/", "*.egg-info/", "build/", "dist/"],
+}
+
+
+def save_dockerignore(workspace_path: str, app_type: str, filename=".dockerignore"):
+    """
+    Writes a per-app-type .dockerignore next to the Dockerfile.
+    An existing .dockerignore is kept and only the missing patterns are appended.
+    """
+    patterns = DOCKERIGNORE_COMMON + DOCKERIGNORE_BY_APP.get(normalize_app_type(app_type), [])
+    file_path = os.path.join(workspace_path, filename)
+
+    existing_text = ""
+    if os.path.exists(file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            existing_text = f.read()
+    existing = {line.strip() for line in existing_text.splitlines()}
+    missing = [p for p in patterns if p not in existing]
+    if not missing:
+        return file_path
+
+    with timed("file_write", "dockerignore"), open(file_path, "a", encoding="utf-8") as f:
+        if existing_text and not existing_text.endswith("\n"):
+            f.write("\n")
+        f.write("# generated by AI onboarding\n")
+        f.write("\n".join(missing) + "\n")
+    print(f".dockerignore path is {file_path}")
+    return file_path
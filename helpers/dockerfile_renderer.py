@@ -0,0 +1,188 @@
+import os
+import json
+from typing import Optional
+
+# -------------------------------
+# Layer-cache-aware Dockerfile rendering
+# -------------------------------
+# Every renderer follows the same shape:
+#   1. copy only the dependency manifests / lockfiles
+#   2. resolve dependencies (BuildKit cache mount keeps the download cache across builds)
+#   3. copy the sources and build
+#   4. copy the result into a slim runtime stage
+# so a source-only edit re-runs steps 3-4 and reuses the dependency layer.
+
+APP_TYPE_ALIASES = {
+    "java": "java",
+    "nodejs": "nodejs",
+    "node": "nodejs",
+    "node.js": "nodejs",
+    "python": "python",
+}
+
+
+def normalize_app_type(app_type: str) -> str:
+    key = (app_type or "").strip().lower()
+    return APP_TYPE_ALIASES.get(key, key)
+
+
+def _exists(workspace_path: str, *names) -> bool:
+    return any(os.path.exists(os.path.join(workspace_path, n)) for n in names)
+
+
+def _render_java(workspace_path: str) -> Optional[str]:
+    if _exists(workspace_path, "pom.xml"):
+        build = """FROM maven:3.9-eclipse-temurin-17 AS build
+WORKDIR /opt/app
+# Dependencies first: only re-resolved when pom.xml changes
+COPY pom.xml ./
+RUN --mount=type=cache,target=/root/.m2 mvn -B -q dependency:go-offline
+COPY . .
+RUN --mount=type=cache,target=/root/.m2 mvn -B -q package -DskipTests \\
+    && cp "$(ls target/*.jar | grep -v -e '-sources.jar' -e '/original-' | head -n 1)" /opt/app/app.jar
+"""
+    elif _exists(workspace_path, "build.gradle", "build.gradle.kts"):
+        build = """FROM gradle:8-jdk17 AS build
+WORKDIR /opt/app
+# Dependencies first: only re-resolved when the build scripts change
+COPY settings.gradle* build.gradle* gradle.properties* ./
+RUN --mount=type=cache,target=/home/gradle/.gradle gradle --no-daemon -q dependencies > /dev/null || true
+COPY . .
+RUN --mount=type=cache,target=/home/gradle/.gradle gradle --no-daemon -q build -x test \\
+    && cp "$(ls build/libs/*.jar | grep -v -e '-plain.jar' | head -n 1)" /opt/app/app.jar
+"""
+    else:
+        return None
+
+    return build + """
+FROM eclipse-temurin:17-jre
+WORKDIR /opt/app
+COPY --from=build /opt/app/app.jar app.jar
+EXPOSE 8080
+ENTRYPOINT ["java","-jar","app.jar"]
+"""
+
+
+def _render_nodejs(workspace_path: str) -> Optional[str]:
+    package_json = os.path.join(workspace_path, "package.json")
+    if not os.path.exists(package_json):
+        return None
+
+    if _exists(workspace_path, "package-lock.json"):
+        manifests = "package.json package-lock.json"
+        install_all = "npm ci"
+        install_prod = "npm ci --omit=dev"
+        cache = "/root/.npm"
+    elif _exists(workspace_path, "yarn.lock"):
+        manifests = "package.json yarn.lock"
+        install_all = "yarn install --frozen-lockfile"
+        install_prod = "yarn install --frozen-lockfile --production"
+        cache = "/usr/local/share/.cache/yarn"
+    elif _exists(workspace_path, "pnpm-lock.yaml"):
+        manifests = "package.json pnpm-lock.yaml"
+        install_all = "corepack enable && pnpm install --frozen-lockfile"
+        install_prod = "corepack enable && pnpm install --frozen-lockfile --prod"
+        cache = "/root/.local/share/pnpm/store"
+    else:
+        manifests = "package.json"
+        install_all = "npm install"
+        install_prod = "npm install --omit=dev"
+        cache = "/root/.npm"
+
+    try:
+        with open(package_json, "r", encoding="utf-8") as fh:
+            scripts = json.load(fh).get("scripts", {}) or {}
+    except Exception:
+        scripts = {}
+
+    out = f"""FROM node:20-alpine AS deps
+WORKDIR /app
+# Production dependencies first: only re-installed when the lockfile changes
+COPY {manifests} ./
+RUN --mount=type=cache,target={cache} {install_prod}
+"""
+    if "build" in scripts:
+        out += f"""
+FROM node:20-alpine AS build
+WORKDIR /app
+COPY {manifests} ./
+RUN --mount=type=cache,target={cache} {install_all}
+COPY . .
+RUN npm run build && rm -rf node_modules
+
+FROM node:20-alpine
+WORKDIR /app
+ENV NODE_ENV=production
+COPY --from=build /app ./
+COPY --from=deps /app/node_modules ./node_modules
+"""
+    else:
+        out += """
+FROM node:20-alpine
+WORKDIR /app
+ENV NODE_ENV=production
+COPY --from=deps /app/node_modules ./node_modules
+COPY . .
+"""
+    return out + """EXPOSE 3000
+CMD ["npm", "start"]
+"""
+
+
+def _python_cmd(workspace_path: str) -> str:
+    if _exists(workspace_path, "manage.py"):
+        return '["python", "manage.py", "runserver", "0.0.0.0:8000"]'
+    if not _exists(workspace_path, "app.py") and _exists(workspace_path, "main.py"):
+        return '["python", "main.py"]'
+    return '["python", "app.py"]'
+
+
+def _render_python(workspace_path: str) -> Optional[str]:
+    if _exists(workspace_path, "requirements.txt"):
+        deps = """# Dependencies first: only re-installed when requirements.txt changes
+COPY requirements.txt .
+RUN --mount=type=cache,target=/root/.cache/pip pip install -r requirements.txt
+"""
+    elif _exists(workspace_path, "pyproject.toml"):
+        # no standalone lockfile to install from, so the project is installed with its sources
+        deps = """COPY . .
+RUN --mount=type=cache,target=/root/.cache/pip pip install .
+"""
+    else:
+        return None
+
+    return f"""FROM python:3.11-slim AS build
+WORKDIR /app
+# Compilers only live in the build stage
+RUN apt-get update && apt-get install -y --no-install-recommends build-essential \\
+    && rm -rf /var/lib/apt/lists/*
+RUN python -m venv /opt/venv
+ENV PATH=/opt/venv/bin:$PATH
+{deps}
+FROM python:3.11-slim
+WORKDIR /app
+ENV PATH=/opt/venv/bin:$PATH PYTHONDONTWRITEBYTECODE=1 PYTHONUNBUFFERED=1
+COPY --from=build /opt/venv /opt/venv
+COPY . .
+EXPOSE 8000
+CMD {_python_cmd(workspace_path)}
+"""
+
+
+RENDERERS = {
+    "java": _render_java,
+    "nodejs": _render_nodejs,
+    "python": _render_python,
+}
+
+
+def render_dockerfile(app_type: str, workspace_path: str) -> Optional[str]:
+    """
+    Render a multi-stage, dependency-first Dockerfile for the workspace.
+    Returns None when the app_type is unsupported or its build manifest is missing,
+    so callers can fall back to the Qdrant template / LLM.
+    """
+    renderer = RENDERERS.get(normalize_app_type(app_type))
+    if not renderer or not workspace_path or not os.path.isdir(workspace_path):
+        return None
+    return renderer(workspace_path)
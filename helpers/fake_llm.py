@@ -0,0 +1,118 @@
+import re
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+DEFAULT_FAKE_RESPONSE = """FROM alpine:3.20
+WORKDIR /app
+COPY . .
+CMD ["sh"]
+"""
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatGroq (LLM_PROVIDER=fake).
+    With tools bound it behaves like our dispatch agents expect: the first human turn becomes
+    a single call of the first tool, and a tool result is echoed back verbatim as the answer.
+    Without tools it returns `canned_response`, streamed line by line with `latency` between
+    lines. Token counts are whitespace word counts.
+    """
+
+    model: str = "fake"
+    canned_response: str = DEFAULT_FAKE_RESPONSE
+    latency: float = 0.0
+    tools: List[Dict[str, Any]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools])
+
+    @staticmethod
+    def _tool_args(function: Dict[str, Any], content: str) -> Dict[str, Any]:
+        params = list((function.get("parameters") or {}).get("properties", {}).keys())
+        try:
+            data = json.loads(content)
+        except (TypeError, json.JSONDecodeError):
+            data = None
+        if len(params) == 1:
+            return {params[0]: content}
+        if isinstance(data, dict):
+            return {p: data[p] for p in params if p in data}
+
+        # free-text prompts like "Clone the repository from <url> for a <type> application."
+        args = {}
+        url = re.search(r"(https?://\S+?|git@\S+?)(?=[\s,]|\.?$)", content)
+        path = re.search(r"(?<!\S)(/[^\s,]+?)\.?(?=\s|$)", content)
+        app_type = re.search(r"for (?:a |an )?(\S+) application", content)
+        for p in params:
+            if "url" in p and url:
+                args[p] = url.group(1)
+            elif "path" in p and path:
+                args[p] = path.group(1)
+            elif "type" in p and app_type:
+                args[p] = app_type.group(1)
+        return args
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        tools = kwargs.get("tools") or self.tools
+        last = messages[-1]
+        if tools and isinstance(last, HumanMessage):
+            function = tools[0]["function"]
+            message = AIMessage(content="", tool_calls=[{
+                "name": function["name"],
+                "args": self._tool_args(function, str(last.content)),
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+            }])
+        elif isinstance(last, ToolMessage):
+            message = AIMessage(content=last.content)
+        else:
+            message = AIMessage(content=self.canned_response)
+
+        prompt_tokens = sum(len(str(m.content).split()) for m in messages)
+        completion_tokens = len(str(message.content).split())
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={
+                "model_name": self.model,
+                "token_usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+            },
+        )
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs):
+        if kwargs.get("tools") or self.tools:
+            result = self._generate(messages, stop=stop, **kwargs)
+            message = result.generations[0].message
+            yield ChatGenerationChunk(message=AIMessageChunk(content=message.content, tool_call_chunks=[
+                {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                for i, c in enumerate(message.tool_calls)
+            ], usage_metadata=message.usage_metadata))
+            return
+
+        prompt_tokens = sum(len(str(m.content).split()) for m in messages)
+        lines = self.canned_response.splitlines(keepends=True)
+        for i, line in enumerate(lines):
+            if self.latency:
+                time.sleep(self.latency)
+            usage = None
+            if i == len(lines) - 1:
+                completion_tokens = len(self.canned_response.split())
+                usage = {"input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+                         "total_tokens": prompt_tokens + completion_tokens}
+            yield ChatGenerationChunk(message=AIMessageChunk(content=line, usage_metadata=usage))
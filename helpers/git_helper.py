@@ -4,17 +4,34 @@ import tempfile
 import random
 import string
 
+import re
 import logging
 from git import Repo, GitCommandError
+from helpers.progress import run_process, report
+from helpers.metrics import timed
 
 logger = logging.getLogger(__name__)
 
+# -------------------------------
+# Clone configuration
+# -------------------------------
+# Shallow (--depth) / partial (--filter, e.g. blob:none) clones fetch far less; only
+# safe with PR_MODE=api, since pushing a branch from a shallow clone can be rejected
+GIT_CLONE_DEPTH = int(os.getenv("GIT_CLONE_DEPTH", 0))
+GIT_CLONE_FILTER = os.getenv("GIT_CLONE_FILTER", "")
+
 
 def generate_random_workspace_name(prefix="workspace-x", length=4):
     """Generate a short random workspace name like workspace-x1234."""
     suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
     return f"{prefix}{suffix}"
 
+def _report_clone_progress(line: str):
+    match = re.match(r"(?:remote: )?([A-Za-z ]+):\s+(\d+)%", line)
+    if match:
+        report("clone", phase=match.group(1).strip(), percent=int(match.group(2)))
+
+
 def clone_repository(git_url: str) -> str:
     """
     Clone a git repository into a temporary random workspace directory.
@@ -25,7 +42,17 @@ def clone_repository(git_url: str) -> str:
         base_dir = tempfile.gettempdir()
         workspace_path = os.path.join(base_dir, workspace_name)
 
-        subprocess.run(["git", "clone", git_url, workspace_path], check=True)
+        # --progress keeps git printing "Receiving objects:  42% ..." even without a terminal
+        cmd = ["git", "clone", "--progress"]
+        if GIT_CLONE_DEPTH > 0:
+            cmd += ["--depth", str(GIT_CLONE_DEPTH)]
+        if GIT_CLONE_FILTER:
+            cmd += [f"--filter={GIT_CLONE_FILTER}"]
+        with timed("git", "clone"):
+            proc = run_process(cmd + [git_url, workspace_path], on_line=_report_clone_progress)
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, proc.stdout, proc.stderr)
+        report("clone", final=True, percent=100, phase="done")
         return workspace_path
 
     except subprocess.CalledProcessError as e:
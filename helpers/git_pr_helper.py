@@ -1,12 +1,66 @@
 import os
+import base64
 import subprocess
-from github import Github
+from typing import Dict, List, Optional
 from git import Repo
 from datetime import datetime
+from helpers.github_api import get_github_client, parse_owner_repo
+from helpers.metrics import timed
 
-def create_pull_request(workspace_path: str, git_remote: str):
+# -------------------------------
+# What the onboarding PR may contain
+# -------------------------------
+# Only the pipeline's artefacts are staged (repo root or any service directory), never
+# build outputs or other files lying around in the workspace
+PR_ARTIFACT_PATHSPECS = [p.strip() for p in os.getenv(
+    "PR_ARTIFACT_PATHSPECS",
+    ":(glob)**/Dockerfile,:(glob)**/.dockerignore,:(glob)**/k8s_configs/**",
+).split(",") if p.strip()]
+
+# -------------------------------
+# How the onboarding PR is delivered
+# -------------------------------
+# push: commit locally and push a branch over HTTPS (needs full history)
+# api:  build blobs/tree/commit for the staged files only through the GitHub Git data
+#       API on top of the base branch head; nothing is pushed, so clones may be shallow
+#       (GIT_CLONE_DEPTH) or partial (GIT_CLONE_FILTER)
+PR_MODE = os.getenv("PR_MODE", "push").lower()
+# Branch the PR targets; empty = the repository's default branch
+PR_BASE_BRANCH = os.getenv("PR_BASE_BRANCH", "")
+PR_TITLE = "AI Onboarding Automated Pull Request"
+PR_BODY = "This PR was automatically created by AI DevOps Onboarder."
+
+
+def stage_artifacts(repo: Repo, paths: Optional[List[str]] = None) -> List[str]:
+    """
+    Stage `paths` (files the pipeline wrote; absolute or workspace-relative) or, without
+    them, whatever matches PR_ARTIFACT_PATHSPECS. Returns the staged file names, read
+    with --name-only so no diff text is built.
     """
-    Pushes local changes and creates a GitHub PR.
+    if paths:
+        pathspecs = [os.path.relpath(p, repo.working_tree_dir) if os.path.isabs(p) else p for p in paths]
+        # a Dockerfile ships with the .dockerignore written next to it
+        pathspecs += [os.path.join(os.path.dirname(p), ".dockerignore") for p in pathspecs
+                      if os.path.basename(p) == "Dockerfile"]
+        pathspecs = [p for p in dict.fromkeys(pathspecs) if os.path.lexists(os.path.join(repo.working_tree_dir, p))]
+    else:
+        # git add fails on a pathspec that matches nothing (e.g. no k8s_configs yet): keep
+        # only those with new, modified or deleted files
+        pathspecs = [spec for spec in PR_ARTIFACT_PATHSPECS
+                     if repo.git.ls_files("-o", "-m", "-d", "--exclude-standard", "--", spec).strip()]
+    if pathspecs:
+        # -A also stages deletions within the pathspecs
+        repo.git.add("-A", "--", *pathspecs)
+    staged = repo.git.diff("--cached", "--name-only")
+    return [line for line in staged.splitlines() if line.strip()]
+
+
+def create_pull_request(workspace_path: str, git_remote: str, paths: Optional[List[str]] = None):
+    """
+    Commits the onboarding artefacts (see stage_artifacts), pushes them to a new branch
+    and creates a GitHub PR (PR_MODE=api: commits through the Git data API instead of
+    pushing, see _create_pull_request_via_api). When they match what is already committed, nothing is
+    committed, pushed or opened and the result has "skipped": True.
     """
     git_username = os.getenv("GIT_USERNAME")
     git_token = os.getenv("GIT_TOKEN")
@@ -19,21 +73,28 @@ def create_pull_request(workspace_path: str, git_remote: str):
 
     repo = Repo(workspace_path)
 
-    # Ensure clean branch creation
+    # Stage the artefacts first: with nothing new there is no branch, commit, push or PR
+    staged = stage_artifacts(repo, paths)
+    if not staged:
+        print("ℹ️ Onboarding artefacts unchanged, skipping commit, push and pull request.")
+        return {
+            "success": True,
+            "skipped": True,
+            "files": [],
+            "message": "ℹ️ No changes to the onboarding artefacts; no pull request needed."
+        }
+    print(f"📝 Committing {len(staged)} onboarding file(s): {', '.join(staged[:10])}")
+
+    if PR_MODE == "api":
+        return _create_pull_request_via_api(repo, git_remote, git_token, staged, branch_name, commit_message)
+
+    # Ensure clean branch creation (the staged index carries over)
     if branch_name in [h.name for h in repo.heads]:
         repo.git.checkout(branch_name)
     else:
         repo.git.checkout('HEAD', b=branch_name)
 
-    # Stage and commit changes if any
-    repo.git.add(A=True)
-    try:
-        diff = repo.git.diff('--cached')
-        if not diff.strip():
-            print("⚠️ No new diff found, committing anyway (forced).")
-        repo.index.commit(commit_message)
-    except Exception:
-        repo.index.commit(commit_message)
+    repo.index.commit(commit_message)
 
     # Push to remote
     remote_url = git_remote.replace(
@@ -42,20 +103,78 @@ def create_pull_request(workspace_path: str, git_remote: str):
     )
 
     origin = repo.create_remote('auth-origin', remote_url) if 'auth-origin' not in [r.name for r in repo.remotes] else repo.remote('auth-origin')
-    origin.push(branch_name, force=True)
-
-    # Create PR via GitHub API
-    g = Github(git_token)
-    owner_repo = git_remote.replace("https://github.com/", "").replace(".git", "")
-    gh_repo = g.get_repo(owner_repo)
-    pr = gh_repo.create_pull(
-        title="AI Onboarding Automated Pull Request",
-        body="This PR was automatically created by AI DevOps Onboarder.",
+    with timed("git", "push"):
+        origin.push(branch_name, force=True)
+
+    # Create PR via GitHub API (shared client: cached repo metadata, paced writes)
+    client = get_github_client(git_token)
+    owner_repo = parse_owner_repo(git_remote)
+    pr = client.create_pull(
+        owner_repo,
+        title=PR_TITLE,
+        body=PR_BODY,
         head=branch_name,
-        base="master"
+        base=PR_BASE_BRANCH or client.default_branch(owner_repo)
     )
 
     return {
         "success": True,
-        "message": f"✅ Pull request created successfully: {pr.html_url}"
+        "files": staged,
+        "message": f"✅ Pull request created successfully: {pr['html_url']}"
+    }
+
+
+def _tree_entry(repo: Repo, client, owner_repo: str, path: str) -> Dict:
+    """Git data API tree entry for staged `path`: inline text, uploaded blob, or deletion."""
+    staged = repo.git.ls_files("-s", "--", path).split()
+    if not staged:
+        # staged deletion: a null sha removes the path from base_tree
+        return {"path": path, "mode": "100644", "type": "blob", "sha": None}
+    mode = staged[0]
+    full_path = os.path.join(repo.working_tree_dir, path)
+    if mode == "120000":
+        data = os.readlink(full_path).encode("utf-8")
+    else:
+        with open(full_path, "rb") as fh:
+            data = fh.read()
+    try:
+        return {"path": path, "mode": mode, "type": "blob", "content": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        sha = client.create_blob(owner_repo, base64.b64encode(data).decode("ascii"))
+        return {"path": path, "mode": mode, "type": "blob", "sha": sha}
+
+
+def _create_pull_request_via_api(repo: Repo, git_remote: str, git_token: str, staged: List[str],
+                                 branch_name: str, commit_message: str):
+    """
+    Commit only the `staged` files on top of the remote base branch head through the
+    GitHub Git data API (one tree + one commit + one ref) and open the PR. The local
+    clone is never committed to or pushed, so its history depth does not matter.
+    """
+    client = get_github_client(git_token)
+    owner_repo = parse_owner_repo(git_remote)
+    base = PR_BASE_BRANCH or client.default_branch(owner_repo)
+    base_sha = client.branch_head(owner_repo, base)
+    base_tree = client.commit_tree(owner_repo, base_sha)
+
+    entries = [_tree_entry(repo, client, owner_repo, path) for path in staged]
+    tree = client.create_tree(owner_repo, base_tree, entries)
+    if tree == base_tree:
+        # the local clone was behind: the base branch already has these exact files
+        print(f"ℹ️ {base} already contains the onboarding artefacts, skipping pull request.")
+        return {
+            "success": True,
+            "skipped": True,
+            "files": [],
+            "message": f"ℹ️ {base} already contains these onboarding artefacts; no pull request needed."
+        }
+
+    commit = client.create_commit(owner_repo, commit_message, tree, [base_sha])
+    client.create_ref(owner_repo, branch_name, commit)
+    pr = client.create_pull(owner_repo, PR_TITLE, PR_BODY, head=branch_name, base=base)
+
+    return {
+        "success": True,
+        "files": staged,
+        "message": f"✅ Pull request created successfully: {pr['html_url']}"
     }
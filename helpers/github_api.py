@@ -0,0 +1,204 @@
+import os
+import re
+import time
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from helpers.progress import report, wait
+from helpers.metrics import timed
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# GitHub API configuration
+# -------------------------------
+# Point at GitHub Enterprise ("https://ghe.example.com/api/v3") or a local fake
+# (python tests/fake_github.py) to run the pull request step offline
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_HTTP_TIMEOUT_SECONDS = float(os.getenv("GITHUB_HTTP_TIMEOUT_SECONDS", 30))
+# Writes (blobs, commits, refs, PRs) are queued and spaced this far apart per token, which
+# keeps bulk runs under GitHub's secondary (content creation) rate limits
+GITHUB_WRITE_INTERVAL_SECONDS = float(os.getenv("GITHUB_WRITE_INTERVAL_SECONDS", 1.0))
+# Once fewer calls than this are left, wait for the rate limit window to reset
+GITHUB_RATE_LIMIT_RESERVE = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", 50))
+# Retries after 403/429 rate limit answers, and the longest single wait worth doing
+GITHUB_MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", 5))
+GITHUB_MAX_WAIT_SECONDS = float(os.getenv("GITHUB_MAX_WAIT_SECONDS", 900))
+
+
+def parse_owner_repo(git_remote: str) -> str:
+    """"org/name" from https://github.com/org/name(.git) or git@github.com:org/name.git."""
+    match = re.search(r"[:/]([^/:]+/[^/]+?)(?:\.git)?/?$", git_remote.strip())
+    if not match:
+        raise ValueError(f"Cannot tell owner/repo from git remote '{git_remote}'")
+    return match.group(1)
+
+
+def _message(resp: httpx.Response) -> str:
+    try:
+        return str(resp.json().get("message", resp.text))
+    except (ValueError, AttributeError):
+        return resp.text
+
+
+class GitHubClient:
+    """
+    Thin REST client for the few GitHub endpoints onboarding needs (repository metadata,
+    Git data API, pull requests). Errors raise RuntimeError with the status and message.
+
+    Rate limits: every response updates `rate` from the X-RateLimit-* headers; requests
+    wait for the reset once fewer than GITHUB_RATE_LIMIT_RESERVE calls are left, and
+    403/429 rate limit answers are retried after Retry-After / the reset time. Writes are
+    serialised and paced by GITHUB_WRITE_INTERVAL_SECONDS. GETs are conditional
+    (If-None-Match) on the last ETag, so unchanged metadata answers 304 and does not count
+    against the limit. Share one instance per token: get_github_client().
+    """
+
+    def __init__(self, token: str, api_url: str = GITHUB_API_URL, http: Optional[httpx.Client] = None):
+        self.api_url = api_url.rstrip("/")
+        self.rate: Dict[str, Optional[int]] = {"limit": None, "remaining": None, "reset": None}
+        self._etags: Dict[str, Tuple[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._last_write = 0.0
+        self.http = http or httpx.Client(
+            base_url=self.api_url,
+            timeout=GITHUB_HTTP_TIMEOUT_SECONDS,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+        )
+
+    def request(self, method: str, path: str, **kwargs) -> Any:
+        for attempt in range(GITHUB_MAX_RETRIES + 1):
+            self._wait_for_budget()
+            if method == "GET":
+                with timed("github", "GET"):
+                    resp = self._send_get(path, **kwargs)
+            else:
+                with self._write_lock:
+                    wait(self._last_write + GITHUB_WRITE_INTERVAL_SECONDS - time.monotonic())
+                    with timed("github", method):
+                        resp = self.http.request(method, path, **kwargs)
+                    self._last_write = time.monotonic()
+            self._record_rate(resp)
+
+            if resp.status_code == 304:
+                return self._etags[path][1]
+            delay = self._retry_delay(resp, attempt)
+            if delay is not None and attempt < GITHUB_MAX_RETRIES:
+                logger.warning(f"⏳ GitHub rate limited {method} {path} ({resp.status_code}), retrying in {delay:.0f}s")
+                report("pull_request", phase="rate limited", wait_s=round(delay))
+                wait(delay)
+                continue
+            if resp.status_code >= 400:
+                raise RuntimeError(f"GitHub {method} {path} failed ({resp.status_code}): {_message(resp)[:300]}")
+
+            data = resp.json() if resp.content else {}
+            if method == "GET" and resp.headers.get("ETag"):
+                self._etags[path] = (resp.headers["ETag"], data)
+            return data
+
+    def _send_get(self, path: str, **kwargs) -> httpx.Response:
+        cached = self._etags.get(path)
+        if cached:
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, **{"If-None-Match": cached[0]})
+        return self.http.request("GET", path, **kwargs)
+
+    def _record_rate(self, resp: httpx.Response):
+        headers = resp.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        with self._lock:
+            self.rate = {
+                "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "reset": int(headers.get("X-RateLimit-Reset", 0)),
+            }
+
+    def _wait_for_budget(self):
+        with self._lock:
+            remaining, reset = self.rate["remaining"], self.rate["reset"]
+        if remaining is None or remaining > GITHUB_RATE_LIMIT_RESERVE or not reset:
+            return
+        delay = reset - time.time() + 1
+        if 0 < delay <= GITHUB_MAX_WAIT_SECONDS:
+            logger.warning(f"⏳ GitHub rate limit nearly used up ({remaining} left), waiting {delay:.0f}s for reset")
+            report("pull_request", phase="rate limit reset", wait_s=round(delay))
+            wait(delay)
+            with self._lock:
+                if self.rate["reset"] == reset:
+                    # a new window: let the next response tell the real numbers
+                    self.rate["remaining"] = None
+
+    def _retry_delay(self, resp: httpx.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a rate limited response; None if it is not one."""
+        if resp.status_code not in (403, 429):
+            return None
+        if resp.headers.get("Retry-After"):
+            delay = float(resp.headers["Retry-After"])
+        elif resp.headers.get("X-RateLimit-Remaining") == "0" and resp.headers.get("X-RateLimit-Reset"):
+            delay = int(resp.headers["X-RateLimit-Reset"]) - time.time() + 1
+        elif resp.status_code == 429 or "rate limit" in _message(resp).lower():
+            # secondary limits without headers: GitHub asks for at least a minute, then backoff
+            delay = 60.0 * 2 ** attempt
+        else:
+            # a plain 403 is a permission problem, not worth retrying
+            return None
+        return delay if delay <= GITHUB_MAX_WAIT_SECONDS else None
+
+    def get(self, path: str, **kwargs) -> Any:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, payload: Dict) -> Any:
+        return self.request("POST", path, json=payload)
+
+    # -------------------------------
+    # Repository / Git data API
+    # -------------------------------
+    def repository(self, owner_repo: str) -> Dict:
+        """Repository metadata (id, default_branch, ...); revalidated by ETag on every call."""
+        return self.get(f"/repos/{owner_repo}")
+
+    def default_branch(self, owner_repo: str) -> str:
+        return self.repository(owner_repo)["default_branch"]
+
+    def branch_head(self, owner_repo: str, branch: str) -> str:
+        return self.get(f"/repos/{owner_repo}/git/ref/heads/{branch}")["object"]["sha"]
+
+    def commit_tree(self, owner_repo: str, commit_sha: str) -> str:
+        return self.get(f"/repos/{owner_repo}/git/commits/{commit_sha}")["tree"]["sha"]
+
+    def create_blob(self, owner_repo: str, content_b64: str) -> str:
+        return self.post(f"/repos/{owner_repo}/git/blobs", {"content": content_b64, "encoding": "base64"})["sha"]
+
+    def create_tree(self, owner_repo: str, base_tree: str, entries: list) -> str:
+        return self.post(f"/repos/{owner_repo}/git/trees", {"base_tree": base_tree, "tree": entries})["sha"]
+
+    def create_commit(self, owner_repo: str, message: str, tree: str, parents: list) -> str:
+        return self.post(f"/repos/{owner_repo}/git/commits",
+                         {"message": message, "tree": tree, "parents": parents})["sha"]
+
+    def create_ref(self, owner_repo: str, branch: str, sha: str) -> Dict:
+        return self.post(f"/repos/{owner_repo}/git/refs", {"ref": f"refs/heads/{branch}", "sha": sha})
+
+    def create_pull(self, owner_repo: str, title: str, body: str, head: str, base: str) -> Dict:
+        return self.post(f"/repos/{owner_repo}/pulls", {"title": title, "body": body, "head": head, "base": base})
+
+
+_clients: Dict[Tuple[str, str], GitHubClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_github_client(token: str, api_url: str = GITHUB_API_URL) -> GitHubClient:
+    """The process-wide client for `token`, so every PR shares its ETag cache, rate and write queue."""
+    key = (token, api_url.rstrip("/"))
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = GitHubClient(token, api_url)
+        return _clients[key]
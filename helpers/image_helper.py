@@ -0,0 +1,113 @@
+import json
+import subprocess
+from typing import Dict, List, Optional
+
+from helpers.build_scheduler import DOCKER_BIN, docker_env
+from helpers.metrics import timed
+
+
+def _docker(args, host: str = "", **kwargs) -> subprocess.CompletedProcess:
+    with timed("docker", args[0]):
+        return subprocess.run([DOCKER_BIN] + list(args), capture_output=True, text=True, env=docker_env(host), **kwargs)
+
+
+def image_label(image: str, label: str, host: str = "") -> Optional[str]:
+    """Return a label value of a local image, or None if the image/label is missing."""
+    proc = _docker(["image", "inspect", "--format", "{{json .Config.Labels}}", image], host)
+    if proc.returncode != 0:
+        return None
+    try:
+        labels = json.loads(proc.stdout.strip() or "null") or {}
+    except json.JSONDecodeError:
+        return None
+    return labels.get(label)
+
+
+def find_local_image_by_label(label: str, value: str, host: str = "") -> Optional[str]:
+    """Return the ID of a local image carrying label=value, if any."""
+    proc = _docker(["images", "--quiet", "--no-trunc", "--filter", f"label={label}={value}"], host)
+    if proc.returncode != 0:
+        return None
+    ids = [line.strip() for line in proc.stdout.splitlines() if line.strip()]
+    return ids[0] if ids else None
+
+
+def registry_image_labels(image: str, host: str = "") -> Dict[str, str]:
+    """
+    Read labels of a pushed image from its registry config blob, without pulling layers.
+    Returns {} when the image is not in the registry or buildx is unavailable.
+    """
+    proc = _docker(["buildx", "imagetools", "inspect", "--format", "{{json .Image}}", image], host)
+    if proc.returncode != 0:
+        return {}
+    try:
+        config = json.loads(proc.stdout.strip() or "null") or {}
+    except json.JSONDecodeError:
+        return {}
+    # multi-platform images come back as {"linux/amd64": {...}, ...}
+    if "config" not in config and config:
+        config = next(iter(config.values())) or {}
+    return (config.get("config") or {}).get("Labels") or {}
+
+
+def tag_image(source: str, target: str, host: str = "") -> subprocess.CompletedProcess:
+    return _docker(["tag", source, target], host)
+
+
+def image_history(image: str, host: str = "") -> List[Dict]:
+    """
+    Layers of a local image, newest first, as [{"size_bytes": int, "created_by": str}].
+    Sizes are uncompressed, as reported by `docker history`.
+    """
+    proc = _docker(["history", "--human=false", "--no-trunc", "--format", "{{.Size}}\t{{.CreatedBy}}", image], host)
+    if proc.returncode != 0:
+        return []
+    layers = []
+    for line in proc.stdout.splitlines():
+        size, _, created_by = line.partition("\t")
+        try:
+            size_bytes = int(size.strip())
+        except ValueError:
+            size_bytes = 0
+        layers.append({"size_bytes": size_bytes, "created_by": created_by.strip()})
+    return layers
+
+
+def _repository(image: str) -> str:
+    """Strip tag/digest: "reg:5000/org/app:v1" -> "reg:5000/org/app"."""
+    name = image.split("@")[0]
+    head, _, last = name.rpartition("/")
+    if ":" in last:
+        last = last.split(":")[0]
+    return f"{head}/{last}" if head else last
+
+
+def _manifest(image: str, host: str = "") -> Dict:
+    proc = _docker(["manifest", "inspect", image], host)
+    if proc.returncode != 0:
+        return {}
+    try:
+        return json.loads(proc.stdout or "{}")
+    except json.JSONDecodeError:
+        return {}
+
+
+def registry_compressed_size(image: str, host: str = "", platform: str = "linux/amd64") -> Optional[int]:
+    """
+    Total compressed layer size of a pushed image, read from its registry manifest.
+    For multi-platform indexes the `platform` entry (or the first one) is used.
+    Returns None when the manifest cannot be read.
+    """
+    manifest = _manifest(image, host)
+    if "manifests" in manifest:
+        entries = manifest["manifests"] or []
+        wanted = [m for m in entries
+                  if f"{(m.get('platform') or {}).get('os')}/{(m.get('platform') or {}).get('architecture')}" == platform]
+        entry = (wanted or entries or [None])[0]
+        if not entry:
+            return None
+        manifest = _manifest(f"{_repository(image)}@{entry['digest']}", host)
+    layers = manifest.get("layers")
+    if layers is None:
+        return None
+    return sum(int(layer.get("size", 0)) for layer in layers)
@@ -0,0 +1,129 @@
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from helpers.image_helper import image_history, registry_compressed_size
+
+# -------------------------------
+# Size gate configuration
+# -------------------------------
+# Fail the build step when the image exceeds this many MB (0 disables). Checked before the push,
+# on the uncompressed size (an upper bound of the compressed one) when the image is not in the registry yet
+IMAGE_SIZE_BUDGET_MB = float(os.getenv("IMAGE_SIZE_BUDGET_MB", 0))
+# Fail when the image grew more than this percentage over the previous build of the repo (0 disables)
+IMAGE_SIZE_MAX_GROWTH_PCT = float(os.getenv("IMAGE_SIZE_MAX_GROWTH_PCT", 0))
+# Where previous build sizes are kept, keyed by repo
+IMAGE_SIZE_HISTORY_FILE = os.getenv(
+    "IMAGE_SIZE_HISTORY_FILE", os.path.join(os.path.expanduser("~"), ".ai-onboard", "image_sizes.json")
+)
+
+_history_lock = threading.Lock()
+MB = 1024 * 1024
+
+
+def _instruction(created_by: str) -> str:
+    """Turn a `docker history` CreatedBy string back into a Dockerfile-like instruction."""
+    text = created_by.strip()
+    text = re.sub(r"\s*# buildkit$", "", text)
+    if text.startswith("RUN /bin/sh -c "):
+        return "RUN " + text[len("RUN /bin/sh -c "):].strip()
+    if text.startswith("/bin/sh -c #(nop) "):
+        return text[len("/bin/sh -c #(nop) "):].strip()
+    if text.startswith("/bin/sh -c "):
+        return "RUN " + text[len("/bin/sh -c "):].strip()
+    return text
+
+
+def _load_history() -> Dict:
+    try:
+        with open(IMAGE_SIZE_HISTORY_FILE, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_history(history: Dict):
+    os.makedirs(os.path.dirname(IMAGE_SIZE_HISTORY_FILE), exist_ok=True)
+    tmp = IMAGE_SIZE_HISTORY_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(history, fh, indent=2)
+    os.replace(tmp, IMAGE_SIZE_HISTORY_FILE)
+
+
+def _compressed_mb(image: str, host: str) -> Optional[float]:
+    compressed_bytes = registry_compressed_size(image, host)
+    return round(compressed_bytes / MB, 2) if compressed_bytes is not None else None
+
+
+def build_image_report(image: str, repo_key: str, host: str = "", registry: bool = True) -> Dict:
+    """
+    Per-layer sizes with the instruction that created each layer, total uncompressed and
+    compressed (registry) sizes, and the delta against the previous build of the same repo.
+    Use registry=False before the push (no compressed size yet). Nothing is recorded here:
+    record_image_size() makes the image the new baseline once it passed check_size_gate().
+    """
+    layers = [
+        {"instruction": _instruction(layer["created_by"]), "size_mb": round(layer["size_bytes"] / MB, 2)}
+        for layer in image_history(image, host)
+    ]
+    uncompressed = sum(layer["size_mb"] for layer in layers)
+    compressed = _compressed_mb(image, host) if registry else None
+
+    report = {
+        "layers": layers,
+        "total_uncompressed_mb": round(uncompressed, 2),
+        "total_compressed_mb": compressed,
+        "previous": None,
+    }
+
+    with _history_lock:
+        previous = _load_history().get(repo_key)
+        if previous:
+            report["previous"] = previous
+            # compare like with like: compressed when both builds have it
+            key = "total_compressed_mb" if compressed is not None and previous.get("total_compressed_mb") is not None \
+                else "total_uncompressed_mb"
+            before, after = previous.get(key) or 0, report[key] or 0
+            report["delta_mb"] = round(after - before, 2)
+            report["delta_pct"] = round((after - before) / before * 100, 1) if before else None
+    return report
+
+
+def add_registry_size(report: Dict, image: str, host: str = "") -> Dict:
+    """Fill in the compressed size of a report made before the push; the delta stays as gated."""
+    report["total_compressed_mb"] = _compressed_mb(image, host)
+    return report
+
+
+def record_image_size(repo_key: str, image: str, report: Dict):
+    """Make this image the baseline the next build of `repo_key` is compared with."""
+    with _history_lock:
+        history = _load_history()
+        history[repo_key] = {
+            "image": image,
+            "total_uncompressed_mb": report["total_uncompressed_mb"],
+            "total_compressed_mb": report.get("total_compressed_mb"),
+            "recorded_at": datetime.utcnow().isoformat(),
+        }
+        _save_history(history)
+
+
+def check_size_gate(report: Dict, budget_mb: Optional[float] = None, max_growth_pct: Optional[float] = None) -> Optional[str]:
+    """Return an error message when the report breaks the size budget or growth limit, else None."""
+    budget_mb = IMAGE_SIZE_BUDGET_MB if budget_mb is None else float(budget_mb)
+    max_growth_pct = IMAGE_SIZE_MAX_GROWTH_PCT if max_growth_pct is None else float(max_growth_pct)
+
+    size = report.get("total_compressed_mb")
+    label = "compressed"
+    if size is None:
+        size, label = report.get("total_uncompressed_mb"), "uncompressed"
+    if budget_mb and size is not None and size > budget_mb:
+        return f"Image is {size} MB {label}, above the {budget_mb} MB budget."
+
+    growth = report.get("delta_pct")
+    if max_growth_pct and growth is not None and growth > max_growth_pct:
+        return f"Image grew {growth}% since the previous build, above the {max_growth_pct}% limit."
+    return None
@@ -0,0 +1,449 @@
+import os
+import abc
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import shutil
+import hashlib
+import importlib
+import threading
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Job store configuration
+# -------------------------------
+# "memory", "sqlite" or "package.module:ClassName" for a custom backend
+JOB_STORE = os.getenv("JOB_STORE", "memory")
+JOB_STORE_PATH = os.getenv(
+    "JOB_STORE_PATH", os.path.join(os.path.expanduser("~"), ".ai-onboard", "jobs.db")
+)
+
+# A process renews the lease of its queued/running jobs every JOB_LEASE_SECONDS / 3; a job
+# whose lease ran out belongs to a process that crashed or restarted and is marked failed
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+# Identifies this process as the owner of the jobs it creates
+JOB_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+TERMINAL_STATUSES = {"success", "failed", "cancelled"}
+ACTIVE_STATUSES = {"queued", "running"}
+
+
+def request_hash(kind: str, request: Dict) -> str:
+    """Identity of a submission: same kind + same request -> same hash."""
+    return hashlib.sha256(json.dumps([kind, request], sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _git(path: str, *args: str) -> Optional[str]:
+    try:
+        proc = subprocess.run(["git", "-C", path, *args], capture_output=True, text=True)
+        return proc.stdout.strip() if proc.returncode == 0 else None
+    except Exception:
+        return None
+
+
+def _checkout_identity(path: str) -> Dict:
+    """
+    What a checkout holds rather than where it sits: remote (credentials stripped), HEAD
+    and the subdirectory, so every fresh clone of the same commit fingerprints the same.
+    """
+    head = _git(path, "rev-parse", "HEAD", "--show-prefix")
+    if head is None:
+        return {"dir": path, "head": None}
+    sha, _, prefix = head.partition("\n")
+    remote = _git(path, "config", "--get", "remote.origin.url") or ""
+    if "://" in remote:
+        parts = urlsplit(remote)
+        remote = urlunsplit(parts._replace(netloc=parts.netloc.rpartition("@")[2]))
+    return {"remote": remote, "head": sha, "prefix": prefix.strip()}
+
+
+def _checkout_root(path: str) -> Optional[str]:
+    parent = os.path.dirname(path)
+    while not os.path.exists(os.path.join(parent, ".git")):
+        if os.path.dirname(parent) == parent:
+            return None
+        parent = os.path.dirname(parent)
+    return parent
+
+
+def _fingerprint(value: Any) -> Any:
+    # absolute paths stand for their content: files by sha256 and their place in the checkout,
+    # checkouts by remote + commit
+    if isinstance(value, str) and os.path.isabs(value):
+        if os.path.isfile(value):
+            root = _checkout_root(value)
+            with open(value, "rb") as fh:
+                return {"file": os.path.relpath(value, root) if root else value,
+                        "sha256": hashlib.sha256(fh.read()).hexdigest()}
+        if os.path.isdir(value):
+            return _checkout_identity(value)
+        return {"missing": value}
+    if isinstance(value, dict):
+        return {k: _fingerprint(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint(v) for v in value]
+    return value
+
+
+def _relocate(value: Any, moves: List[Tuple[str, str]]) -> Any:
+    """
+    Point recorded outputs at the current checkout: paths under a checkout the recorded run
+    used are rewritten to the same place in the new one, and files are copied over.
+    """
+    if isinstance(value, str) and os.path.isabs(value):
+        for old, new in moves:
+            if value == old or value.startswith(old.rstrip(os.sep) + os.sep):
+                target = new + value[len(old):]
+                if os.path.isfile(value):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.copy2(value, target)
+                return target
+        return value
+    if isinstance(value, dict):
+        return {k: _relocate(v, moves) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_relocate(v, moves) for v in value]
+    return value
+
+
+def content_hash(value: Any) -> str:
+    """Hash of a stage's inputs or outputs, following file paths to their content."""
+    return hashlib.sha256(json.dumps(_fingerprint(value), sort_keys=True, default=str).encode()).hexdigest()
+
+
+class JobStore(abc.ABC):
+    """
+    Where onboarding jobs and their progress events live. API replicas keep no job state
+    of their own, so any replica can answer for any job as long as they share the store.
+    A job is {"id", "kind", "status", "request", "result", "error", "created_at", "updated_at"};
+    status goes queued -> running -> success | failed | cancelled.
+    """
+
+    @abc.abstractmethod
+    def create(self, kind: str, request: Dict, dedupe: bool = True) -> Dict:
+        """
+        New queued job. With `dedupe`, an identical request that is still queued/running is
+        returned instead (with "attached": True), so a double submit joins the in-flight run.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get(self, job_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def update(self, job_id: str, **fields) -> Dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def add_event(self, job_id: str, event: Dict):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def events(self, job_id: str, since: int = 0) -> List[Dict]:
+        """Events with index >= since, each carrying its "seq" index."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def list(self, limit: int = 50) -> List[Dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_stage(self, stage: str, inputs_hash: str) -> Optional[Dict]:
+        """Last completed run of `stage` with these inputs: {"inputs", "outputs", "outputs_hash", "duration_s"}."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def put_stage(self, stage: str, inputs_hash: str, record: Dict):
+        raise NotImplementedError
+
+
+class MemoryJobStore(JobStore):
+    """Process-local store: fine for a single replica and for tests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict] = {}
+        self._events: Dict[str, List[Dict]] = {}
+        self._stages: Dict[str, Dict] = {}
+
+    def create(self, kind: str, request: Dict, dedupe: bool = True) -> Dict:
+        now = time.time()
+        rhash = request_hash(kind, request)
+        job = {"id": uuid.uuid4().hex, "kind": kind, "status": "queued", "request": request, "request_hash": rhash,
+               "result": None, "error": None, "created_at": now, "updated_at": now}
+        with self._lock:
+            if dedupe:
+                for existing in self._jobs.values():
+                    if existing["request_hash"] == rhash and existing["status"] in ACTIVE_STATUSES:
+                        return dict(existing, attached=True)
+            self._jobs[job["id"]] = job
+            self._events[job["id"]] = []
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields) -> Dict:
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(fields, updated_at=time.time())
+            return dict(job)
+
+    def add_event(self, job_id: str, event: Dict):
+        with self._lock:
+            events = self._events.setdefault(job_id, [])
+            events.append(dict(event, seq=len(events), ts=time.time()))
+
+    def events(self, job_id: str, since: int = 0) -> List[Dict]:
+        with self._lock:
+            return list(self._events.get(job_id, [])[since:])
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda j: -j["created_at"])
+            return [dict(j) for j in jobs[:limit]]
+
+    def get_stage(self, stage: str, inputs_hash: str) -> Optional[Dict]:
+        with self._lock:
+            return self._stages.get(f"{stage}:{inputs_hash}")
+
+    def put_stage(self, stage: str, inputs_hash: str, record: Dict):
+        with self._lock:
+            self._stages[f"{stage}:{inputs_hash}"] = record
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Durable store in one SQLite file (WAL mode, so readers never block the writer).
+    Survives browser refreshes and restarts; replicas on one host / shared volume can share it.
+    Besides jobs and events it keeps every completed stage keyed by stage + inputs hash.
+    Active jobs carry their owner process and a lease it keeps renewing; jobs of a process
+    that died are marked failed once the lease expires and no longer attract resubmissions.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY, kind TEXT, status TEXT, request TEXT, request_hash TEXT,
+        result TEXT, error TEXT, created_at REAL, updated_at REAL, owner TEXT, lease_until REAL
+    );
+    CREATE INDEX IF NOT EXISTS jobs_active ON jobs (request_hash, status);
+    CREATE TABLE IF NOT EXISTS events (
+        job_id TEXT, seq INTEGER, body TEXT, ts REAL, PRIMARY KEY (job_id, seq)
+    );
+    CREATE TABLE IF NOT EXISTS stages (
+        stage TEXT, inputs_hash TEXT, inputs TEXT, outputs TEXT, outputs_hash TEXT,
+        duration_s REAL, job_id TEXT, created_at REAL, PRIMARY KEY (stage, inputs_hash)
+    );
+    """
+
+    def __init__(self, path: str = JOB_STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._heartbeat_lock = threading.Lock()
+        conn = self._conn()
+        conn.executescript(self.SCHEMA)
+        # stores created before leases existed
+        columns = {r["name"] for r in conn.execute("PRAGMA table_info(jobs)")}
+        for column in ("owner TEXT", "lease_until REAL"):
+            if column.split()[0] not in columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column}")
+        expired = self.expire_abandoned()
+        if expired:
+            logger.warning(f"⚠️ Marked {expired} abandoned job(s) failed")
+
+    def _conn(self) -> sqlite3.Connection:
+        # one connection per thread; sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def expire_abandoned(self) -> int:
+        """Mark queued/running jobs whose owner stopped renewing the lease as failed; returns how many."""
+        cur = self._conn().execute(
+            "UPDATE jobs SET status = 'failed', error = 'abandoned: owner ' || COALESCE(owner, '?') || "
+            "' stopped before finishing', updated_at = ? "
+            "WHERE status IN ('queued', 'running') AND COALESCE(lease_until, 0) < ?", (time.time(), time.time()))
+        return cur.rowcount
+
+    def _renew_leases(self):
+        while True:
+            time.sleep(JOB_LEASE_SECONDS / 3)
+            try:
+                self._conn().execute(
+                    "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status IN ('queued', 'running')",
+                    (time.time() + JOB_LEASE_SECONDS, JOB_OWNER))
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Could not renew job leases: {e}")
+
+    def _start_heartbeat(self):
+        with self._heartbeat_lock:
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._renew_leases, name="job-lease", daemon=True)
+                self._heartbeat.start()
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job["request"] = json.loads(job["request"]) if job["request"] else None
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def create(self, kind: str, request: Dict, dedupe: bool = True) -> Dict:
+        now = time.time()
+        rhash = request_hash(kind, request)
+        self._start_heartbeat()
+        conn = self._conn()
+        # IMMEDIATE takes the write lock up front: two concurrent submits cannot both insert
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if dedupe:
+                # never attach to a job whose owner is gone
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE request_hash = ? AND status IN ('queued', 'running') "
+                    "AND lease_until >= ? ORDER BY created_at DESC LIMIT 1", (rhash, now)).fetchone()
+                if row:
+                    conn.execute("COMMIT")
+                    return dict(self._job(row), attached=True)
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, request, request_hash, created_at, updated_at, owner, lease_until) "
+                "VALUES (?, ?, 'queued', ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(request, default=str), rhash, now, now, JOB_OWNER, now + JOB_LEASE_SECONDS))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row and row["status"] in ACTIVE_STATUSES and (row["lease_until"] or 0) < time.time():
+            # a poller waiting on a dead job gets a terminal status instead of polling forever
+            self.expire_abandoned()
+            row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def update(self, job_id: str, **fields) -> Dict:
+        fields["updated_at"] = time.time()
+        for key in ("request", "result"):
+            if key in fields:
+                fields[key] = json.dumps(fields[key], default=str)
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        self._conn().execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+        return self.get(job_id)
+
+    def add_event(self, job_id: str, event: Dict):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seq = conn.execute("SELECT COUNT(*) FROM events WHERE job_id = ?", (job_id,)).fetchone()[0]
+            conn.execute("INSERT INTO events (job_id, seq, body, ts) VALUES (?, ?, ?, ?)",
+                         (job_id, seq, json.dumps(event, default=str), time.time()))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def events(self, job_id: str, since: int = 0) -> List[Dict]:
+        rows = self._conn().execute(
+            "SELECT seq, body, ts FROM events WHERE job_id = ? AND seq >= ? ORDER BY seq", (job_id, since)).fetchall()
+        return [dict(json.loads(r["body"]), seq=r["seq"], ts=r["ts"]) for r in rows]
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        rows = self._conn().execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._job(r) for r in rows]
+
+    def get_stage(self, stage: str, inputs_hash: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT inputs, outputs, outputs_hash, duration_s, job_id FROM stages WHERE stage = ? AND inputs_hash = ?",
+            (stage, inputs_hash)).fetchone()
+        if not row:
+            return None
+        return {"inputs": json.loads(row["inputs"] or "null"), "outputs": json.loads(row["outputs"]),
+                "outputs_hash": row["outputs_hash"],
+                "duration_s": row["duration_s"], "job_id": row["job_id"]}
+
+    def put_stage(self, stage: str, inputs_hash: str, record: Dict):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO stages (stage, inputs_hash, inputs, outputs, outputs_hash, duration_s, job_id, "
+            "created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (stage, inputs_hash, json.dumps(record.get("inputs"), default=str), json.dumps(record["outputs"]),
+             record["outputs_hash"], record.get("duration_s"), record.get("job_id"), time.time()))
+
+
+class StageCache:
+    """
+    Pipeline stage cache on top of a JobStore. A stage is skipped when the same stage ran
+    with the same inputs (paths hashed by content) and its recorded outputs still hash the
+    same, i.e. the files it produced are still there and unmodified. A checkout counts as
+    the same input wherever it was cloned to; outputs the recorded run wrote into its own
+    checkout are copied into the current one.
+    """
+
+    def __init__(self, store: JobStore, job_id: Optional[str] = None):
+        self.store = store
+        self.job_id = job_id
+
+    def lookup(self, stage: str, inputs: Dict) -> Optional[Dict]:
+        try:
+            record = self.store.get_stage(stage, content_hash(inputs))
+            if record and content_hash(record["outputs"]) == record["outputs_hash"]:
+                logger.info(f"♻️  {stage}: inputs unchanged, reusing outputs of job {record.get('job_id')}")
+                moves = [(old, inputs[k]) for k, old in (record.get("inputs") or {}).items()
+                         if isinstance(old, str) and isinstance(inputs.get(k), str) and old != inputs[k]
+                         and os.path.isabs(old) and os.path.isdir(inputs[k])]
+                return _relocate(record["outputs"], moves)
+        except Exception as e:
+            logger.warning(f"⚠️ Stage cache lookup failed for {stage}: {e}")
+        return None
+
+    def record(self, stage: str, inputs: Dict, outputs: Dict, duration_s: float):
+        try:
+            json.dumps(outputs)
+        except (TypeError, ValueError):
+            return
+        try:
+            self.store.put_stage(stage, content_hash(inputs), {
+                "inputs": inputs, "outputs": outputs, "outputs_hash": content_hash(outputs),
+                "duration_s": duration_s, "job_id": self.job_id,
+            })
+        except Exception as e:
+            logger.warning(f"⚠️ Could not record stage {stage}: {e}")
+
+
+_store: Optional[JobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Process-wide store selected by JOB_STORE."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if JOB_STORE == "memory":
+                _store = MemoryJobStore()
+            elif JOB_STORE == "sqlite":
+                _store = SQLiteJobStore()
+            else:
+                module_name, _, class_name = JOB_STORE.partition(":")
+                _store = getattr(importlib.import_module(module_name), class_name)()
+        return _store
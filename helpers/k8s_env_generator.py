@@ -1,5 +1,5 @@
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 import yaml
 from datetime import datetime
 import logging
@@ -8,6 +8,8 @@ logger = logging.getLogger(__name__)
 
 # Reuse your existing qdrant helper functions
 from helpers.qdrant_k8s_helper import fetch_k8s_by_app_and_kind
+from helpers.progress import report, check_cancelled
+from helpers.metrics import timed
 
 
 def _ensure_dir(path: str):
@@ -67,7 +69,8 @@ def generate_env_yamls(
     envs: List[str],
     workspace_path: str,
     image_tag: str,
-    collection_name: str = "kubernetes_configs"
+    collection_name: str = "kubernetes_configs",
+    templates: Optional[List[Dict]] = None
 ) -> Dict[str, List[str]]:
     """
     Fetch templates for app_type from Qdrant and create files under:
@@ -78,20 +81,26 @@ def generate_env_yamls(
       __APP_NAME__ → actual app name
       __NAMESPACE__ → appname-env
       __IMAGE_TAG__ → image_tag
+
+    `templates` (as returned by fetch_k8s_by_app_and_kind) skips the Qdrant lookup,
+    e.g. when they were prefetched while the repository was still cloning.
     """
 
     logger.info(f"🚀 Starting YAML generation for app_type={app_type}, app_name={app_name}, envs={envs}")
     results = {}
 
     # Fetch all templates for given app_type
-    templates = fetch_k8s_by_app_and_kind(app_type, kind=None, limit=500, collection_name=collection_name)
-    logger.info(f"📦 Retrieved {len(templates)} templates from Qdrant for {app_type}")
+    if templates is None:
+        templates = fetch_k8s_by_app_and_kind(app_type, kind=None, limit=500, collection_name=collection_name)
+        logger.info(f"📦 Retrieved {len(templates)} templates from Qdrant for {app_type}")
 
     if not templates:
         logger.warning("⚠️ No templates found in Qdrant for this app type.")
         return {env: [] for env in envs}
 
+    total_files, rendered = len(envs) * len(templates), 0
     for env in envs:
+        check_cancelled()
         out_dir = os.path.join(workspace_path, "k8s_configs", env)
         _ensure_dir(out_dir)
         generated_files = []
@@ -114,10 +123,12 @@ def generate_env_yamls(
             final_yaml = _set_namespace_in_yaml(replaced_yaml, namespace)
 
             try:
-                with open(out_path, "w", encoding="utf-8") as fh:
+                with timed("file_write", "k8s_yaml"), open(out_path, "w", encoding="utf-8") as fh:
                     fh.write(final_yaml)
                 generated_files.append(out_path)
                 logger.debug(f"✅ Generated {out_path}")
+                rendered += 1
+                report("yamls", final=rendered == total_files, done=rendered, total=total_files, env=env)
             except Exception as e:
                 logger.error(f"❌ Failed to write {out_path}: {e}", exc_info=True)
                 continue
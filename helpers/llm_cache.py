@@ -0,0 +1,235 @@
+import os
+import json
+import math
+import time
+import uuid
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional
+
+from qdrant_client.http import models
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Cache configuration
+# -------------------------------
+LLM_CACHE_COLLECTION = os.getenv("LLM_CACHE_COLLECTION", "llm_response_cache")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", 0.95))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "0").lower() in ("1", "true", "yes")
+LLM_CACHE_LOCAL_PATH = os.getenv(
+    "LLM_CACHE_LOCAL_PATH", os.path.join(os.path.expanduser("~"), ".ai-onboard", "llm_cache.json")
+)
+
+
+def prompt_hash(prompt: str, scope: Optional[Dict] = None) -> str:
+    key = prompt.strip()
+    if scope:
+        key += "\n" + json.dumps(scope, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _point_id(p_hash: str) -> str:
+    """Deterministic UUID so re-caching a prompt replaces its point."""
+    return str(uuid.UUID(bytes=bytes.fromhex(p_hash)[:16]))
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a))
+    nb = math.sqrt(sum(y * y for y in b))
+    return dot / (na * nb) if na and nb else 0.0
+
+
+class _QdrantStore:
+    """Entries as points in their own Qdrant collection (vector = prompt embedding)."""
+
+    def __init__(self, client, collection_name: str):
+        self.client = client
+        self.collection_name = collection_name
+        self._ready = False
+
+    def _ensure(self, vector_size: int):
+        if self._ready:
+            return
+        if not self.client.collection_exists(self.collection_name):
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE)
+            )
+        self._ready = True
+
+    def get_exact(self, p_hash: str) -> Optional[Dict]:
+        if not self.client.collection_exists(self.collection_name):
+            return None
+        points = self.client.retrieve(self.collection_name, ids=[_point_id(p_hash)], with_payload=True)
+        return points[0].payload if points else None
+
+    def get_similar(self, vector: List[float], threshold: float, now: float, scope: Dict) -> Optional[Dict]:
+        if not self.client.collection_exists(self.collection_name):
+            return None
+        must = [models.FieldCondition(key="expires_at", range=models.Range(gt=now))]
+        must += [models.FieldCondition(key=k, match=models.MatchValue(value=v)) for k, v in scope.items()]
+        results = self.client.search(
+            collection_name=self.collection_name,
+            query_vector=vector,
+            query_filter=models.Filter(must=must),
+            score_threshold=threshold,
+            limit=1,
+        )
+        return results[0].payload if results else None
+
+    def put(self, p_hash: str, vector: List[float], payload: Dict):
+        self._ensure(len(vector))
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=[models.PointStruct(id=_point_id(p_hash), vector=vector, payload=payload)],
+        )
+
+
+class _LocalStore:
+    """JSON file fallback used when Qdrant is unreachable."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def get_exact(self, p_hash: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._load().get(p_hash)
+        return entry["payload"] if entry else None
+
+    def get_similar(self, vector: List[float], threshold: float, now: float, scope: Dict) -> Optional[Dict]:
+        with self._lock:
+            entries = list(self._load().values())
+        best, best_score = None, threshold
+        for entry in entries:
+            if entry["payload"].get("expires_at", 0) <= now:
+                continue
+            if any(entry["payload"].get(k) != v for k, v in scope.items()):
+                continue
+            score = _cosine(vector, entry["vector"])
+            if score >= best_score:
+                best, best_score = entry["payload"], score
+        return best
+
+    def put(self, p_hash: str, vector: List[float], payload: Dict):
+        with self._lock:
+            data = self._load()
+            now = time.time()
+            # drop expired entries while we are rewriting the file anyway
+            data = {k: v for k, v in data.items() if v["payload"].get("expires_at", 0) > now}
+            data[p_hash] = {"vector": vector, "payload": payload}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp, self.path)
+
+
+class LLMResponseCache:
+    """
+    Prompt -> response cache for LLM calls.
+    Lookup order: exact prompt hash, then embedding similarity >= threshold. Entries expire
+    after ttl_seconds. `scope` (e.g. app_type and model) must match exactly for either kind of
+    hit, and `similarity_text` (the variable part of the prompt) is what gets embedded, so a
+    shared instruction prefix cannot make different stacks look alike.
+    Uses a Qdrant collection through `client`; each call that finds Qdrant unreachable falls
+    back to a local JSON file, so an outage at start-up does not stick for the whole process.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], List[float]],
+        client=None,
+        collection_name: str = LLM_CACHE_COLLECTION,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        threshold: float = LLM_CACHE_SIMILARITY,
+        local_path: str = LLM_CACHE_LOCAL_PATH,
+    ):
+        self.embed_fn = embed_fn
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.remote = _QdrantStore(client, collection_name) if client is not None else None
+        self.local = _LocalStore(local_path)
+        self.backend = "qdrant" if self.remote else "local"
+        self._lock = threading.Lock()
+        self._metrics = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "expired": 0, "bypassed": 0, "stores": 0,
+                         "local_fallbacks": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def _call(self, op: str, *args):
+        """Run a store operation on Qdrant, or on the local file when Qdrant fails for this call."""
+        if self.remote is not None:
+            try:
+                result = getattr(self.remote, op)(*args)
+                self.backend = "qdrant"
+                return result
+            except Exception as e:
+                logger.warning(f"⚠️ Qdrant unreachable for LLM cache ({op}), using local store: {e}")
+                self._count("local_fallbacks")
+        self.backend = "local"
+        return getattr(self.local, op)(*args)
+
+    def get(self, prompt: str, bypass: bool = False, scope: Optional[Dict] = None,
+            similarity_text: Optional[str] = None) -> Optional[str]:
+        if bypass or LLM_CACHE_BYPASS:
+            self._count("bypassed")
+            return None
+        now = time.time()
+        scope = scope or {}
+        try:
+            payload = self._call("get_exact", prompt_hash(prompt, scope))
+            if payload and payload.get("expires_at", 0) > now:
+                self._count("exact_hits")
+                return payload["response"]
+            if payload:
+                self._count("expired")
+            vector = self.embed_fn(similarity_text if similarity_text is not None else prompt)
+            payload = self._call("get_similar", vector, self.threshold, now, scope)
+            if payload:
+                self._count("semantic_hits")
+                return payload["response"]
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache lookup failed: {e}")
+        self._count("misses")
+        return None
+
+    def put(self, prompt: str, response: str, scope: Optional[Dict] = None, similarity_text: Optional[str] = None):
+        now = time.time()
+        scope = scope or {}
+        p_hash = prompt_hash(prompt, scope)
+        payload = dict(
+            scope,
+            prompt_hash=p_hash,
+            prompt=prompt,
+            response=response,
+            created_at=now,
+            expires_at=now + self.ttl_seconds,
+        )
+        try:
+            vector = self.embed_fn(similarity_text if similarity_text is not None else prompt)
+            self._call("put", p_hash, vector, payload)
+            self._count("stores")
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache store failed: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+        lookups = metrics["exact_hits"] + metrics["semantic_hits"] + metrics["misses"]
+        metrics["hit_rate"] = round((metrics["exact_hits"] + metrics["semantic_hits"]) / lookups, 3) if lookups else 0.0
+        metrics["backend"] = self.backend
+        return metrics
@@ -0,0 +1,216 @@
+import os
+import json
+import time
+import random
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Pool configuration
+# -------------------------------
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 4))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 5))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", 1.0))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", 30.0))
+LLM_HTTP_TIMEOUT_SECONDS = float(os.getenv("LLM_HTTP_TIMEOUT_SECONDS", 120.0))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Process-wide keep-alive connection pool and concurrency gate shared by every model
+_http_client = httpx.Client(
+    timeout=LLM_HTTP_TIMEOUT_SECONDS,
+    limits=httpx.Limits(max_connections=LLM_MAX_CONCURRENCY * 2, max_keepalive_connections=LLM_MAX_CONCURRENCY),
+)
+_semaphore = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "coalesced": 0, "retries": 0, "rate_limited": 0, "failures": 0, "waiting": 0, "running": 0}
+
+
+def get_http_client() -> httpx.Client:
+    """Shared keep-alive HTTP client for LLM SDKs."""
+    return _http_client
+
+
+def _bump(name: str, delta: int = 1):
+    with _stats_lock:
+        _stats[name] += delta
+
+
+def get_llm_pool_stats() -> Dict[str, int]:
+    """Requests sent, coalesced, retried and currently waiting/running on the shared semaphore."""
+    with _stats_lock:
+        return dict(_stats, max_concurrency=LLM_MAX_CONCURRENCY)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (httpx.ConnectError, httpx.ReadTimeout, httpx.RemoteProtocolError)):
+        return True
+    return _status_code(error) in RETRYABLE_STATUS
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff; a server Retry-After is used as the floor."""
+    delay = random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, LLM_BACKOFF_MAX_SECONDS))
+    return delay
+
+
+def _request_key(model: str, messages: List[BaseMessage], stop, kwargs: Dict[str, Any]) -> str:
+    body = {
+        "model": model,
+        "messages": [(m.type, m.content, getattr(m, "tool_calls", None), getattr(m, "tool_call_id", None)) for m in messages],
+        "stop": stop,
+        "kwargs": kwargs,
+    }
+    return json.dumps(body, sort_keys=True, default=str)
+
+
+class PooledChatModel(BaseChatModel):
+    """
+    Wraps a chat model so every call goes through the process-wide pool:
+    at most LLM_MAX_CONCURRENCY requests in flight, jittered exponential backoff on
+    429/5xx, and identical concurrent requests merged into one upstream call.
+    """
+
+    inner: BaseChatModel
+    max_retries: int = LLM_MAX_RETRIES
+
+    @property
+    def _llm_type(self) -> str:
+        return f"pooled-{self.inner._llm_type}"
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.inner, "model_name", None) or getattr(self.inner, "model", "unknown")
+
+    def bind_tools(self, tools, **kwargs):
+        # let the wrapped model format tools / tool_choice, then carry those kwargs on ourselves
+        binding = self.inner.bind_tools(tools, **kwargs)
+        return self.bind(**binding.kwargs)
+
+    def _retry_or_raise(self, error: Exception, attempt: int):
+        if attempt >= self.max_retries or not _is_retryable(error):
+            _bump("failures")
+            raise error
+        if _status_code(error) == 429:
+            _bump("rate_limited")
+        _bump("retries")
+        delay = backoff_delay(attempt, _retry_after(error))
+        logger.warning(f"⏳ {self.model_name}: {error!r}, retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+        # sleep outside the semaphore so other requests can use the slot
+        time.sleep(delay)
+
+    def _call_upstream(self, messages, stop, kwargs) -> ChatResult:
+        attempt = 0
+        while True:
+            _bump("waiting")
+            with _semaphore:
+                _bump("waiting", -1)
+                _bump("running")
+                try:
+                    _bump("requests")
+                    return self.inner._generate(messages, stop=stop, **kwargs)
+                except Exception as e:
+                    error = e
+                finally:
+                    _bump("running", -1)
+
+            self._retry_or_raise(error, attempt)
+            attempt += 1
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        key = _request_key(self.model_name, messages, stop, kwargs)
+        with _inflight_lock:
+            future = _inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                _inflight[key] = future
+
+        if not leader:
+            _bump("coalesced")
+            result = future.result()
+            # the upstream tokens were already accounted to the leader
+            return ChatResult(
+                generations=result.generations,
+                llm_output=dict(result.llm_output or {}, coalesced=True,
+                                token_usage={"prompt_tokens": 0, "completion_tokens": 0}),
+            )
+
+        try:
+            result = self._call_upstream(messages, stop, kwargs)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs):
+        """
+        Streams through the same semaphore (held for the whole stream). Failures before the
+        first chunk are retried like _generate; streams are never coalesced.
+        """
+        attempt = 0
+        while True:
+            started = False
+            _bump("waiting")
+            with _semaphore:
+                _bump("waiting", -1)
+                _bump("running")
+                try:
+                    _bump("requests")
+                    if type(self.inner)._stream is BaseChatModel._stream:
+                        # model without native streaming: one chunk with the full answer
+                        result = self.inner._generate(messages, stop=stop, **kwargs)
+                        message = result.generations[0].message
+                        chunks = [ChatGenerationChunk(message=AIMessageChunk(
+                            content=message.content, usage_metadata=getattr(message, "usage_metadata", None)))]
+                    else:
+                        chunks = self.inner._stream(messages, stop=stop, **kwargs)
+                    for chunk in chunks:
+                        started = True
+                        if run_manager:
+                            run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                        yield chunk
+                    return
+                except Exception as e:
+                    if started:
+                        _bump("failures")
+                        raise
+                    error = e
+                finally:
+                    _bump("running", -1)
+
+            self._retry_or_raise(error, attempt)
+            attempt += 1
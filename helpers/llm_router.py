@@ -0,0 +1,140 @@
+import os
+import time
+import threading
+from typing import Dict, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from helpers.llm_client import PooledChatModel, get_http_client
+from helpers.metrics import observe_call, record_tokens
+
+import logging
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# Model routing configuration
+# --------------------------------------------------
+# "groq" (default) or "fake" for the offline FakeChatModel
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq").lower()
+
+# Roles: dispatch turns only pick and echo a tool call, generation turns write content
+MODEL_BY_ROLE = {
+    "dispatch": os.getenv("LLM_MODEL_DISPATCH", "llama-3.1-8b-instant"),
+    "generation": os.getenv("LLM_MODEL_GENERATION", "llama-3.3-70b-versatile"),
+}
+
+# Agent -> role. Override a single agent with LLM_MODEL_<AGENT>, e.g. LLM_MODEL_BUILD_PUSH=llama-3.3-70b-versatile
+AGENT_ROLES = {
+    "git_clone": "dispatch",
+    "dockerfile": "dispatch",
+    "build_push": "dispatch",
+    "generate_env_yamls": "dispatch",
+    "dockerfile_generation": "generation",
+}
+
+
+def model_for(agent: Optional[str] = None) -> str:
+    """Model name for an agent; unknown or missing agents get the generation model."""
+    if agent:
+        override = os.getenv(f"LLM_MODEL_{agent.upper()}")
+        if override:
+            return override
+    return MODEL_BY_ROLE[AGENT_ROLES.get(agent, "generation")]
+
+
+# --------------------------------------------------
+# Per-model usage tracking
+# --------------------------------------------------
+_usage_lock = threading.Lock()
+_usage: Dict[str, Dict[str, float]] = {}
+
+
+def _record(model: str, latency: float, prompt_tokens: int, completion_tokens: int, error: bool = False):
+    with _usage_lock:
+        u = _usage.setdefault(model, {"calls": 0, "errors": 0, "total_latency_s": 0.0, "max_latency_s": 0.0,
+                                      "prompt_tokens": 0, "completion_tokens": 0})
+        u["calls"] += 1
+        u["errors"] += int(error)
+        u["total_latency_s"] += latency
+        u["max_latency_s"] = max(u["max_latency_s"], latency)
+        u["prompt_tokens"] += prompt_tokens
+        u["completion_tokens"] += completion_tokens
+    # Prometheus histograms / counters and the current job's breakdown
+    observe_call("llm", model, latency, error)
+    record_tokens(model, prompt_tokens, completion_tokens)
+
+
+def get_llm_usage() -> Dict[str, Dict[str, float]]:
+    """Per-model call count, latency and token totals since process start."""
+    with _usage_lock:
+        out = {}
+        for model, u in _usage.items():
+            out[model] = dict(u)
+            out[model]["avg_latency_s"] = round(u["total_latency_s"] / u["calls"], 3) if u["calls"] else 0.0
+        return out
+
+
+def _token_counts(response) -> Tuple[int, int]:
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    if token_usage:
+        return int(token_usage.get("prompt_tokens", 0)), int(token_usage.get("completion_tokens", 0))
+    for generations in response.generations:
+        for g in generations:
+            usage = getattr(getattr(g, "message", None), "usage_metadata", None) or {}
+            if usage:
+                return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+    return 0, 0
+
+
+class LLMUsageTracker(BaseCallbackHandler):
+    """Callback attached to each routed client; times every call and records its token usage."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._starts = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        latency = time.perf_counter() - self._starts.pop(run_id, time.perf_counter())
+        prompt_tokens, completion_tokens = _token_counts(response)
+        _record(self.model, latency, prompt_tokens, completion_tokens)
+        logger.info(f"🧠 {self.model}: {latency:.2f}s, {prompt_tokens}+{completion_tokens} tokens")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        latency = time.perf_counter() - self._starts.pop(run_id, time.perf_counter())
+        _record(self.model, latency, 0, 0, error=True)
+
+
+# --------------------------------------------------
+# Client construction (one client per model name)
+# --------------------------------------------------
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _build_client(model: str):
+    """
+    Provider client wrapped in PooledChatModel (shared keep-alive HTTP pool, concurrency
+    limit, retry/backoff, coalescing). The wrapper owns retries, so the SDK's are disabled.
+    """
+    if LLM_PROVIDER == "fake":
+        from helpers.fake_llm import FakeChatModel
+        inner = FakeChatModel(model=model)
+    else:
+        from langchain_groq import ChatGroq
+        inner = ChatGroq(model=model, api_key=os.getenv("GROQ_API_KEY"), max_retries=0, http_client=get_http_client())
+    return PooledChatModel(inner=inner, callbacks=[LLMUsageTracker(model)])
+
+
+def get_chat_model(agent: Optional[str] = None):
+    """Return the (shared) chat model routed for `agent`."""
+    model = model_for(agent)
+    with _clients_lock:
+        if model not in _clients:
+            _clients[model] = _build_client(model)
+        return _clients[model]
@@ -0,0 +1,305 @@
+import os
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Metrics configuration
+# -------------------------------
+# The API serves GET /metrics itself; the Streamlit page and the bulk CLI expose the same
+# Prometheus text on this port when set (0 = off)
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter per label set, rendered in the Prometheus text format."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_label_text(self.labels, key)} {value:g}" for key, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set (plus _sum and _count), Prometheus style."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            # per bucket counts (non cumulative), then sum and count
+            series = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for i, bound in enumerate(self.buckets):
+                cumulative += series[i]
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, key, le)} {cumulative:g}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_label_text(self.labels, key, inf)} {series[-1]:g}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {series[-1]:g}")
+        return lines
+
+
+_metrics: List[Any] = []
+
+
+def _register(metric):
+    _metrics.append(metric)
+    return metric
+
+
+STAGE_SECONDS = _register(Histogram(
+    "onboarding_stage_seconds", "Duration of onboarding pipeline stages.", ("stage", "status")))
+CALL_SECONDS = _register(Histogram(
+    "onboarding_call_seconds", "Latency of external calls (git, qdrant, embedding, llm, docker, file_write, github).",
+    ("kind", "target")))
+CALL_ERRORS = _register(Counter(
+    "onboarding_call_errors_total", "External calls that raised an exception.", ("kind", "target")))
+LLM_TOKENS = _register(Counter(
+    "onboarding_llm_tokens_total", "LLM tokens by model and type (prompt|completion).", ("model", "type")))
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------------
+# Per-job timing breakdown
+# -------------------------------
+class JobTimings:
+    """
+    Where one job's time went: per stage its duration and the external calls made from it
+    (count / total / max seconds per "kind.target"), plus LLM tokens per model.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict] = {}
+        self.calls: Dict[str, Dict[str, Dict]] = {}
+        self.tokens: Dict[str, Dict[str, int]] = {}
+
+    def add_call(self, stage: str, call: str, seconds: float, error: bool):
+        with self._lock:
+            c = self.calls.setdefault(stage, {}).setdefault(call, {"count": 0, "total_s": 0.0, "max_s": 0.0, "errors": 0})
+            c["count"] += 1
+            c["total_s"] += seconds
+            c["max_s"] = max(c["max_s"], seconds)
+            c["errors"] += int(error)
+
+    def add_stage(self, stage: str, seconds: float, status: str):
+        with self._lock:
+            self.stages[stage] = {"duration_s": round(seconds, 3), "status": status}
+
+    def add_tokens(self, model: str, prompt: int, completion: int):
+        with self._lock:
+            t = self.tokens.setdefault(model, {"prompt": 0, "completion": 0})
+            t["prompt"] += prompt
+            t["completion"] += completion
+
+    def breakdown(self) -> Dict:
+        """{"stages": {stage: {duration_s, status, calls}}, "calls": totals per call, "tokens": per model}."""
+        with self._lock:
+            stages = {name: dict(entry, calls={}) for name, entry in self.stages.items()}
+            totals: Dict[str, Dict] = {}
+            for stage, calls in self.calls.items():
+                target = stages.setdefault(stage or "(job)", {"calls": {}})["calls"]
+                for call, c in calls.items():
+                    target[call] = dict(c, total_s=round(c["total_s"], 3), max_s=round(c["max_s"], 3))
+                    t = totals.setdefault(call, {"count": 0, "total_s": 0.0, "errors": 0})
+                    t["count"] += c["count"]
+                    t["total_s"] = round(t["total_s"] + c["total_s"], 3)
+                    t["errors"] += c["errors"]
+            return {"stages": stages, "calls": totals, "tokens": {m: dict(t) for m, t in self.tokens.items()}}
+
+
+# Collector of the job running in the current context and the pipeline stage inside it;
+# stage threads inherit both (Pipeline runs stages in a copy of the submitting context)
+_timings: contextvars.ContextVar = contextvars.ContextVar("onboarding_timings", default=None)
+_stage: contextvars.ContextVar = contextvars.ContextVar("onboarding_stage", default="")
+
+
+def current_timings() -> Optional[JobTimings]:
+    return _timings.get()
+
+
+@contextmanager
+def collect_timings(timings: Optional[JobTimings] = None):
+    """Attribute calls made in this context to `timings` (a new JobTimings by default)."""
+    timings = timings or JobTimings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+@contextmanager
+def in_stage(stage: str):
+    token = _stage.set(stage)
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+
+
+def observe_call(kind: str, target: str, seconds: float, error: bool = False):
+    CALL_SECONDS.observe(seconds, kind=kind, target=target)
+    if error:
+        CALL_ERRORS.inc(kind=kind, target=target)
+    timings = _timings.get()
+    if timings:
+        timings.add_call(_stage.get(), f"{kind}.{target}" if target else kind, seconds, error)
+
+
+def observe_stage(stage: str, seconds: float, status: str):
+    STAGE_SECONDS.observe(seconds, stage=stage, status=status)
+    timings = _timings.get()
+    if timings:
+        timings.add_stage(stage, seconds, status)
+
+
+def record_tokens(model: str, prompt: int, completion: int):
+    if prompt:
+        LLM_TOKENS.inc(prompt, model=model, type="prompt")
+    if completion:
+        LLM_TOKENS.inc(completion, model=model, type="completion")
+    timings = _timings.get()
+    if timings:
+        timings.add_tokens(model, prompt, completion)
+
+
+@contextmanager
+def timed(kind: str, target: str = ""):
+    """Time the block as one `kind` call (e.g. timed("docker", "build")); exceptions count as errors."""
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        observe_call(kind, target, time.perf_counter() - start, error)
+
+
+class Instrumented:
+    """
+    Proxy timing calls to `methods` of `target` as `kind` calls, labelled with `label` or
+    the method name (Qdrant client queries, embedder encodes); everything else passes through.
+    """
+
+    def __init__(self, target: Any, kind: str, methods: Iterable[str], label: Optional[str] = None):
+        self._target = target
+        self._kind = kind
+        self._methods = frozenset(methods)
+        self._label = label
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if name not in self._methods or not callable(attr):
+            return attr
+        label = self._label or name
+
+        def call(*args, **kwargs):
+            with timed(self._kind, label):
+                return attr(*args, **kwargs)
+        return call
+
+
+# -------------------------------
+# Standalone /metrics endpoint
+# -------------------------------
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port: int = METRICS_PORT, host: str = "0.0.0.0"):
+    """Serve render() at http://host:port/metrics from a daemon thread, once per process."""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is not None:
+            return _server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                data = render().encode("utf-8")
+                self.send_response(200 if self.path.split("?", 1)[0] == "/metrics" else 404)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            _server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            # another process (e.g. a second Streamlit worker) already serves this port
+            logger.warning(f"⚠️ Metrics endpoint not started on port {port}: {e}")
+            return None
+        threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+        logger.info(f"📈 Metrics on http://{host}:{port}/metrics")
+        return _server
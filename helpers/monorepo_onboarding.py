@@ -0,0 +1,127 @@
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from helpers.service_discovery import discover_services
+from helpers.k8s_env_generator import generate_env_yamls
+from helpers.build_scheduler import repo_key_for_workspace
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Monorepo configuration
+# -------------------------------
+MONOREPO_MAX_WORKERS = int(os.getenv("MONOREPO_MAX_WORKERS", 4))
+
+
+def service_image_tag(image_tag: str, service: Dict, single: bool) -> str:
+    """"shan5a6/shop:v1" -> "shan5a6/shop-billing:v1"; a single-service repo keeps the tag."""
+    if single:
+        return image_tag
+    last_slash = image_tag.rfind("/")
+    colon = image_tag.rfind(":")
+    if colon > last_slash:
+        return f"{image_tag[:colon]}-{service['name']}{image_tag[colon:]}"
+    return f"{image_tag}-{service['name']}"
+
+
+def _onboard_service(service: Dict, workspace_path: str, app_name: str, envs: List[str],
+                     image_tag: str, repo_key: str, build: bool) -> Dict:
+    # imported here so discovery works without the embedding model / docker tooling loaded
+    from tools.dockerfile_tool import DockerfileGeneration
+    from tools.build_publish_tool import build_push_tool
+
+    service_path = os.path.normpath(os.path.join(workspace_path, service["path"]))
+    result = {"service": service["name"], "path": service["path"], "app_type": service["app_type"],
+              "image": image_tag, "timings": {}}
+    start = time.perf_counter()
+
+    step_start = time.perf_counter()
+    generation = DockerfileGeneration(service["app_type"], service_path)
+    result["dockerfile"] = generation.run()
+    result["dockerfile_source"] = generation.source
+    result["timings"]["dockerfile_s"] = round(time.perf_counter() - step_start, 3)
+
+    if build:
+        step_start = time.perf_counter()
+        build_result = json.loads(build_push_tool.invoke(json.dumps({
+            "app_type": service["app_type"],
+            "image_name_tag": image_tag,
+            "workspace_path": service_path,
+            # one affinity key per repository: sibling services share base layers on the same host
+            "repo": repo_key,
+            # but each service is its own image: size history / growth gate per service
+            "size_key": f"{repo_key}#{service['path']}",
+        })))
+        result["build"] = build_result
+        result["timings"]["build_s"] = round(time.perf_counter() - step_start, 3)
+        if build_result.get("status") != "success":
+            result.update(status="failed", step=f"build:{build_result.get('step', 'unknown')}",
+                          error=build_result.get("error") or build_result.get("stderr"))
+            result["timings"]["total_s"] = round(time.perf_counter() - start, 3)
+            return result
+
+    step_start = time.perf_counter()
+    # manifests land in <service>/k8s_configs/<env>/ next to the service's Dockerfile
+    result["generated"] = generate_env_yamls(service["app_type"], service["name"] if service["path"] != "." else app_name,
+                                             envs, service_path, image_tag=image_tag)
+    result["timings"]["yamls_s"] = round(time.perf_counter() - step_start, 3)
+    result["timings"]["total_s"] = round(time.perf_counter() - start, 3)
+    result["status"] = "success"
+    return result
+
+
+def onboard_services(workspace_path: str, app_name: str, envs: List[str], image_tag: str,
+                     services: Optional[List[Dict]] = None, build: bool = True,
+                     max_workers: int = MONOREPO_MAX_WORKERS) -> Dict:
+    """
+    Onboard every service root of a cloned workspace in parallel: Dockerfile,
+    image build/push and per-env manifests, each under the service's own directory.
+    Builds still queue on the shared BuildScheduler, so max_workers bounds the LLM /
+    rendering fan-out while docker concurrency stays governed by DOCKER_HOST_MAX_CONCURRENCY.
+
+    Returns {"status", "services": [...per service result...], "wall_s", "sum_s"}.
+    """
+    services = services if services is not None else discover_services(workspace_path)
+    if not services:
+        return {"status": "failed", "error": f"No service roots found in {workspace_path}", "services": []}
+
+    single = len(services) == 1 and services[0]["path"] == "."
+    repo_key = repo_key_for_workspace(workspace_path)
+    print(f"🧭 Onboarding {len(services)} service(s) with {max_workers} worker(s): "
+          f"{', '.join(s['name'] for s in services)}")
+
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(services))),
+                            thread_name_prefix="onboard-svc") as pool:
+        futures = {
+            pool.submit(_onboard_service, s, workspace_path, app_name, envs,
+                        service_image_tag(image_tag, s, single), repo_key, build): s
+            for s in services
+        }
+        for future in as_completed(futures):
+            service = futures[future]
+            try:
+                res = future.result()
+            except Exception as e:
+                logger.error(f"❌ Service {service['name']} failed: {e}", exc_info=True)
+                res = {"service": service["name"], "path": service["path"], "app_type": service["app_type"],
+                       "status": "failed", "error": str(e)}
+            print(f"{'✅' if res['status'] == 'success' else '❌'} {res['service']}: {res.get('timings', {})}")
+            results.append(res)
+
+    order = {s["name"]: i for i, s in enumerate(services)}
+    results.sort(key=lambda r: order.get(r["service"], 0))
+    failed = [r["service"] for r in results if r["status"] != "success"]
+    return {
+        "status": "failed" if failed else "success",
+        "failed": failed,
+        "services": results,
+        "wall_s": round(time.perf_counter() - start, 3),
+        # what the same work would have cost one service after another
+        "sum_s": round(sum(r.get("timings", {}).get("total_s", 0.0) for r in results), 3),
+    }
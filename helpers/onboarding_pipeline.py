@@ -0,0 +1,130 @@
+import os
+import json
+import threading
+from typing import Callable, Dict, List, Optional
+
+from helpers.pipeline import Pipeline, Stage
+from helpers.app_type_detector import resolve_app_type, AUTO_APP_TYPES
+
+import logging
+logger = logging.getLogger(__name__)
+
+# App types offered in the UI; prefetched when the type is only known after the clone
+KNOWN_APP_TYPES = ["Java", "NodeJS", "Python", ".NET"]
+
+
+# -------------------------------
+# Stage functions
+# -------------------------------
+def _clone(git_url: str) -> Dict:
+    from helpers.git_helper import clone_repository
+    return {"workspace_path": clone_repository(git_url)}
+
+
+def _prefetch_templates(app_type_hint: Optional[str]) -> Dict:
+    from helpers.qdrant_k8s_helper import fetch_k8s_by_app_and_kind
+    auto = (app_type_hint or "").strip().lower() in AUTO_APP_TYPES
+    types = KNOWN_APP_TYPES if auto else [app_type_hint]
+    return {"k8s_templates": {t: fetch_k8s_by_app_and_kind(t, kind=None, limit=500) for t in types}}
+
+
+def _load_dockerfile_generator() -> Dict:
+    # importing the tool loads the embedding model; do it while git is still cloning
+    from tools.dockerfile_tool import DockerfileGeneration
+    return {"dockerfile_generator": DockerfileGeneration}
+
+
+def _detect(workspace_path: str, app_type_hint: Optional[str]) -> Dict:
+    app_type = resolve_app_type(app_type_hint, workspace_path)
+    if not app_type:
+        raise RuntimeError("app_type not given and could not be detected from the workspace")
+    return {"app_type": app_type}
+
+
+def _dockerfile(workspace_path: str, app_type: str, dockerfile_generator) -> Dict:
+    generation = dockerfile_generator(app_type, workspace_path)
+    return {"dockerfile_path": generation.run(), "dockerfile_source": generation.source}
+
+
+def _build(workspace_path: str, app_type: str, image_tag: str, dockerfile_path: str) -> Dict:
+    from tools.build_publish_tool import build_push_tool
+    result = json.loads(build_push_tool.invoke(json.dumps({
+        "app_type": app_type, "image_name_tag": image_tag, "workspace_path": workspace_path,
+    })))
+    if result.get("status") != "success":
+        raise RuntimeError(f"{result.get('step', 'build')}: {result.get('error') or result.get('stderr')}")
+    return {"build_result": result}
+
+
+def _yamls(workspace_path: str, app_type: str, app_name: str, envs: List[str], image_tag: str,
+           k8s_templates: Optional[Dict]) -> Dict:
+    from helpers.k8s_env_generator import generate_env_yamls
+    # the prefetch stage is optional: without it the generator queries Qdrant itself
+    templates = (k8s_templates or {}).get(app_type)
+    return {"generated": generate_env_yamls(app_type, app_name, envs, workspace_path,
+                                            image_tag=image_tag, templates=templates)}
+
+
+def _pull_request(workspace_path: str, git_url: str, generated: Dict, **upstream) -> Dict:
+    # `upstream` is the build result (or Dockerfile path): only there to order the PR last
+    from helpers.git_pr_helper import create_pull_request
+    # stage exactly what this run wrote; without a known list (API/UI) the artefact pathspecs apply
+    paths = [f for files in (generated or {}).values() for f in files]
+    if upstream.get("dockerfile_path"):
+        paths.append(upstream["dockerfile_path"])
+    elif paths:
+        paths.append(os.path.join(workspace_path, "Dockerfile"))
+    return {"pull_request": create_pull_request(workspace_path, git_url, paths=paths or None)}
+
+
+def build_onboarding_pipeline(build: bool = True, create_pr: bool = False,
+                              limits: Optional[Dict[str, threading.Semaphore]] = None, stage_cache=None) -> Pipeline:
+    """
+    clone ─┬─ detect ─┬─ dockerfile ─ build ──┬─ pull_request
+           │          └─ yamls ───────────────┘
+    prefetch_templates / load_dockerfile_generator run alongside the clone.
+    YAMLs only need the image tag, so they render while docker builds.
+    `limits` caps stages across pipelines sharing the semaphores and `stage_cache` skips
+    stages whose inputs are unchanged since a previous run (see Pipeline).
+    """
+    stages = [
+        # a URL says nothing about upstream commits, and a shared workspace would be written by
+        # concurrent jobs: every run clones afresh. Later stages still reuse earlier runs, since
+        # the stage cache knows a checkout by remote + commit rather than by where it was cloned
+        Stage("clone", _clone, inputs=["git_url"], outputs=["workspace_path"], cacheable=False),
+        # templates can change in Qdrant and a loaded class is not serializable: never cached
+        Stage("prefetch_templates", _prefetch_templates, inputs=["app_type_hint"], outputs=["k8s_templates"],
+              optional=True, cacheable=False),
+        Stage("load_dockerfile_generator", _load_dockerfile_generator, outputs=["dockerfile_generator"],
+              cacheable=False),
+        Stage("detect", _detect, inputs=["workspace_path", "app_type_hint"], outputs=["app_type"]),
+        Stage("dockerfile", _dockerfile, inputs=["workspace_path", "app_type", "dockerfile_generator"],
+              outputs=["dockerfile_path"]),
+        Stage("yamls", _yamls, inputs=["workspace_path", "app_type", "app_name", "envs", "image_tag", "k8s_templates"],
+              outputs=["generated"]),
+    ]
+    if build:
+        stages.append(Stage("build", _build, inputs=["workspace_path", "app_type", "image_tag", "dockerfile_path"],
+                            outputs=["build_result"]))
+    if create_pr:
+        # the PR waits for every artefact; without a build it only waits for the Dockerfile
+        pr_inputs = ["workspace_path", "git_url", "build_result" if build else "dockerfile_path", "generated"]
+        stages.append(Stage("pull_request", _pull_request, inputs=pr_inputs, outputs=["pull_request"]))
+    return Pipeline(stages, limits=limits, stage_cache=stage_cache)
+
+
+def run_onboarding_pipeline(git_url: str, app_name: str, envs: List[str], image_tag: str,
+                            app_type: Optional[str] = "auto", build: bool = True, create_pr: bool = False,
+                            on_event: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Whole onboarding in one call, independent stages in parallel.
+    Returns Pipeline.run()'s result: status, failed_stage, error, values, timeline, wall_s, breakdown.
+    """
+    pipeline = build_onboarding_pipeline(build=build, create_pr=create_pr)
+    return pipeline.run({
+        "git_url": git_url,
+        "app_type_hint": app_type,
+        "app_name": app_name,
+        "envs": envs,
+        "image_tag": image_tag,
+    }, on_event=on_event)
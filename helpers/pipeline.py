@@ -0,0 +1,279 @@
+import os
+import time
+import threading
+import contextvars
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from helpers.progress import is_cancelled
+from helpers.metrics import collect_timings, current_timings, in_stage, observe_stage
+from helpers.profiling import StageProfiler, wants_profile, new_run_id
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Pipeline configuration
+# -------------------------------
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", 4))
+
+
+class Stage:
+    """
+    One pipeline step. `fn` receives its declared `inputs` as keyword arguments and
+    returns a dict holding at least its declared `outputs`. A stage whose inputs are
+    all available runs as soon as a worker is free, in parallel with unrelated stages.
+    `optional` stages may fail without failing the pipeline (their outputs stay unset).
+    `cacheable` stages may be answered from the pipeline's stage cache when their inputs
+    are unchanged; stages with non-serializable outputs or volatile sources opt out.
+    """
+
+    def __init__(self, name: str, fn: Callable[..., Dict[str, Any]], inputs: Optional[List[str]] = None,
+                 outputs: Optional[List[str]] = None, optional: bool = False, cacheable: bool = True):
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs or [])
+        self.outputs = list(outputs or [])
+        self.optional = optional
+        self.cacheable = cacheable
+
+
+class Pipeline:
+    """
+    Runs stages as a DAG over named values. On the first failure of a required stage no
+    new stage is started (fail fast); stages already running finish, the rest are skipped.
+    `limits` maps stage names to semaphores, shared across pipelines, that cap how many
+    runs may execute that stage at once (e.g. 8 clones but 2 PRs for a bulk onboarding).
+    `stage_cache` (lookup(stage, inputs) -> outputs | None, record(stage, inputs, outputs,
+    duration_s)) lets a re-run with the same inputs skip stages that already completed.
+    """
+
+    def __init__(self, stages: List[Stage], max_workers: int = PIPELINE_MAX_WORKERS,
+                 limits: Optional[Dict[str, threading.Semaphore]] = None, stage_cache=None):
+        self.stages = {s.name: s for s in stages}
+        self.max_workers = max_workers
+        self.limits = limits or {}
+        self.stage_cache = stage_cache
+        self._validate()
+
+    def _validate(self):
+        producers: Dict[str, str] = {}
+        for stage in self.stages.values():
+            for out in stage.outputs:
+                if out in producers:
+                    raise ValueError(f"'{out}' is produced by both {producers[out]} and {stage.name}")
+                producers[out] = stage.name
+        self.producers = producers
+
+        # every stage must be reachable without cycles (inputs missing here are run() arguments)
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cycle in pipeline: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for inp in self.stages[name].inputs:
+                if inp in producers:
+                    visit(producers[inp], path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        self.order = order
+
+    def subset(self, targets: List[str], available: List[str]) -> "Pipeline":
+        """
+        The smallest pipeline that runs the `targets` stages, given values already
+        `available`: producers are pulled in only for inputs not provided.
+        """
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            needed.add(name)
+            for inp in self.stages[name].inputs:
+                if inp not in available and inp in self.producers:
+                    stack.append(self.producers[inp])
+        return Pipeline([s for n, s in self.stages.items() if n in needed], self.max_workers, self.limits,
+                        self.stage_cache)
+
+    def run(self, initial: Dict[str, Any], on_event: Optional[Callable[[Dict], None]] = None) -> Dict[str, Any]:
+        """
+        Execute the DAG. `initial` provides the inputs not produced by any stage. A stage
+        whose outputs are all already in `initial` is not run again (status "cached"), which
+        is how an interrupted run resumes. `on_event` is called with {"stage", "status", ...}
+        when a stage starts or ends; successful stages include their "outputs".
+
+        Returns {"status", "failed_stage", "error", "values", "timeline", "wall_s", "breakdown",
+        "profiles"}; "breakdown" is where the time went per stage (see helpers.metrics.JobTimings),
+        "profiles" maps each profiled stage to its artifacts (see helpers.profiling).
+        """
+        # calls made by stages (LLM, Qdrant, docker, ...) are attributed to this run, or to
+        # the enclosing job when the caller already collects timings
+        with collect_timings(current_timings()) as timings:
+            result = self._run(initial, on_event)
+        result["breakdown"] = timings.breakdown()
+        return result
+
+    def _run(self, initial: Dict[str, Any], on_event: Optional[Callable[[Dict], None]]) -> Dict[str, Any]:
+        missing = {inp for s in self.stages.values() for inp in s.inputs
+                   if inp not in self.producers and inp not in initial}
+        if missing:
+            raise ValueError(f"Pipeline inputs not provided: {sorted(missing)}")
+
+        values = dict(initial)
+        lock = threading.Lock()
+        status = {name: "pending" for name in self.stages}
+        timeline: Dict[str, Dict] = {}
+        failed_stage, error = None, None
+        profiles: Dict[str, Dict] = {}
+        run_id = new_run_id()
+        start = time.perf_counter()
+        for name, stage in self.stages.items():
+            if stage.outputs and all(out in initial for out in stage.outputs):
+                status[name] = "cached"
+                timeline[name] = {"stage": name, "status": "cached"}
+        # feeders whose every consumer is cached (e.g. a prefetch on resume) have nothing to do
+        for name in reversed(self.order):
+            consumers = [c for c in self.stages.values() if set(c.inputs) & set(self.stages[name].outputs)]
+            if status[name] == "pending" and consumers and all(status[c.name] == "cached" for c in consumers):
+                status[name] = "cached"
+                timeline[name] = {"stage": name, "status": "cached"}
+
+        def emit(event):
+            if on_event:
+                try:
+                    on_event(event)
+                except Exception:
+                    logger.debug("pipeline event callback failed", exc_info=True)
+
+        def ready(stage: Stage) -> bool:
+            for inp in stage.inputs:
+                if inp in values:
+                    continue
+                producer = self.producers.get(inp)
+                # an optional producer that failed or was skipped still unblocks its consumers
+                if producer and status[producer] in ("failed", "skipped") and self.stages[producer].optional:
+                    continue
+                return False
+            return True
+
+        def execute(stage: Stage):
+            queued = time.perf_counter()
+            limit = self.limits.get(stage.name)
+            if limit:
+                limit.acquire()
+            try:
+                began = time.perf_counter()
+                with lock:
+                    timeline[stage.name] = {"stage": stage.name, "start_s": round(began - start, 3),
+                                            "queued_s": round(began - queued, 3),
+                                            "thread": threading.current_thread().name}
+                with lock:
+                    kwargs = {inp: values.get(inp) for inp in stage.inputs}
+                use_cache = self.stage_cache is not None and stage.cacheable
+                cached = self.stage_cache.lookup(stage.name, kwargs) if use_cache else None
+                if cached is not None:
+                    timeline[stage.name]["cache_hit"] = True
+                    return cached
+                emit({"stage": stage.name, "status": "running"})
+                profiler = StageProfiler(stage.name) if wants_profile(stage.name) else None
+                result = {}
+                try:
+                    with in_stage(stage.name), (profiler or nullcontext()):
+                        result = stage.fn(**kwargs) or {}
+                finally:
+                    if profiler:
+                        # clone only learns its workspace from its own result
+                        workspace = kwargs.get("workspace_path") or result.get("workspace_path")
+                        try:
+                            profiles[stage.name] = profiler.save(workspace, run_id)
+                        except OSError as e:
+                            logger.warning(f"⚠️ Could not write profile of {stage.name}: {e}")
+            finally:
+                if limit:
+                    limit.release()
+            absent = [out for out in stage.outputs if out not in result]
+            if absent:
+                raise RuntimeError(f"stage {stage.name} did not produce {absent}")
+            if use_cache:
+                self.stage_cache.record(stage.name, kwargs, {out: result[out] for out in stage.outputs},
+                                        round(time.perf_counter() - began, 3))
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as pool:
+            running = {}
+            while True:
+                if failed_stage is None and is_cancelled():
+                    failed_stage, error = "cancelled", "cancelled by user"
+                if failed_stage is None:
+                    for name in self.order:
+                        stage = self.stages[name]
+                        if status[name] == "pending" and ready(stage):
+                            status[name] = "running"
+                            # stages see the caller's context (progress reporter of a background job)
+                            running[pool.submit(contextvars.copy_context().run, execute, stage)] = stage
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    ended = time.perf_counter() - start
+                    entry = timeline.setdefault(stage.name, {"stage": stage.name, "start_s": round(ended, 3)})
+                    entry["end_s"] = round(ended, 3)
+                    entry["duration_s"] = round(entry["end_s"] - entry["start_s"], 3)
+                    try:
+                        result = future.result()
+                        with lock:
+                            values.update(result)
+                        status[stage.name] = "cached" if entry.get("cache_hit") else "success"
+                        entry["outputs"] = {out: result[out] for out in stage.outputs}
+                    except Exception as e:
+                        status[stage.name] = "failed"
+                        entry["error"] = str(e)
+                        if stage.optional:
+                            logger.warning(f"⚠️ Optional stage {stage.name} failed: {e}")
+                        elif failed_stage is None:
+                            failed_stage, error = stage.name, str(e)
+                            logger.error(f"❌ Stage {stage.name} failed, stopping pipeline: {e}")
+                    entry["status"] = status[stage.name]
+                    observe_stage(stage.name, entry["duration_s"], entry["status"])
+                    emit(dict(entry))
+                    entry.pop("outputs", None)
+
+        # whatever is still pending can never run: fail fast stopped it or its producer failed
+        for name in self.order:
+            if status[name] == "pending":
+                status[name] = "skipped"
+                timeline[name] = {"stage": name, "status": "skipped"}
+                emit(dict(timeline[name]))
+
+        return {
+            "status": "failed" if failed_stage else "success",
+            "failed_stage": failed_stage,
+            "error": error,
+            "values": values,
+            "timeline": [timeline[n] for n in sorted(timeline, key=lambda n: timeline[n].get("start_s", float("inf")))],
+            "wall_s": round(time.perf_counter() - start, 3),
+            "profiles": profiles,
+        }
+
+
+def format_timeline(timeline: List[Dict], width: int = 40) -> str:
+    """Text Gantt chart of a pipeline run, one line per stage."""
+    total = max((t.get("end_s", 0.0) for t in timeline), default=0.0) or 1.0
+    lines = []
+    for t in timeline:
+        if "end_s" not in t:
+            lines.append(f"{t['stage']:<26} {'':<{width}} {t.get('status', '')}")
+            continue
+        lead = int(t["start_s"] / total * width)
+        bar = max(1, int(t["duration_s"] / total * width))
+        lines.append(f"{t['stage']:<26} {' ' * lead}{'█' * bar:<{width - lead}} "
+                     f"{t['start_s']:>7.2f}s +{t['duration_s']:.2f}s {t['status']}")
+    return "\n".join(lines)
@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+import uuid
+import pstats
+import cProfile
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Profiling configuration
+# -------------------------------
+# Stages to profile in every run: comma separated names, "all" / "*" for every stage, empty = off.
+# A single job can ask for more with profile_stages() (API "profile", UI checkbox, bulk --profile).
+PROFILE_STAGES = [s.strip() for s in os.getenv("PROFILE_STAGES", "").split(",") if s.strip()]
+# "both" (cProfile for .pstats + stack sampler for .collapsed), "deterministic" or "sampling"
+PROFILE_MODE = os.getenv("PROFILE_MODE", "both").lower()
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", 5))
+# Where artifacts go; empty = "<workspace>-profiles/<run>/" next to the cloned workspace
+PROFILE_DIR = os.getenv("PROFILE_DIR", "")
+
+_requested: contextvars.ContextVar = contextvars.ContextVar("onboarding_profile_stages", default=())
+
+
+@contextmanager
+def profile_stages(stages: Optional[List[str]]):
+    """Profile `stages` (plus PROFILE_STAGES) of pipelines run in this context, e.g. for one job."""
+    token = _requested.set(tuple(stages or ()))
+    try:
+        yield
+    finally:
+        _requested.reset(token)
+
+
+def wants_profile(stage: str) -> bool:
+    names = set(PROFILE_STAGES) | set(_requested.get())
+    return bool(names & {stage, "all", "*"})
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the Python stack of one thread every `interval` seconds and counts identical
+    stacks, root first: the collapsed format flamegraph.pl / speedscope / inferno read.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                key = ";".join(reversed(labels))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in sorted(self.stacks.items()):
+                fh.write(f"{stack} {count}\n")
+
+
+class StageProfiler:
+    """
+    Profiles the calling thread while a stage runs (context manager), then save() writes
+    <stage>.pstats and/or <stage>.collapsed. Work the stage hands to other threads (LLM
+    pool, docker subprocesses) shows up as the waiting frame, not as its own code.
+    """
+
+    def __init__(self, stage: str, mode: str = PROFILE_MODE, interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS):
+        self.stage = stage
+        self.mode = mode
+        self.profile = cProfile.Profile() if mode in ("both", "deterministic") else None
+        self.sampler = None
+        self.interval = interval_ms / 1000.0
+        self.wall_s = 0.0
+
+    def __enter__(self):
+        if self.mode in ("both", "sampling"):
+            self.sampler = StackSampler(threading.get_ident(), self.interval)
+            self.sampler.start()
+        self._start = time.perf_counter()
+        if self.profile:
+            try:
+                self.profile.enable()
+            except ValueError as e:
+                # Python 3.12+ allows one cProfile at a time per process (parallel stages)
+                logger.warning(f"⚠️ No deterministic profile for {self.stage}: {e}")
+                self.profile = None
+        return self
+
+    def __exit__(self, *exc):
+        if self.profile:
+            self.profile.disable()
+        self.wall_s = round(time.perf_counter() - self._start, 3)
+        if self.sampler:
+            self.sampler.stop()
+        return False
+
+    def save(self, workspace_path: Optional[str], run_id: str) -> Dict:
+        """Write the artifacts; returns {"pstats", "collapsed", "wall_s", "samples"} for the job result."""
+        if PROFILE_DIR:
+            out_dir = os.path.join(PROFILE_DIR, run_id)
+        elif workspace_path:
+            out_dir = os.path.join(f"{workspace_path.rstrip(os.sep)}-profiles", run_id)
+        else:
+            import tempfile
+            out_dir = os.path.join(tempfile.gettempdir(), "onboarding-profiles", run_id)
+        os.makedirs(out_dir, exist_ok=True)
+        artifacts = {"wall_s": self.wall_s}
+        if self.profile:
+            artifacts["pstats"] = os.path.join(out_dir, f"{self.stage}.pstats")
+            pstats.Stats(self.profile).dump_stats(artifacts["pstats"])
+        if self.sampler:
+            artifacts["collapsed"] = os.path.join(out_dir, f"{self.stage}.collapsed")
+            self.sampler.write(artifacts["collapsed"])
+            artifacts["samples"] = sum(self.sampler.stacks.values())
+        logger.info(f"🔥 Profile of {self.stage} ({self.wall_s}s) written to {out_dir}")
+        return artifacts
@@ -0,0 +1,138 @@
+import os
+import re
+import time
+import codecs
+import threading
+import subprocess
+import contextvars
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional
+
+# Reporter of the job running in the current context; stage threads inherit it
+# (Pipeline runs stages in a copy of the submitting context)
+_current: contextvars.ContextVar = contextvars.ContextVar("onboarding_progress", default=None)
+
+
+class JobCancelled(RuntimeError):
+    """Raised inside a job once its reporter has been cancelled."""
+
+
+class ProgressReporter:
+    """
+    Collects progress of one background job and hands it to `sink` (e.g. the job store),
+    at most every `min_interval` seconds per stage unless the update is final.
+    Cancelling sets a flag checked between steps and terminates tracked subprocesses.
+    """
+
+    def __init__(self, sink: Callable[[Dict], None], min_interval: float = 0.5):
+        self.sink = sink
+        self.min_interval = min_interval
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._last: Dict[str, float] = {}
+        self._processes: List[subprocess.Popen] = []
+
+    def report(self, stage: str, final: bool = False, **fields):
+        now = time.monotonic()
+        with self._lock:
+            if not final and now - self._last.get(stage, 0.0) < self.min_interval:
+                return
+            self._last[stage] = now
+        self.sink(dict(fields, type="progress", stage=stage))
+
+    def cancel(self):
+        self.cancelled.set()
+        with self._lock:
+            processes = list(self._processes)
+        for proc in processes:
+            if proc.poll() is None:
+                proc.terminate()
+
+    @contextmanager
+    def track(self, proc: subprocess.Popen):
+        with self._lock:
+            self._processes.append(proc)
+        try:
+            yield proc
+        finally:
+            with self._lock:
+                self._processes.remove(proc)
+
+
+@contextmanager
+def use_reporter(reporter: Optional[ProgressReporter]):
+    token = _current.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _current.reset(token)
+
+
+def report(stage: str, final: bool = False, **fields):
+    """Publish progress for the current job; a no-op outside background jobs."""
+    reporter = _current.get()
+    if reporter:
+        reporter.report(stage, final=final, **fields)
+
+
+def is_cancelled() -> bool:
+    reporter = _current.get()
+    return bool(reporter and reporter.cancelled.is_set())
+
+
+def check_cancelled():
+    if is_cancelled():
+        raise JobCancelled("cancelled by user")
+
+
+def run_process(cmd: List[str], on_line: Optional[Callable[[str], None]] = None, **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run(cmd, capture_output=True, text=True) that also feeds every stdout/stderr
+    line (split on \\r too, for git/docker progress bars) to `on_line` as it arrives, and lets
+    the current job's cancel terminate the process.
+    """
+    check_cancelled()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+    captured = {"stdout": [], "stderr": []}
+
+    def pump(stream, name):
+        # os.read returns whatever is available; progress bars never end in a newline
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buf = ""
+        while True:
+            data = os.read(stream.fileno(), 4096)
+            chunk = decoder.decode(data, final=not data)
+            if not data:
+                break
+            captured[name].append(chunk)
+            buf += chunk
+            *lines, buf = re.split(r"[\r\n]", buf)
+            for line in lines:
+                if line.strip() and on_line:
+                    on_line(line)
+        if buf.strip() and on_line:
+            on_line(buf)
+        stream.close()
+
+    reporter = _current.get()
+    # each pump runs in its own copy of this context so report() from on_line reaches the job
+    threads = [threading.Thread(target=contextvars.copy_context().run, args=(pump, proc.stdout, "stdout"), daemon=True),
+               threading.Thread(target=contextvars.copy_context().run, args=(pump, proc.stderr, "stderr"), daemon=True)]
+    with (reporter.track(proc) if reporter else nullcontext()):
+        for t in threads:
+            t.start()
+        proc.wait()
+        for t in threads:
+            t.join()
+    check_cancelled()
+    return subprocess.CompletedProcess(cmd, proc.returncode, "".join(captured["stdout"]), "".join(captured["stderr"]))
+
+
+def wait(seconds: float):
+    """time.sleep(seconds) that the current job's cancel cuts short (raising JobCancelled)."""
+    reporter = _current.get()
+    if reporter:
+        reporter.cancelled.wait(max(0.0, seconds))
+        check_cancelled()
+    else:
+        time.sleep(max(0.0, seconds))
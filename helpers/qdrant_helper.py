@@ -1,18 +1,12 @@
 import os
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import VectorParams, Distance
 
 import uuid
-from sentence_transformers import SentenceTransformer
-from qdrant_client.http.models import VectorParams, Distance
 
 # -------------------------------
 # Qdrant client setup
 # -------------------------------
-QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
-QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
-
-client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+# Client and embedder are built on first use by helpers.registry and shared process-wide
+from helpers.registry import get_qdrant_client, get_embedder, QDRANT_HOST, QDRANT_PORT
 
 # -------------------------------
 # Function to create collection
@@ -21,6 +15,8 @@ def create_dockerfiles_collection(collection_name="dockerfiles", vector_size=768
     """
     Creates a Qdrant collection for storing Dockerfiles with vector indexing.
     """
+    from qdrant_client.http.models import VectorParams, Distance
+    client = get_qdrant_client()
     if collection_name not in [c.name for c in client.get_collections().collections]:
         client.recreate_collection(
             collection_name=collection_name,
@@ -37,13 +33,8 @@ def create_dockerfiles_collection(collection_name="dockerfiles", vector_size=768
 # Function to inject dockerfiles
 # -------------------------------
 
-from qdrant_client import QdrantClient, models
-from sentence_transformers import SentenceTransformer
-import os
 import hashlib
 
-client = QdrantClient("localhost", port=6333)
-model = SentenceTransformer("all-MiniLM-L6-v2")
 collection_name = "dockerfiles"
 
 import uuid
@@ -56,6 +47,9 @@ def deterministic_id(app_type: str) -> str:
     return str(uuid.UUID(bytes=hash_bytes))
 
 def inject_dockerfiles_to_qdrant(base_dir="dockerfiles"):
+    from qdrant_client import models
+    client = get_qdrant_client()
+    model = get_embedder("all-MiniLM-L6-v2")
     if not client.collection_exists(collection_name):
         client.create_collection(
             collection_name=collection_name,
@@ -116,13 +110,12 @@ def fetch_dockerfile(app_type: str, collection_name="dockerfiles"):
     """
     Retrieve Dockerfile content from Qdrant for a given app_type.
     """
-    query_filter = {
-        "must": [
-            {"key": "app_type", "match": {"value": app_type.lower()}}
-        ]
-    }
+    from qdrant_client.http import models
+    query_filter = models.Filter(
+        must=[models.FieldCondition(key="app_type", match=models.MatchValue(value=app_type.lower()))]
+    )
 
-    results = client.search(
+    results = get_qdrant_client().search(
         collection_name=collection_name,
         query_vector=[0.0]*384,  # dummy vector, using filter only
         query_filter=query_filter,
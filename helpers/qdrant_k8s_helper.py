@@ -5,21 +5,14 @@ import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
-from qdrant_client import QdrantClient
-from qdrant_client.http import models
-from qdrant_client.http.models import VectorParams, Distance
-from sentence_transformers import SentenceTransformer
+from helpers.registry import get_qdrant_client, get_embedder, QDRANT_HOST, QDRANT_PORT, EMBED_MODEL_NAME
 
 # config from env (fallbacks)
-QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
-QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
 COLLECTION_NAME = os.getenv("K8S_QDRANT_COLLECTION", "kubernetes_configs")
-EMBED_MODEL_NAME = os.getenv("EMBED_MODEL", "all-MiniLM-L6-v2")
 VECTOR_SIZE = int(os.getenv("EMBED_DIM", 384))
 
-# Initialize
-client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-embedder = SentenceTransformer(EMBED_MODEL_NAME)
+# The Qdrant client and the embedder come from helpers.registry: built on first use and
+# shared with the Dockerfile tool, so importing this module stays cheap.
 
 
 # -------------------------
@@ -37,6 +30,8 @@ def ensure_collection(collection_name: str = COLLECTION_NAME, vector_size: int =
     """
     Create/recreate collection if not exists with the right vector size.
     """
+    from qdrant_client.http import models
+    client = get_qdrant_client()
     existing = [c.name for c in client.get_collections().collections]
     if collection_name not in existing:
         client.recreate_collection(
@@ -76,7 +71,10 @@ def inject_k8s_templates(
         "timestamp": "<iso>"
       }
     """
+    from qdrant_client.http import models
     ensure_collection(collection_name)
+    client = get_qdrant_client()
+    embedder = get_embedder(EMBED_MODEL_NAME) if embed else None
     for root, dirs, files in os.walk(base_dir):
         for fname in files:
             # only ingest text / yaml files
@@ -147,6 +145,7 @@ def fetch_k8s_by_app_and_kind(app_type: str, kind: Optional[str] = None, limit:
     """
     Return matching points' payloads for an app_type and optional kind.
     """
+    from qdrant_client.http import models
     # build filter
     must_conditions = [models.FieldCondition(key="app_type", match=models.MatchValue(value=app_type.lower()))]
     if kind:
@@ -154,7 +153,7 @@ def fetch_k8s_by_app_and_kind(app_type: str, kind: Optional[str] = None, limit:
 
     flt = models.Filter(must=must_conditions)
     # using scroll (no vector) to fetch matching points
-    response = client.scroll(collection_name=collection_name, limit=limit, with_payload=True, with_vectors=False, scroll_filter=flt)
+    response = get_qdrant_client().scroll(collection_name=collection_name, limit=limit, with_payload=True, with_vectors=False, scroll_filter=flt)
     points, _ = response
     results = []
     for p in points:
@@ -166,12 +165,13 @@ def get_k8s_file(app_type: str, kind: str, object_name: str, collection_name: st
     """
     Return file_content for the exact object (or None).
     """
+    from qdrant_client.http import models
     flt = models.Filter(must=[
         models.FieldCondition(key="app_type", match=models.MatchValue(value=app_type.lower())),
         models.FieldCondition(key="kind", match=models.MatchValue(value=kind.lower())),
         models.FieldCondition(key="object_name", match=models.MatchValue(value=object_name))
     ])
-    resp = client.search(collection_name=collection_name, query_vector=[0.0]*VECTOR_SIZE, query_filter=flt, limit=1)
+    resp = get_qdrant_client().search(collection_name=collection_name, query_vector=[0.0]*VECTOR_SIZE, query_filter=flt, limit=1)
     if resp and len(resp) > 0:
         return resp[0].payload.get("file_content")
     return None
@@ -181,7 +181,7 @@ def list_all_k8s(collection_name: str = COLLECTION_NAME, limit: int = 100) -> Li
     """
     List up to `limit` stored K8s template payloads.
     """
-    points, _ = client.scroll(collection_name=collection_name, limit=limit, with_payload=True, with_vectors=False)
+    points, _ = get_qdrant_client().scroll(collection_name=collection_name, limit=limit, with_payload=True, with_vectors=False)
     return [{"id": p.id, "payload": p.payload} for p in points]
 
 
@@ -0,0 +1,133 @@
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from helpers.metrics import Instrumented
+
+import logging
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Registry configuration
+# -------------------------------
+QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
+# Qdrant local mode instead of a server: ":memory:" or a directory (benchmarks, offline runs)
+QDRANT_LOCATION = os.getenv("QDRANT_LOCATION", "")
+EMBED_MODEL_NAME = os.getenv("EMBED_MODEL", "all-MiniLM-L6-v2")
+# Build every registered resource in a background thread when the page / API / CLI starts
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "1").lower() in ("1", "true", "yes")
+# Comma separated subset to warm up (default: all registered)
+WARMUP_RESOURCES = [n.strip() for n in os.getenv("WARMUP_RESOURCES", "").split(",") if n.strip()]
+
+# name -> factory; instances are built on first get_resource() and then shared process-wide
+_factories: Dict[str, Callable[[], Any]] = {}
+_instances: Dict[str, Any] = {}
+_build_seconds: Dict[str, float] = {}
+_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def register(name: str, factory: Callable[[], Any]):
+    """Declare how to build `name`; nothing is imported or constructed until first use."""
+    with _registry_lock:
+        _factories[name] = factory
+        _locks.setdefault(name, threading.Lock())
+
+
+def get_resource(name: str) -> Any:
+    """
+    The shared instance of `name`, built on first call. Concurrent first calls build it
+    once; a failed build is not cached, so the next call retries (e.g. Qdrant came back).
+    """
+    if name in _instances:
+        return _instances[name]
+    with _registry_lock:
+        factory = _factories.get(name)
+        lock = _locks.get(name)
+    if factory is None:
+        raise KeyError(f"unknown resource '{name}'")
+    with lock:
+        if name not in _instances:
+            start = time.perf_counter()
+            _instances[name] = factory()
+            _build_seconds[name] = round(time.perf_counter() - start, 3)
+            logger.info(f"🧩 Built {name} in {_build_seconds[name]}s")
+    return _instances[name]
+
+
+def loaded_resources() -> Dict[str, float]:
+    """name -> seconds it took to build, for resources built so far."""
+    return dict(_build_seconds)
+
+
+def warm_up(names: Optional[List[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+    """
+    Build `names` (default WARMUP_RESOURCES, else everything registered) ahead of first use.
+    Failures are only logged; the resource is retried when it is actually needed.
+    """
+    with _registry_lock:
+        todo = list(names or WARMUP_RESOURCES or _factories)
+
+    def run():
+        for name in todo:
+            try:
+                get_resource(name)
+            except Exception as e:
+                logger.warning(f"⚠️ Warm-up of {name} failed: {e}")
+
+    if not background:
+        run()
+        return None
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# -------------------------------
+# Shared clients
+# -------------------------------
+# Qdrant calls timed per method in the onboarding metrics (helpers/metrics.py)
+QDRANT_TIMED_METHODS = ["search", "query_points", "scroll", "retrieve", "upsert", "delete", "collection_exists",
+                        "create_collection", "get_collection"]
+
+
+def _qdrant_client():
+    from qdrant_client import QdrantClient
+    if QDRANT_LOCATION == ":memory:":
+        client = QdrantClient(location=":memory:")
+    elif QDRANT_LOCATION:
+        client = QdrantClient(path=QDRANT_LOCATION)
+    else:
+        client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+    return Instrumented(client, "qdrant", QDRANT_TIMED_METHODS)
+
+
+def get_qdrant_client():
+    return get_resource("qdrant_client")
+
+
+def _embedder(model_name: str) -> Callable[[], Any]:
+    def factory():
+        from sentence_transformers import SentenceTransformer
+        return Instrumented(SentenceTransformer(model_name), "embedding", ["encode"], label=model_name)
+    return factory
+
+
+def get_embedder(model_name: str = EMBED_MODEL_NAME):
+    """SentenceTransformer for `model_name`, loaded once and shared by every caller."""
+    name = f"embedder:{model_name}"
+    if name not in _factories:
+        register(name, _embedder(model_name))
+    return get_resource(name)
+
+
+def _generation_llm():
+    from helpers.config_loader import get_llm
+    return get_llm("dockerfile_generation")
+
+
+register("qdrant_client", _qdrant_client)
+register(f"embedder:{EMBED_MODEL_NAME}", _embedder(EMBED_MODEL_NAME))
+register("llm:dockerfile_generation", _generation_llm)
@@ -0,0 +1,210 @@
+import os
+import re
+import json
+import time
+import fnmatch
+import hashlib
+import subprocess
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from helpers.build_context import load_dockerignore, is_ignored
+
+# -------------------------------
+# Digest configuration
+# -------------------------------
+DIGEST_TOKEN_BUDGET = int(os.getenv("DIGEST_TOKEN_BUDGET", 3000))
+DIGEST_MAX_FILE_TOKENS = int(os.getenv("DIGEST_MAX_FILE_TOKENS", 800))
+DIGEST_MAX_FILES_SCANNED = int(os.getenv("DIGEST_MAX_FILES_SCANNED", 50000))
+DIGEST_CACHE_DIR = os.getenv(
+    "DIGEST_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".ai-onboard", "digests")
+)
+
+# ~4 characters per token for code and config; good enough for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", "node_modules", "target", "build", "dist", "out", ".gradle", ".idea", ".vscode",
+    "__pycache__", ".venv", "venv", ".tox", ".mypy_cache", ".pytest_cache", "coverage", ".next", "bin", "obj",
+    "vendor", "k8s_configs",
+}
+
+# (glob, score) - higher scores are packed into the budget first
+FILE_SCORES: List[Tuple[str, int]] = [
+    # build manifests
+    ("pom.xml", 100), ("build.gradle", 100), ("build.gradle.kts", 100), ("settings.gradle*", 60),
+    ("package.json", 100), ("requirements*.txt", 100), ("pyproject.toml", 100), ("setup.py", 80),
+    ("setup.cfg", 50), ("Pipfile", 80), ("*.csproj", 100), ("*.sln", 60), ("go.mod", 100), ("Cargo.toml", 100),
+    # lockfiles: only the head matters (pinned runtime / package manager)
+    ("package-lock.json", 40), ("yarn.lock", 40), ("pnpm-lock.yaml", 40), ("poetry.lock", 40),
+    ("Pipfile.lock", 30), ("gradle.lockfile", 30), ("go.sum", 10),
+    # runtime / framework config
+    (".nvmrc", 70), (".node-version", 70), (".python-version", 70), (".tool-versions", 70), ("runtime.txt", 70),
+    ("Procfile", 80), ("Dockerfile", 50), ("docker-compose*.yml", 50), ("application.properties", 70),
+    ("application*.yml", 70), ("application*.yaml", 70), ("appsettings.json", 70), ("next.config.*", 60),
+    ("vite.config.*", 50), ("angular.json", 50), ("tsconfig.json", 40), ("nest-cli.json", 50),
+    ("settings.py", 60), ("wsgi.py", 60), ("asgi.py", 60), (".env.example", 50),
+    # entrypoints
+    ("main.py", 80), ("app.py", 80), ("manage.py", 80), ("server.py", 70), ("index.js", 70), ("server.js", 80),
+    ("app.js", 70), ("main.ts", 70), ("index.ts", 60), ("Program.cs", 80), ("Startup.cs", 60),
+    ("*Application.java", 80), ("main.go", 80),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+# exact names resolve with one dict lookup; only the few globs need a regex
+_EXACT_SCORES = {p: sc for p, sc in FILE_SCORES if not any(c in p for c in "*?[")}
+_GLOB_SCORES = [(re.compile(fnmatch.translate(p)), sc) for p, sc in FILE_SCORES if p not in _EXACT_SCORES]
+
+
+def _score(rel_path: str) -> int:
+    name = rel_path.rsplit("/", 1)[-1]
+    score = _EXACT_SCORES.get(name)
+    if score is None:
+        score = next((sc for regex, sc in _GLOB_SCORES if regex.match(name)), 0)
+    if not score:
+        return 0
+    # prefer files near the root: service roots beat vendored examples deep in the tree
+    return max(1, score - rel_path.count("/") * 10)
+
+
+def _walk(root: str, rules, max_files: int) -> Tuple[List[str], Dict[str, int], int, bool]:
+    """
+    Iterative scandir walk. Returns (scored candidate paths, extension counts, files scanned, truncated).
+    """
+    candidates, ext_counts, scanned = [], {}, 0
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = list(os.scandir(os.path.join(root, rel_dir)))
+        except OSError:
+            continue
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS and not is_ignored(rel, rules):
+                    stack.append(rel)
+                continue
+            if not entry.is_file(follow_symlinks=False) or is_ignored(rel, rules):
+                continue
+            scanned += 1
+            ext = os.path.splitext(entry.name)[1].lower() or entry.name
+            ext_counts[ext] = ext_counts.get(ext, 0) + 1
+            if _score(rel):
+                candidates.append(rel)
+            if scanned >= max_files:
+                return candidates, ext_counts, scanned, True
+    return candidates, ext_counts, scanned, False
+
+
+def _read_trimmed(path: str, max_tokens: int) -> Tuple[str, bool]:
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as fh:
+            text = fh.read(max_chars + 1)
+    except OSError:
+        return "", False
+    if len(text) > max_chars:
+        # cut at a line boundary so the excerpt stays readable
+        text = text[:max_chars]
+        text = text[: text.rfind("\n") + 1] or text
+        return text, True
+    return text, False
+
+
+def _cache_key(workspace_path: str, token_budget: int) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (commit SHA, cache key). The key is commit SHA + budget + what makes two directories of one commit differ: the path inside
+    the checkout (monorepo services share HEAD) and the .dockerignore rules the walk honors.
+    """
+    try:
+        proc = subprocess.run(["git", "-C", workspace_path, "rev-parse", "HEAD", "--show-prefix"],
+                              capture_output=True, text=True)
+    except Exception:
+        return None, None
+    if proc.returncode != 0:
+        return None, None
+    sha, _, prefix = proc.stdout.partition("\n")
+    try:
+        with open(os.path.join(workspace_path, ".dockerignore"), "rb") as fh:
+            ignore_rules = fh.read()
+    except OSError:
+        ignore_rules = b""
+    scope = hashlib.sha256(prefix.strip().encode("utf-8") + b"\0" + ignore_rules).hexdigest()[:16]
+    return sha.strip(), f"{sha.strip()}-{token_budget}-{scope}"
+
+
+_memory_cache: Dict[str, Dict] = {}
+_cache_lock = threading.Lock()
+
+
+def build_repo_digest(workspace_path: str, token_budget: int = DIGEST_TOKEN_BUDGET, use_cache: bool = True) -> Dict:
+    """
+    Compact, token-budgeted description of a cloned repository for LLM prompts:
+    a file-type summary plus excerpts of the highest-scoring files (build manifests,
+    lockfile heads, entrypoints, framework config). Cached per commit SHA + budget + path in
+    the checkout + .dockerignore rules.
+
+    Returns {"text", "tokens", "files", "stats": {...}}.
+    """
+    sha, cache_key = _cache_key(workspace_path, token_budget)
+    cache_file = os.path.join(DIGEST_CACHE_DIR, f"{cache_key}.json") if cache_key else None
+    if use_cache and cache_key:
+        with _cache_lock:
+            if cache_key in _memory_cache:
+                return dict(_memory_cache[cache_key], cached=True)
+        if os.path.exists(cache_file):
+            with open(cache_file, "r", encoding="utf-8") as fh:
+                digest = json.load(fh)
+            with _cache_lock:
+                _memory_cache[cache_key] = digest
+            return dict(digest, cached=True)
+
+    start = time.perf_counter()
+    rules = load_dockerignore(workspace_path)
+    candidates, ext_counts, scanned, truncated = _walk(workspace_path, rules, DIGEST_MAX_FILES_SCANNED)
+    walk_seconds = time.perf_counter() - start
+
+    top_exts = sorted(ext_counts.items(), key=lambda kv: -kv[1])[:12]
+    header = f"Files scanned: {scanned}{' (truncated)' if truncated else ''}\n"
+    header += "File types: " + ", ".join(f"{ext}={n}" for ext, n in top_exts) + "\n"
+    parts, used = [header], estimate_tokens(header)
+
+    selected = []
+    for rel in sorted(candidates, key=lambda r: (-_score(r), r.count("/"), r)):
+        remaining = token_budget - used
+        if remaining < 50:
+            break
+        text, trimmed = _read_trimmed(os.path.join(workspace_path, rel), min(DIGEST_MAX_FILE_TOKENS, remaining - 20))
+        if not text.strip():
+            continue
+        block = f"\n--- {rel}{' (truncated)' if trimmed else ''} ---\n{text}"
+        parts.append(block)
+        used += estimate_tokens(block)
+        selected.append(rel)
+
+    digest = {
+        "text": "".join(parts),
+        "tokens": used,
+        "files": selected,
+        "sha": sha,
+        "stats": {
+            "files_scanned": scanned,
+            "candidates": len(candidates),
+            "files_selected": len(selected),
+            "walk_seconds": round(walk_seconds, 4),
+            "build_seconds": round(time.perf_counter() - start, 4),
+            "token_budget": token_budget,
+        },
+    }
+    if cache_key:
+        with _cache_lock:
+            _memory_cache[cache_key] = digest
+        os.makedirs(DIGEST_CACHE_DIR, exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as fh:
+            json.dump(digest, fh)
+    return dict(digest, cached=False)
@@ -0,0 +1,88 @@
+import os
+import re
+from typing import Dict, List
+
+from helpers.app_type_detector import MARKERS, SUFFIX_MARKERS
+from helpers.repo_digest import SKIP_DIRS
+
+# -------------------------------
+# Discovery configuration
+# -------------------------------
+SERVICE_MAX_DEPTH = int(os.getenv("SERVICE_MAX_DEPTH", 4))
+
+# Only full build manifests start a service; lockfiles and helpers like mvnw do not
+PRIMARY_WEIGHT = 1.0
+
+# Sample / test projects carry manifests too but are not deployed
+NON_SERVICE_DIRS = {"examples", "example", "samples", "sample", "docs", "test", "tests", "fixtures", "testdata", "e2e"}
+
+
+def _manifests(names: List[str]) -> Dict[str, List[str]]:
+    found: Dict[str, List[str]] = {}
+    for name in names:
+        hit = MARKERS.get(name) or SUFFIX_MARKERS.get(os.path.splitext(name)[1].lower())
+        if hit and hit[1] >= PRIMARY_WEIGHT:
+            found.setdefault(hit[0], []).append(name)
+    return found
+
+
+def service_name(rel_path: str, default: str = "app") -> str:
+    """Kubernetes / image safe name for a service directory ("services/Billing_API" -> "billing-api")."""
+    base = rel_path.rstrip("/").rsplit("/", 1)[-1] if rel_path not in ("", ".") else default
+    name = re.sub(r"[^a-z0-9-]+", "-", base.lower()).strip("-")
+    return name or default
+
+
+def discover_services(workspace_path: str, max_depth: int = SERVICE_MAX_DEPTH) -> List[Dict]:
+    """
+    Find deployable service roots: directories holding a build manifest (pom.xml,
+    package.json, requirements.txt, *.csproj, ...) with no same-type manifest directories
+    below them. A manifest directory with same-type services underneath (Maven parent pom,
+    npm workspaces root) is treated as an aggregator; examples/ and tests/ are not searched.
+    A plain single-app repository yields one service at ".".
+
+    Returns [{"name", "path" (relative, "." for the root), "app_type", "markers"}].
+    """
+    manifest_dirs: Dict[str, Dict[str, List[str]]] = {}
+    stack = [("", 0)]
+    while stack:
+        rel_dir, depth = stack.pop()
+        try:
+            entries = list(os.scandir(os.path.join(workspace_path, rel_dir)))
+        except OSError:
+            continue
+        files = sorted(e.name for e in entries if e.is_file(follow_symlinks=False))
+        found = _manifests(files)
+        if found:
+            manifest_dirs[rel_dir] = found
+        if depth >= max_depth:
+            continue
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False) and name not in SKIP_DIRS and name.lower() not in NON_SERVICE_DIRS \
+                    and not name.startswith("."):
+                stack.append((f"{rel_dir}/{name}" if rel_dir else name, depth + 1))
+
+    services = []
+    for rel_dir, found in sorted(manifest_dirs.items()):
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        # aggregator: same-type manifests below it (parent pom -> modules, npm workspaces -> packages)
+        if any(other != rel_dir and other.startswith(prefix) and set(manifest_dirs[other]) & set(found)
+               for other in manifest_dirs):
+            continue
+        # a directory with several manifests (e.g. package.json for tooling next to pom.xml)
+        # is the type with the most manifests, ties going to the first in name order
+        app_type = max(found, key=lambda t: len(found[t]))
+        services.append({
+            "name": service_name(rel_dir, default=service_name(os.path.basename(os.path.abspath(workspace_path)))),
+            "path": rel_dir or ".",
+            "app_type": app_type,
+            "markers": [f"{prefix}{m}" for m in found[app_type]],
+        })
+
+    # two services named "api" under different parents get their parent as a prefix
+    names = [s["name"] for s in services]
+    for s in services:
+        if names.count(s["name"]) > 1 and "/" in s["path"]:
+            s["name"] = service_name(s["path"].rsplit("/", 2)[-2]) + "-" + s["name"]
+    return services
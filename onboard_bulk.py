@@ -0,0 +1,82 @@
+# onboard_bulk.py
+"""
+Headless bulk onboarding from a manifest.
+
+Usage:
+    python onboard_bulk.py repos.yaml --report-dir reports/
+    python onboard_bulk.py repos.csv --no-build --clone-workers 16 --yaml-workers 16
+    # re-running with the same --report-dir resumes; --fresh starts over
+
+Manifest (YAML):
+    - git_url: https://github.com/org/orders.git
+      app_type: Java            # optional, auto-detected when omitted
+      app_name: orders
+      image_tag: org/orders:v1.0.0
+      envs: [dev, uat]
+CSV: same columns, envs separated by ';'.
+"""
+import os
+import sys
+import json
+import argparse
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from helpers.bulk_onboarding import load_manifest, run_bulk, write_report, DEFAULT_STAGE_LIMITS, BULK_REPO_WORKERS
+from helpers.registry import warm_up, WARMUP_ON_START
+from helpers.metrics import serve_metrics
+
+STAGE_FLAGS = {
+    "clone": "--clone-workers",
+    "dockerfile": "--dockerfile-workers",
+    "build": "--build-workers",
+    "yamls": "--yaml-workers",
+    "pull_request": "--pr-workers",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Onboard many repositories from a YAML/CSV manifest")
+    parser.add_argument("manifest")
+    parser.add_argument("--report-dir", default="onboard-report")
+    parser.add_argument("--fresh", action="store_true", help="Ignore progress saved by a previous run")
+    parser.add_argument("--no-build", action="store_true", help="Skip docker build/push")
+    parser.add_argument("--create-pr", action="store_true", help="Raise a pull request per repository")
+    parser.add_argument("--repo-workers", type=int, default=BULK_REPO_WORKERS, help="Repositories in flight")
+    parser.add_argument("--profile", default="", help="Comma separated stages to profile (or 'all'); "
+                                                       "pstats/collapsed files are listed per repo in the report")
+    for stage, flag in STAGE_FLAGS.items():
+        parser.add_argument(flag, dest=f"{stage}_workers", type=int, default=DEFAULT_STAGE_LIMITS[stage],
+                            help=f"Concurrent '{stage}' stages across repositories")
+    args = parser.parse_args()
+
+    entries = load_manifest(args.manifest)
+    if WARMUP_ON_START:
+        # load the embedder / LLM clients while the first repositories clone
+        warm_up(background=True)
+    # METRICS_PORT=9100 lets Prometheus scrape a long bulk run while it is going
+    serve_metrics()
+    os.makedirs(args.report_dir, exist_ok=True)
+    state_path = os.path.join(args.report_dir, "state.json")
+    if args.fresh and os.path.exists(state_path):
+        os.remove(state_path)
+
+    report = run_bulk(
+        entries,
+        state_path=state_path,
+        resume=not args.fresh,
+        build=not args.no_build,
+        create_pr=args.create_pr,
+        stage_limits={stage: getattr(args, f"{stage}_workers") for stage in DEFAULT_STAGE_LIMITS},
+        repo_workers=args.repo_workers,
+        profile=[s.strip() for s in args.profile.split(",") if s.strip()],
+    )
+    paths = write_report(report, args.report_dir)
+    print(json.dumps(report["summary"], indent=2))
+    print(f"📝 Report: {paths['json']} / {paths['csv']}")
+    sys.exit(1 if report["summary"]["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+In-memory stand-in for the GitHub REST endpoints used by the pull request step
+(repository metadata, Git data API, pulls), for the tests and for running
+onboarding offline:
+
+    python tests/fake_github.py --port 8765 --repo org/app
+    GITHUB_API_URL=http://127.0.0.1:8765 PR_MODE=api streamlit run app.py
+
+Trees are flat {path: (mode, blob_sha)} maps, so tree and commit SHAs are only
+stable within one server, not equal to real git SHAs.
+
+Rate limits behave like GitHub's: X-RateLimit-* headers on every answer, 403 with
+remaining 0 once `rate_limit` calls are used in a window of `rate_window` seconds,
+ETags on GETs with 304s that do not count, and `throttle()` to make the next answers
+secondary-limit 403s / 429s with Retry-After.
+"""
+import re
+import time
+import json
+import base64
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+def _sha(*parts) -> str:
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class FakeGitHub:
+    """Object store and refs of a few repositories, each with one initial commit on `main`."""
+
+    def __init__(self, repos: List[str], default_branch: str = "main", rate_limit: int = 5000, rate_window: float = 3600):
+        self.lock = threading.Lock()
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.window_start = time.time()
+        self.used = 0
+        self.throttled: List[tuple] = []
+        self.blobs: Dict[str, bytes] = {}
+        self.trees: Dict[str, Dict[str, tuple]] = {}
+        self.commits: Dict[str, Dict] = {}
+        self.repos: Dict[str, Dict] = {}
+        self.pulls: List[Dict] = []
+        self.requests: List[str] = []
+        for name in repos:
+            self.add_repo(name, default_branch)
+
+    def add_repo(self, name: str, default_branch: str = "main", files: Optional[Dict[str, bytes]] = None):
+        with self.lock:
+            tree = self._store_tree({path: ("100644", self._store_blob(data)) for path, data in (files or {}).items()})
+            commit = self._store_commit("initial commit", tree, [])
+            self.repos[name] = {"default_branch": default_branch, "refs": {default_branch: commit}}
+
+    def _store_blob(self, data: bytes) -> str:
+        sha = hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+        self.blobs[sha] = data
+        return sha
+
+    def _store_tree(self, entries: Dict[str, tuple]) -> str:
+        sha = _sha(sorted(entries.items()))
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def _store_commit(self, message: str, tree: str, parents: List[str]) -> str:
+        sha = _sha(message, tree, parents, len(self.commits))
+        self.commits[sha] = {"sha": sha, "message": message, "tree": {"sha": tree}, "parents": [{"sha": p} for p in parents]}
+        return sha
+
+    def files_at(self, repo: str, branch: str) -> Dict[str, bytes]:
+        """path -> content on `branch`, for checking what a pull request would merge."""
+        commit = self.commits[self.repos[repo]["refs"][branch]]
+        return {path: self.blobs[sha] for path, (_, sha) in self.trees[commit["tree"]["sha"]].items()}
+
+    def throttle(self, status: int = 403, retry_after: Optional[float] = 1, times: int = 1):
+        """Answer the next `times` requests with a secondary rate limit error."""
+        with self.lock:
+            self.throttled += [(status, retry_after)] * times
+
+    # -------------------------------
+    # Rate limiting: (status, body, headers)
+    # -------------------------------
+    def handle(self, method: str, path: str, body: Dict, headers: Optional[Dict] = None):
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= self.rate_window:
+                self.window_start, self.used = now, 0
+            reset = int(self.window_start + self.rate_window) + 1
+            if self.throttled:
+                status, retry_after = self.throttled.pop(0)
+                self.requests.append(f"{method} {path} -> {status}")
+                extra = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+                return status, {"message": "You have exceeded a secondary rate limit."}, dict(extra, **self._rate_headers(reset))
+            if self.used >= self.rate_limit:
+                self.requests.append(f"{method} {path} -> 403")
+                return 403, {"message": "API rate limit exceeded."}, self._rate_headers(reset)
+        status, payload = self._route(method, path, body)
+        etag = None
+        if method == "GET" and status == 200:
+            etag = '"%s"' % _sha(payload)
+            if (headers or {}).get("If-None-Match") == etag:
+                # conditional hits are free on GitHub
+                self.requests.append(f"{method} {path} -> 304")
+                return 304, None, dict(self._rate_headers(reset), ETag=etag)
+        with self.lock:
+            self.used += 1
+        self.requests.append(f"{method} {path}")
+        extra = {"ETag": etag} if etag else {}
+        return status, payload, dict(extra, **self._rate_headers(reset))
+
+    def _rate_headers(self, reset: int) -> Dict[str, str]:
+        return {"X-RateLimit-Limit": str(self.rate_limit), "X-RateLimit-Remaining": str(max(0, self.rate_limit - self.used)),
+                "X-RateLimit-Reset": str(reset)}
+
+    # -------------------------------
+    # Endpoints: (status, body)
+    # -------------------------------
+    def _route(self, method: str, path: str, body: Dict):
+        match = re.match(r"^/repos/([^/]+/[^/]+)(/.*)?$", path)
+        if not match or match.group(1) not in self.repos:
+            return 404, {"message": "Not Found"}
+        name, rest = match.group(1), match.group(2) or ""
+        repo = self.repos[name]
+        with self.lock:
+            if method == "GET" and rest == "":
+                return 200, {"full_name": name, "default_branch": repo["default_branch"]}
+            m = re.match(r"^/git/ref/heads/(.+)$", rest)
+            if method == "GET" and m:
+                if m.group(1) not in repo["refs"]:
+                    return 404, {"message": "Not Found"}
+                return 200, {"ref": f"refs/heads/{m.group(1)}", "object": {"sha": repo["refs"][m.group(1)], "type": "commit"}}
+            m = re.match(r"^/git/commits/([0-9a-f]+)$", rest)
+            if method == "GET" and m:
+                commit = self.commits.get(m.group(1))
+                return (200, commit) if commit else (404, {"message": "Not Found"})
+            if method == "POST" and rest == "/git/blobs":
+                data = base64.b64decode(body["content"]) if body.get("encoding") == "base64" else body["content"].encode("utf-8")
+                return 201, {"sha": self._store_blob(data)}
+            if method == "POST" and rest == "/git/trees":
+                entries = dict(self.trees.get(body.get("base_tree"), {}))
+                for entry in body["tree"]:
+                    if entry.get("sha") is None and "content" not in entry:
+                        entries.pop(entry["path"], None)
+                    elif "content" in entry:
+                        entries[entry["path"]] = (entry["mode"], self._store_blob(entry["content"].encode("utf-8")))
+                    elif entry["sha"] in self.blobs:
+                        entries[entry["path"]] = (entry["mode"], entry["sha"])
+                    else:
+                        return 422, {"message": f"unknown blob {entry['sha']}"}
+                return 201, {"sha": self._store_tree(entries)}
+            if method == "POST" and rest == "/git/commits":
+                if body["tree"] not in self.trees or any(p not in self.commits for p in body["parents"]):
+                    return 422, {"message": "tree or parent not found"}
+                return 201, {"sha": self._store_commit(body["message"], body["tree"], body["parents"])}
+            if method == "POST" and rest == "/git/refs":
+                branch = body["ref"].replace("refs/heads/", "", 1)
+                if branch in repo["refs"]:
+                    return 422, {"message": "Reference already exists"}
+                repo["refs"][branch] = body["sha"]
+                return 201, {"ref": body["ref"], "object": {"sha": body["sha"], "type": "commit"}}
+            if method == "POST" and rest == "/pulls":
+                if body["head"] not in repo["refs"] or body["base"] not in repo["refs"]:
+                    return 422, {"message": "head or base branch not found"}
+                number = len(self.pulls) + 1
+                pull = dict(body, number=number, repo=name, html_url=f"https://github.example/{name}/pull/{number}")
+                self.pulls.append(pull)
+                return 201, pull
+        return 404, {"message": "Not Found"}
+
+
+def serve(github: FakeGitHub, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start serving `github` in a daemon thread; the URL is http://host:server.server_port."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            status, payload, headers = github.handle(self.command, self.path.split("?", 1)[0], body, self.headers)
+            data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = _reply
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="fake-github", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake GitHub API for offline pull requests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--repo", action="append", default=[], help="owner/name to create (repeatable)")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="calls per window")
+    parser.add_argument("--rate-window", type=float, default=3600, help="seconds")
+    args = parser.parse_args()
+    server = serve(FakeGitHub(args.repo or ["org/app"], rate_limit=args.rate_limit, rate_window=args.rate_window),
+                   args.host, args.port)
+    print(f"🐙 Fake GitHub on http://{args.host}:{server.server_port} for {', '.join(args.repo or ['org/app'])}")
+    threading.Event().wait()
@@ -0,0 +1,124 @@
+"""HTTP API: job submission, polling, duplicate attachment and request validation."""
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import api
+from helpers.job_store import JobStore, MemoryJobStore
+from helpers.pipeline import Pipeline, Stage
+
+
+@pytest.fixture
+def release():
+    return threading.Event()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, release):
+    def clone(git_url):
+        assert release.wait(10)
+        return {"workspace_path": str(tmp_path / "clone")}
+
+    def dockerfile(workspace_path, app_type_hint):
+        return {"dockerfile_path": os.path.join(workspace_path, "Dockerfile")}
+
+    def build_pipeline(build=True, create_pr=False, limits=None, stage_cache=None):
+        return Pipeline([
+            Stage("clone", clone, inputs=["git_url"], outputs=["workspace_path"]),
+            Stage("dockerfile", dockerfile, inputs=["workspace_path", "app_type_hint"], outputs=["dockerfile_path"]),
+        ], stage_cache=stage_cache)
+
+    monkeypatch.setattr(api, "WARMUP_ON_START", False)
+    monkeypatch.setattr(api, "store", MemoryJobStore())
+    monkeypatch.setattr(api, "build_onboarding_pipeline", build_pipeline)
+    monkeypatch.setattr(api, "API_WORKSPACE_ROOTS", [os.path.realpath(str(tmp_path))])
+    # background jobs only run while the client's event loop is up
+    with TestClient(api.app) as c:
+        yield c
+    release.set()
+
+
+def _wait(client, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in ("success", "failed", "cancelled"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+PIPELINE = {"git_url": "https://example.com/org/demo.git", "app_name": "demo", "image_tag": "demo:1",
+            "build": False}
+
+
+def test_job_store_is_abstract():
+    with pytest.raises(TypeError):
+        JobStore()
+
+
+def test_submit_then_poll(client, release):
+    resp = client.post("/jobs/pipeline", json=PIPELINE)
+    assert resp.status_code == 202
+    body = resp.json()
+    assert body["status"] == "queued"
+    assert body["status_url"] == f"/jobs/{body['job_id']}"
+
+    release.set()
+    job = _wait(client, body["job_id"])
+    assert job["status"] == "success"
+    assert job["result"]["values"]["dockerfile_path"].endswith(os.path.join("clone", "Dockerfile"))
+    stream = client.get(f"/jobs/{body['job_id']}/events").text
+    assert stream.count('"status": "running"') == 2
+    assert "event: end" in stream
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_duplicate_submission_attaches_to_the_running_job(client, release):
+    first = client.post("/jobs/pipeline", json=PIPELINE).json()
+    second = client.post("/jobs/pipeline", json=PIPELINE)
+    assert second.status_code == 202
+    assert second.json()["job_id"] == first["job_id"]
+    assert second.json()["attached"] is True
+
+    other = client.post("/jobs/pipeline", json=dict(PIPELINE, image_tag="demo:2")).json()
+    assert other["job_id"] != first["job_id"]
+    assert "attached" not in other
+
+    release.set()
+    assert _wait(client, first["job_id"])["status"] == "success"
+    # once finished, the same request starts a new job
+    assert client.post("/jobs/pipeline", json=PIPELINE).json()["job_id"] != first["job_id"]
+
+
+def test_workspace_path_must_be_a_checkout_under_the_roots(client, tmp_path):
+    outside = client.post("/jobs/dockerfile", json={"workspace_path": "/etc"})
+    assert outside.status_code == 422
+    assert "workspace_path must be inside" in outside.text
+
+    escape = client.post("/jobs/dockerfile", json={"workspace_path": str(tmp_path / ".." / "..")})
+    assert escape.status_code == 422
+
+    root = client.post("/jobs/dockerfile", json={"workspace_path": str(tmp_path)})
+    assert root.status_code == 422
+
+    plain = tmp_path / "plain"
+    plain.mkdir()
+    not_a_checkout = client.post("/jobs/dockerfile", json={"workspace_path": str(plain)})
+    assert not_a_checkout.status_code == 422
+    assert "not a cloned repository" in not_a_checkout.text
+
+    checkout = tmp_path / "checkout"
+    checkout.mkdir()
+    subprocess.run(["git", "init", "-q", str(checkout)], check=True)
+    resp = client.post("/jobs/dockerfile", json={"workspace_path": str(checkout)})
+    assert resp.status_code == 202
+    job = _wait(client, resp.json()["job_id"])
+    assert job["status"] == "success"
+    assert job["result"]["values"]["dockerfile_path"] == os.path.join(os.path.realpath(str(checkout)), "Dockerfile")
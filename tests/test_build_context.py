@@ -0,0 +1,105 @@
+""".dockerignore parsing and matching with docker's semantics."""
+import pytest
+
+from helpers.build_context import iter_context_files, is_ignored, load_dockerignore
+
+
+def _rules(tmp_path, *lines):
+    (tmp_path / ".dockerignore").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return load_dockerignore(str(tmp_path))
+
+
+def test_missing_dockerignore_has_no_rules(tmp_path):
+    assert load_dockerignore(str(tmp_path)) == []
+    assert not is_ignored("anything/at/all.py", [])
+
+
+def test_comments_blank_lines_and_leading_slash(tmp_path):
+    rules = _rules(tmp_path, "# build output", "", "/dist", "   ")
+    assert len(rules) == 1
+    assert is_ignored("dist", rules)
+    assert is_ignored("dist/app.js", rules)
+    assert not is_ignored("src/dist/app.js", rules)
+
+
+@pytest.mark.parametrize("path, ignored", [
+    ("x.pyc", True),
+    ("pkg/mod/x.pyo", True),
+    ("pkg/x.pyd", True),
+    ("pkg/x.py", False),
+    ("pkg/x.pyx", False),
+])
+def test_double_star_with_bracket_class(tmp_path, path, ignored):
+    rules = _rules(tmp_path, "**/*.py[cod]")
+    assert is_ignored(path, rules) is ignored
+
+
+def test_double_star_in_the_middle(tmp_path):
+    rules = _rules(tmp_path, "docs/**/*.md")
+    assert is_ignored("docs/index.md", rules)
+    assert is_ignored("docs/a/b/c.md", rules)
+    assert not is_ignored("README.md", rules)
+    assert not is_ignored("docs/a/b/c.txt", rules)
+
+
+def test_single_star_and_question_mark_stay_in_one_segment(tmp_path):
+    rules = _rules(tmp_path, "*.log", "tmp?")
+    assert is_ignored("server.log", rules)
+    assert not is_ignored("logs/server.log", rules)
+    assert is_ignored("tmp1", rules)
+    assert not is_ignored("tmp12", rules)
+
+
+@pytest.mark.parametrize("pattern, path, ignored", [
+    ("file[0-9].txt", "file7.txt", True),
+    ("file[0-9].txt", "filex.txt", False),
+    ("file[!0-9].txt", "filex.txt", True),
+    ("file[!0-9].txt", "file7.txt", False),
+    ("file[^0-9].txt", "filex.txt", True),
+    ("a[!x]b", "a/b", False),
+    ("a[b", "a[b", True),
+    ("[]]x", "]x", True),
+    ("[a\\-z]", "-", True),
+    ("[a\\-z]", "m", False),
+])
+def test_bracket_classes(tmp_path, pattern, path, ignored):
+    rules = _rules(tmp_path, pattern)
+    assert is_ignored(path, rules) is ignored
+
+
+def test_negation_re_includes_and_last_match_wins(tmp_path):
+    rules = _rules(tmp_path, "*.md", "!README.md", "README*.md")
+    assert is_ignored("CHANGELOG.md", rules)
+    # re-included by the negation, then excluded again by the last matching rule
+    assert is_ignored("README.md", rules)
+
+    rules = _rules(tmp_path, "*.md", "!README.md")
+    assert not is_ignored("README.md", rules)
+    assert is_ignored("NOTES.md", rules)
+
+
+def test_directory_rule_covers_everything_below(tmp_path):
+    rules = _rules(tmp_path, "build/", "node_modules")
+    assert is_ignored("build", rules)
+    assert is_ignored("build/lib/x.so", rules)
+    assert is_ignored("node_modules/pkg/index.js", rules)
+    assert not is_ignored("src/build.py", rules)
+
+
+def test_negation_below_an_ignored_directory(tmp_path):
+    rules = _rules(tmp_path, "vendor", "!vendor/keep.txt")
+    assert is_ignored("vendor/drop.txt", rules)
+    assert not is_ignored("vendor/keep.txt", rules)
+
+
+def test_iter_context_files_applies_rules(tmp_path):
+    for rel in ("Dockerfile", "app/main.py", "app/main.pyc", "build/out.bin", "vendor/keep.txt",
+                "vendor/drop.txt"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x", encoding="utf-8")
+    _rules(tmp_path, "**/*.py[cod]", "build", "vendor", "!vendor/keep.txt", "Dockerfile")
+
+    assert list(iter_context_files(str(tmp_path))) == [
+        ".dockerignore", "Dockerfile", "app/main.py", "vendor/keep.txt",
+    ]
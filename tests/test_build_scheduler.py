@@ -0,0 +1,124 @@
+"""BuildScheduler with fake builders: queue order, host affinity, slot release and stats."""
+import threading
+import time
+
+import pytest
+
+from helpers.build_scheduler import BuildScheduler
+
+
+def _until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def _builder(scheduler, name, order, repo_key=None):
+    """A fake build: take a slot, note which host it got, give the slot back."""
+    def build():
+        with scheduler.slot(repo_key) as (host, _):
+            order.append((name, host))
+    thread = threading.Thread(target=build, name=name)
+    thread.start()
+    return thread
+
+
+def test_waiters_get_slots_in_arrival_order():
+    scheduler = BuildScheduler(hosts=["a"], max_per_host=1)
+    order = []
+    host, _ = scheduler.acquire()
+    threads = []
+    for i in range(5):
+        # start each builder only once the previous one is queued, so arrival order is known
+        threads.append(_builder(scheduler, f"build-{i}", order, repo_key=f"repo-{i}"))
+        _until(lambda: scheduler.stats()["queue_depth"] == i + 1)
+
+    scheduler.release(host)
+    for thread in threads:
+        thread.join(5)
+
+    assert [name for name, _ in order] == [f"build-{i}" for i in range(5)]
+    assert scheduler.stats()["queue_depth"] == 0
+
+
+def test_affinity_does_not_jump_the_queue():
+    scheduler = BuildScheduler(hosts=["a", "b"], max_per_host=1)
+    with scheduler.slot("pinned"):
+        pass
+    held = [scheduler.acquire()[0], scheduler.acquire()[0]]
+    order = []
+    threads = [_builder(scheduler, "first", order)]
+    _until(lambda: scheduler.stats()["queue_depth"] == 1)
+    threads.append(_builder(scheduler, "pinned", order, repo_key="pinned"))
+    _until(lambda: scheduler.stats()["queue_depth"] == 2)
+
+    # the freed host is the one "pinned" prefers, but "first" is at the head of the queue
+    scheduler.release(held[0])
+    for thread in threads:
+        thread.join(5)
+
+    assert order == [("first", "a"), ("pinned", "a")]
+
+
+def test_repo_returns_to_its_last_host_while_it_has_a_free_slot():
+    scheduler = BuildScheduler(hosts=["a", "b"], max_per_host=2)
+    with scheduler.slot("app"):
+        pass
+    # no history: least loaded, ties go to the first host
+    other, _ = scheduler.acquire("other")
+    assert other == "a"
+    newcomer, _ = scheduler.acquire("newcomer")
+    assert newcomer == "b"
+
+    # "app" built on "a" before: it goes back there although "b" is just as loaded
+    host, _ = scheduler.acquire("app")
+    assert host == "a"
+    # "a" is full now: least loaded instead, and the affinity follows
+    host, _ = scheduler.acquire("app")
+    assert host == "b"
+    assert scheduler.stats()["hosts"] == {"a": 2, "b": 2}
+
+
+def test_slot_is_released_when_the_build_raises():
+    scheduler = BuildScheduler(hosts=["a"], max_per_host=1)
+    with pytest.raises(RuntimeError):
+        with scheduler.slot("app"):
+            raise RuntimeError("docker build failed")
+
+    stats = scheduler.stats()
+    assert stats["running"] == 0 and stats["completed"] == 1
+    host, waited = scheduler.acquire("app", timeout=0.5)
+    assert host == "a" and waited < 0.5
+
+
+def test_acquire_times_out_and_leaves_the_queue():
+    scheduler = BuildScheduler(hosts=["a"], max_per_host=1)
+    scheduler.acquire()
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(timeout=0.05)
+    assert scheduler.stats()["queue_depth"] == 0
+
+
+def test_stats():
+    scheduler = BuildScheduler(hosts=[""], max_per_host=1)
+    assert scheduler.stats() == {"queue_depth": 0, "running": 0, "max_per_host": 1, "hosts": {"default": 0},
+                                 "completed": 0, "avg_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    host, _ = scheduler.acquire()
+    order = []
+    waiter = _builder(scheduler, "waiter", order)
+    _until(lambda: scheduler.stats()["queue_depth"] == 1)
+    stats = scheduler.stats()
+    assert stats["running"] == 1 and stats["hosts"] == {"default": 1}
+
+    time.sleep(0.2)
+    scheduler.release(host)
+    waiter.join(5)
+
+    stats = scheduler.stats()
+    assert stats["queue_depth"] == 0 and stats["running"] == 0 and stats["completed"] == 2
+    assert stats["max_wait_seconds"] >= 0.2
+    # the first build did not wait at all
+    assert stats["avg_wait_seconds"] == pytest.approx(stats["max_wait_seconds"] / 2, abs=0.002)
@@ -0,0 +1,143 @@
+"""Staging of onboarding artefacts and the push-free pull request flow."""
+import os
+import subprocess
+
+import pytest
+from git import Repo
+
+import helpers.git_pr_helper as git_pr_helper
+import helpers.github_api as github_api
+from helpers.git_pr_helper import create_pull_request, stage_artifacts
+from helpers.github_api import GitHubClient
+from fake_github import FakeGitHub, serve
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", "-c", "user.email=test@example.com", "-c", "user.name=test", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+def _write(root, rel, text="x\n"):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    return path
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = str(tmp_path / "workspace")
+    _write(root, "app/main.py", "print('hi')\n")
+    _git(root, "init", "-q", "-b", "main")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "initial")
+    return root
+
+
+def test_default_pathspecs_with_dockerfile_but_no_k8s_configs(workspace):
+    _write(workspace, "Dockerfile", "FROM python:3.12-slim\n")
+    _write(workspace, ".dockerignore", ".git\n")
+
+    staged = stage_artifacts(Repo(workspace))
+
+    assert sorted(staged) == [".dockerignore", "Dockerfile"]
+
+
+def test_default_pathspecs_stage_only_artefacts(workspace):
+    _write(workspace, "svc/Dockerfile", "FROM node:20\n")
+    _write(workspace, "k8s_configs/dev/deployment.yaml", "kind: Deployment\n")
+    _write(workspace, "target/app.jar", "binary\n")
+    _write(workspace, "app/main.py", "print('changed')\n")
+
+    staged = stage_artifacts(Repo(workspace))
+
+    assert sorted(staged) == ["k8s_configs/dev/deployment.yaml", "svc/Dockerfile"]
+
+
+def test_default_pathspecs_with_no_artefacts_stage_nothing(workspace):
+    _write(workspace, "notes.txt")
+
+    assert stage_artifacts(Repo(workspace)) == []
+
+
+def test_explicit_paths_bring_their_dockerignore(workspace):
+    dockerfile = _write(workspace, "Dockerfile", "FROM python:3.12-slim\n")
+    _write(workspace, ".dockerignore", ".git\n")
+    _write(workspace, "k8s_configs/dev/service.yaml", "kind: Service\n")
+
+    staged = stage_artifacts(Repo(workspace), [dockerfile])
+
+    assert sorted(staged) == [".dockerignore", "Dockerfile"]
+
+
+# -------------------------------
+# PR_MODE=api against the fake GitHub
+# -------------------------------
+BASE_FILES = {"app/main.py": b"print('hi')\n"}
+REMOTE = "https://github.com/org/app.git"
+
+
+@pytest.fixture
+def github(monkeypatch):
+    fake = FakeGitHub([])
+    server = serve(fake)
+    client = GitHubClient("token", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(github_api, "GITHUB_WRITE_INTERVAL_SECONDS", 0.0)
+    monkeypatch.setattr(github_api, "GITHUB_RATE_LIMIT_RESERVE", 0)
+    monkeypatch.setattr(git_pr_helper, "PR_MODE", "api")
+    monkeypatch.setattr(git_pr_helper, "get_github_client", lambda token: client)
+    monkeypatch.setenv("GIT_USERNAME", "bot")
+    monkeypatch.setenv("GIT_TOKEN", "token")
+    yield fake
+    server.shutdown()
+
+
+def test_api_mode_commits_staged_files_on_the_base_branch(workspace, github):
+    github.add_repo("org/app", files=BASE_FILES)
+    base_head = github.repos["org/app"]["refs"]["main"]
+    _write(workspace, "Dockerfile", "FROM python:3.12-slim\n")
+    _write(workspace, ".dockerignore", ".git\n")
+    _write(workspace, "k8s_configs/dev/deployment.yaml", "kind: Deployment\n")
+    with open(os.path.join(workspace, "k8s_configs", "dev", "logo.bin"), "wb") as fh:
+        fh.write(b"\xff\x00\xfe")
+    local_head = Repo(workspace).head.commit.hexsha
+
+    result = create_pull_request(workspace, REMOTE)
+
+    assert result["success"] and not result.get("skipped")
+    assert sorted(result["files"]) == [".dockerignore", "Dockerfile", "k8s_configs/dev/deployment.yaml",
+                                       "k8s_configs/dev/logo.bin"]
+    [pull] = github.pulls
+    assert pull["base"] == "main" and pull["head"].startswith("ai-onboard-changes-")
+    assert pull["html_url"] in result["message"]
+    # one new branch whose commit sits on the remote base head
+    refs = github.repos["org/app"]["refs"]
+    assert set(refs) == {"main", pull["head"]} and refs["main"] == base_head
+    assert github.commits[refs[pull["head"]]]["parents"] == [{"sha": base_head}]
+    assert github.files_at("org/app", pull["head"]) == dict(BASE_FILES, **{
+        "Dockerfile": b"FROM python:3.12-slim\n",
+        ".dockerignore": b".git\n",
+        "k8s_configs/dev/deployment.yaml": b"kind: Deployment\n",
+        "k8s_configs/dev/logo.bin": b"\xff\x00\xfe",
+    })
+    # text goes inline in the tree; only the binary file needs its own blob upload
+    assert github.requests.count("POST /repos/org/app/git/blobs") == 1
+    # nothing was committed or pushed locally
+    repo = Repo(workspace)
+    assert repo.head.commit.hexsha == local_head
+    assert [r.name for r in repo.remotes] == []
+
+
+def test_api_mode_skips_when_base_branch_already_has_the_files(workspace, github):
+    github.add_repo("org/app", files=dict(BASE_FILES, **{"Dockerfile": b"FROM python:3.12-slim\n"}))
+    # the local clone predates the Dockerfile landing upstream
+    _write(workspace, "Dockerfile", "FROM python:3.12-slim\n")
+
+    result = create_pull_request(workspace, REMOTE, paths=[os.path.join(workspace, "Dockerfile")])
+
+    assert result["skipped"] is True and result["files"] == []
+    assert github.pulls == []
+    assert set(github.repos["org/app"]["refs"]) == {"main"}
+    assert not any(r.startswith(("POST /repos/org/app/git/commits", "POST /repos/org/app/git/refs"))
+                   for r in github.requests)
@@ -0,0 +1,144 @@
+"""GitHubClient against the fake GitHub: rate limit retries, ETag reuse, write pacing."""
+import time
+import threading
+
+import httpx
+import pytest
+
+import helpers.github_api as github_api
+from helpers.github_api import GitHubClient, get_github_client
+from fake_github import FakeGitHub, serve
+
+
+@pytest.fixture
+def github(monkeypatch):
+    """Factory: each call serves a new fake GitHub and returns (fake, client for it)."""
+    monkeypatch.setattr(github_api, "GITHUB_WRITE_INTERVAL_SECONDS", 0.0)
+    monkeypatch.setattr(github_api, "GITHUB_RATE_LIMIT_RESERVE", 0)
+    servers = []
+
+    def start(**kwargs):
+        fake = FakeGitHub(["org/app"], **kwargs)
+        server = serve(fake)
+        servers.append(server)
+        return fake, GitHubClient("token", f"http://127.0.0.1:{server.server_port}")
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_secondary_limit_403_is_retried_after_retry_after(github):
+    fake, client = github()
+    fake.throttle(status=403, retry_after=0.3)
+
+    start = time.perf_counter()
+    assert client.default_branch("org/app") == "main"
+
+    assert time.perf_counter() - start >= 0.3
+    assert fake.requests == ["GET /repos/org/app -> 403", "GET /repos/org/app"]
+
+
+def test_429_is_retried_after_retry_after(github):
+    fake, client = github()
+    fake.throttle(status=429, retry_after=0.2, times=2)
+
+    start = time.perf_counter()
+    sha = client.create_blob("org/app", "aGVsbG8=")
+
+    assert time.perf_counter() - start >= 0.4
+    assert fake.blobs[sha] == b"hello"
+    assert fake.requests[:2] == ["POST /repos/org/app/git/blobs -> 429"] * 2
+
+
+def test_exhausted_limit_403_is_retried_after_reset(github):
+    fake, client = github(rate_limit=2, rate_window=1)
+    client.repository("org/app")
+    # another process spends the rest of the window: our client still believes one call is left
+    GitHubClient("other-token", client.api_url).branch_head("org/app", "main")
+    assert client.rate["remaining"] == 1
+
+    start = time.perf_counter()
+    head = client.branch_head("org/app", "main")
+
+    # 403 with X-RateLimit-Remaining: 0, retried once X-RateLimit-Reset has passed
+    assert head == fake.repos["org/app"]["refs"]["main"]
+    assert time.perf_counter() - start >= 0.5
+    assert fake.requests[2:] == ["GET /repos/org/app/git/ref/heads/main -> 403", "GET /repos/org/app/git/ref/heads/main"]
+
+
+def test_reserve_waits_for_reset_instead_of_hitting_403(github, monkeypatch):
+    monkeypatch.setattr(github_api, "GITHUB_RATE_LIMIT_RESERVE", 1)
+    fake, client = github(rate_limit=2, rate_window=1)
+    client.repository("org/app")
+    assert client.rate["remaining"] == 1
+
+    client.branch_head("org/app", "main")
+
+    assert not any(r.endswith("-> 403") for r in fake.requests)
+
+
+def test_rate_limit_wait_longer_than_max_is_not_slept(github, monkeypatch):
+    monkeypatch.setattr(github_api, "GITHUB_MAX_WAIT_SECONDS", 1)
+    fake, client = github()
+    # no Retry-After: GitHub asks for a minute, more than we are willing to wait
+    fake.throttle(status=429, retry_after=None)
+
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match=r"\(429\)"):
+        client.repository("org/app")
+    assert time.perf_counter() - start < 1
+
+
+def test_plain_403_is_not_retried():
+    client = GitHubClient("token", "http://127.0.0.1:9")
+    forbidden = httpx.Response(403, json={"message": "Resource not accessible by integration"})
+    limited = httpx.Response(403, json={"message": "You have exceeded a secondary rate limit."})
+
+    assert client._retry_delay(forbidden, 0) is None
+    assert client._retry_delay(limited, 0) == 60.0
+
+
+def test_etag_304_reuses_cached_body_without_spending_the_limit(github):
+    fake, client = github()
+    first = client.repository("org/app")
+    remaining = client.rate["remaining"]
+
+    second = client.repository("org/app")
+
+    assert second == first
+    assert fake.requests == ["GET /repos/org/app", "GET /repos/org/app -> 304"]
+    assert fake.used == 1
+    assert client.rate["remaining"] == remaining
+
+
+def test_writes_are_paced(github, monkeypatch):
+    monkeypatch.setattr(github_api, "GITHUB_WRITE_INTERVAL_SECONDS", 0.2)
+    fake, client = github()
+    seen = []
+    handle = fake.handle
+
+    def recording_handle(method, path, body, headers=None):
+        if method == "POST":
+            seen.append(time.monotonic())
+        return handle(method, path, body, headers)
+
+    fake.handle = recording_handle
+    threads = [threading.Thread(target=client.create_blob, args=("org/app", f"{i:04d}")) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(seen) == 4
+    gaps = [b - a for a, b in zip(seen, seen[1:])]
+    assert min(gaps) >= 0.18
+    # reads are not queued behind writes
+    start = time.perf_counter()
+    client.repository("org/app")
+    assert time.perf_counter() - start < 0.2
+
+
+def test_client_is_shared_per_token():
+    assert get_github_client("a", "http://x") is get_github_client("a", "http://x/")
+    assert get_github_client("a", "http://x") is not get_github_client("b", "http://x")
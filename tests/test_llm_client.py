@@ -0,0 +1,180 @@
+"""PooledChatModel against a local HTTP endpoint standing in for the provider."""
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+import httpx
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import helpers.llm_client as llm_client
+from helpers.llm_client import PooledChatModel, get_llm_pool_stats
+
+
+class FakeProvider:
+    """
+    Chat endpoint: POST /chat {"prompt"} -> {"content"}. The first `rate_limited` requests
+    get 429 with Retry-After; every answer takes `delay` seconds. Records in-flight peaks.
+    """
+
+    def __init__(self, rate_limited: int = 0, retry_after: float = 0.0, delay: float = 0.0, status: int = 200):
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.delay = delay
+        self.status = status
+        self.hits = 0
+        self.inflight = 0
+        self.max_inflight = 0
+        self._lock = threading.Lock()
+
+    def handle(self, prompt: str):
+        with self._lock:
+            self.hits += 1
+            limited = self.hits <= self.rate_limited
+            self.inflight += 1
+            self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            if limited:
+                return 429, {"error": "rate limited"}, {"Retry-After": str(self.retry_after)}
+            time.sleep(self.delay)
+            if self.status != 200:
+                return self.status, {"error": "bad request"}, {}
+            return 200, {"content": f"echo: {prompt}"}, {}
+        finally:
+            with self._lock:
+                self.inflight -= 1
+
+
+@pytest.fixture
+def provider():
+    servers = []
+
+    def start(**kwargs) -> FakeProvider:
+        fake = FakeProvider(**kwargs)
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                status, payload, headers = fake.handle(body.get("prompt", ""))
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        fake.url = f"http://127.0.0.1:{server.server_port}/chat"
+        return fake
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+class HTTPChatModel(BaseChatModel):
+    """Minimal provider SDK: one POST per call through the pool's shared httpx client."""
+
+    url: str
+    model: str = "test-model"
+
+    @property
+    def _llm_type(self) -> str:
+        return "http-test"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None,
+                  **kwargs) -> ChatResult:
+        response = llm_client.get_http_client().post(self.url, json={"prompt": messages[-1].content})
+        # HTTPStatusError carries .response (status code, Retry-After) like the provider SDKs' errors
+        response.raise_for_status()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response.json()["content"]))])
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_BACKOFF_BASE_SECONDS", 0.01)
+
+
+def test_429_is_retried_after_retry_after(provider):
+    fake = provider(rate_limited=2, retry_after=0.3)
+    model = PooledChatModel(inner=HTTPChatModel(url=fake.url), max_retries=3)
+    before = get_llm_pool_stats()
+
+    start = time.perf_counter()
+    answer = model.invoke("hello")
+    elapsed = time.perf_counter() - start
+
+    after = get_llm_pool_stats()
+    assert answer.content == "echo: hello"
+    assert fake.hits == 3
+    assert after["rate_limited"] - before["rate_limited"] == 2
+    assert after["retries"] - before["retries"] == 2
+    # Retry-After is the floor of each backoff
+    assert elapsed >= 0.6
+
+
+def test_429_gives_up_after_max_retries(provider):
+    fake = provider(rate_limited=10)
+    model = PooledChatModel(inner=HTTPChatModel(url=fake.url), max_retries=2)
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        model.invoke("hello")
+    assert error.value.response.status_code == 429
+    assert fake.hits == 3
+
+
+def test_client_errors_are_not_retried(provider):
+    fake = provider(status=400)
+    model = PooledChatModel(inner=HTTPChatModel(url=fake.url), max_retries=3)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        model.invoke("hello")
+    assert fake.hits == 1
+
+
+def test_concurrency_is_capped(provider, monkeypatch):
+    monkeypatch.setattr(llm_client, "_semaphore", threading.BoundedSemaphore(2))
+    fake = provider(delay=0.2)
+    model = PooledChatModel(inner=HTTPChatModel(url=fake.url))
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        answers = list(pool.map(lambda i: model.invoke(f"prompt {i}").content, range(6)))
+
+    assert answers == [f"echo: prompt {i}" for i in range(6)]
+    assert fake.hits == 6
+    assert fake.max_inflight == 2
+
+
+def test_identical_concurrent_requests_are_coalesced(provider):
+    fake = provider(delay=0.3)
+    model = PooledChatModel(inner=HTTPChatModel(url=fake.url))
+    before = get_llm_pool_stats()
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        answers = list(pool.map(lambda _: model.invoke("same prompt").content, range(5)))
+
+    assert answers == ["echo: same prompt"] * 5
+    assert fake.hits == 1
+    assert get_llm_pool_stats()["coalesced"] - before["coalesced"] == 4
+
+
+def test_different_requests_are_not_coalesced(provider):
+    fake = provider(delay=0.1)
+    model = PooledChatModel(inner=HTTPChatModel(url=fake.url))
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(lambda i: model.invoke(f"prompt {i}"), range(3)))
+
+    assert fake.hits == 3
@@ -0,0 +1,115 @@
+"""Stage cache reuse across onboarding runs that each clone into a fresh workspace."""
+import os
+import subprocess
+import uuid
+
+import pytest
+
+from helpers import onboarding_pipeline
+from helpers.job_store import MemoryJobStore, SQLiteJobStore, StageCache
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", "-c", "user.email=test@example.com", "-c", "user.name=test", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    root = tmp_path / "upstream"
+    (root / "app").mkdir(parents=True)
+    (root / "app" / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    (root / "requirements.txt").write_text("flask\n", encoding="utf-8")
+    _git(root, "init", "-q", "-b", "main")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "initial")
+    return root
+
+
+@pytest.fixture
+def stages(tmp_path, monkeypatch):
+    """Stage functions with the external work replaced; counts how often each really ran."""
+    calls = {"clone": 0, "dockerfile": 0, "yamls": 0, "build": 0}
+
+    def clone(git_url):
+        calls["clone"] += 1
+        workspace = str(tmp_path / f"ws-{uuid.uuid4().hex[:8]}")
+        _git(tmp_path, "clone", "-q", git_url, workspace)
+        return {"workspace_path": workspace}
+
+    class Generator:
+        source = "generated"
+
+        def __init__(self, app_type, workspace_path):
+            self.workspace_path = workspace_path
+
+        def run(self):
+            calls["dockerfile"] += 1
+            path = os.path.join(self.workspace_path, "Dockerfile")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write("FROM python:3.11-slim\n")
+            return path
+
+    def yamls(workspace_path, app_type, app_name, envs, image_tag, k8s_templates):
+        calls["yamls"] += 1
+        generated = {}
+        for env in envs:
+            path = os.path.join(workspace_path, "k8s_configs", env, "deployment.yaml")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(f"name: {app_name}-{env}\nimage: {image_tag}\n")
+            generated[env] = [path]
+        return {"generated": generated}
+
+    def build(workspace_path, app_type, image_tag, dockerfile_path):
+        calls["build"] += 1
+        return {"build_result": {"status": "success", "image": image_tag}}
+
+    monkeypatch.setattr(onboarding_pipeline, "_clone", clone)
+    monkeypatch.setattr(onboarding_pipeline, "_prefetch_templates", lambda app_type_hint: {"k8s_templates": {}})
+    monkeypatch.setattr(onboarding_pipeline, "_load_dockerfile_generator", lambda: {"dockerfile_generator": Generator})
+    monkeypatch.setattr(onboarding_pipeline, "_yamls", yamls)
+    monkeypatch.setattr(onboarding_pipeline, "_build", build)
+    return calls
+
+
+def _run(store, git_url):
+    pipeline = onboarding_pipeline.build_onboarding_pipeline(build=True, stage_cache=StageCache(store))
+    result = pipeline.run({"git_url": git_url, "app_type_hint": "Python", "app_name": "demo",
+                           "envs": ["dev", "prod"], "image_tag": "registry.local/demo:1"})
+    assert result["status"] == "success", result["error"]
+    return result, {t["stage"]: t for t in result["timeline"]}
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_repeat_submission_reuses_stages_in_a_fresh_clone(tmp_path, upstream, stages, backend):
+    store = MemoryJobStore() if backend == "memory" else SQLiteJobStore(str(tmp_path / "jobs.db"))
+    first, _ = _run(store, str(upstream))
+    second, timeline = _run(store, str(upstream))
+
+    workspace = second["values"]["workspace_path"]
+    assert workspace != first["values"]["workspace_path"]
+    assert stages == {"clone": 2, "dockerfile": 1, "yamls": 1, "build": 1}
+    for name in ("detect", "dockerfile", "yamls", "build"):
+        assert timeline[name]["cache_hit"] is True
+        assert timeline[name]["status"] == "cached"
+
+    # reused outputs point into (and were copied to) the new clone
+    assert second["values"]["dockerfile_path"] == os.path.join(workspace, "Dockerfile")
+    with open(second["values"]["dockerfile_path"], encoding="utf-8") as fh:
+        assert fh.read() == "FROM python:3.11-slim\n"
+    for env in ("dev", "prod"):
+        [path] = second["values"]["generated"][env]
+        assert path == os.path.join(workspace, "k8s_configs", env, "deployment.yaml")
+        assert os.path.isfile(path)
+
+
+def test_new_upstream_commit_misses_the_cache(upstream, stages):
+    store = MemoryJobStore()
+    _run(store, str(upstream))
+    (upstream / "app" / "main.py").write_text("print('bye')\n", encoding="utf-8")
+    _git(upstream, "commit", "-q", "-am", "change")
+    _, timeline = _run(store, str(upstream))
+
+    assert stages == {"clone": 2, "dockerfile": 2, "yamls": 2, "build": 2}
+    assert not any(timeline[name].get("cache_hit") for name in ("dockerfile", "yamls", "build"))
@@ -0,0 +1,140 @@
+"""Pipeline DAG execution with trivial stages: parallelism, failures, resume and subsets."""
+import threading
+
+import pytest
+
+from helpers.pipeline import Pipeline, Stage
+
+
+def _statuses(result):
+    return {t["stage"]: t["status"] for t in result["timeline"]}
+
+
+def _fail(**kwargs):
+    raise RuntimeError("boom")
+
+
+def test_independent_stages_run_in_parallel():
+    # each stage only gets past the barrier when the other one is running at the same time
+    barrier = threading.Barrier(2, timeout=5)
+
+    def left():
+        barrier.wait()
+        return {"left": threading.current_thread().name}
+
+    def right():
+        barrier.wait()
+        return {"right": threading.current_thread().name}
+
+    pipeline = Pipeline([
+        Stage("left", left, outputs=["left"]),
+        Stage("right", right, outputs=["right"]),
+        Stage("join", lambda left, right: {"joined": f"{left}+{right}"}, inputs=["left", "right"], outputs=["joined"]),
+    ], max_workers=2)
+    result = pipeline.run({})
+
+    assert result["status"] == "success"
+    assert result["values"]["left"] != result["values"]["right"]
+    assert result["values"]["joined"] == f"{result['values']['left']}+{result['values']['right']}"
+    assert _statuses(result) == {"left": "success", "right": "success", "join": "success"}
+
+
+def test_required_failure_skips_its_dependents():
+    events, calls = [], []
+    pipeline = Pipeline([
+        Stage("source", lambda seed: {"raw": seed}, inputs=["seed"], outputs=["raw"]),
+        Stage("parse", _fail, inputs=["raw"], outputs=["parsed"]),
+        Stage("render", lambda parsed: calls.append("render") or {"html": parsed}, inputs=["parsed"], outputs=["html"]),
+        Stage("publish", lambda html: calls.append("publish") or {"url": html}, inputs=["html"], outputs=["url"]),
+    ])
+    result = pipeline.run({"seed": 1}, on_event=events.append)
+
+    assert result["status"] == "failed"
+    assert result["failed_stage"] == "parse" and result["error"] == "boom"
+    assert _statuses(result) == {"source": "success", "parse": "failed", "render": "skipped", "publish": "skipped"}
+    assert calls == []
+    assert "html" not in result["values"]
+    assert {e["stage"] for e in events if e["status"] == "skipped"} == {"render", "publish"}
+
+
+def test_optional_failure_still_unblocks_its_consumers():
+    seen = {}
+
+    def consume(hints, seed):
+        seen["hints"] = hints
+        return {"out": seed * 2}
+
+    pipeline = Pipeline([
+        Stage("prefetch", _fail, outputs=["hints"], optional=True),
+        Stage("consume", consume, inputs=["hints", "seed"], outputs=["out"]),
+    ])
+    result = pipeline.run({"seed": 21})
+
+    assert result["status"] == "success" and result["failed_stage"] is None
+    assert result["values"]["out"] == 42
+    assert seen == {"hints": None}
+    assert _statuses(result) == {"prefetch": "failed", "consume": "success"}
+
+
+def test_stages_whose_outputs_are_given_are_not_run_again():
+    calls = []
+
+    def stage(name, value):
+        def fn(**kwargs):
+            calls.append(name)
+            return value
+        return fn
+
+    pipeline = Pipeline([
+        Stage("clone", stage("clone", {"workspace": "/w"}), inputs=["url"], outputs=["workspace"]),
+        # only feeds "detect", which is done already: nothing left for it to do
+        Stage("prefetch", stage("prefetch", {"templates": {}}), outputs=["templates"], optional=True),
+        Stage("detect", stage("detect", {"app_type": "Python"}), inputs=["workspace", "templates"],
+              outputs=["app_type"]),
+        Stage("build", stage("build", {"image": "demo:1"}), inputs=["workspace", "app_type"], outputs=["image"]),
+    ])
+    # an interrupted run that got as far as detect
+    result = pipeline.run({"url": "https://example.com/demo.git", "workspace": "/w", "app_type": "Python"})
+
+    assert result["status"] == "success"
+    assert calls == ["build"]
+    assert _statuses(result) == {"clone": "cached", "prefetch": "cached", "detect": "cached", "build": "success"}
+    assert result["values"]["image"] == "demo:1"
+
+
+def test_subset_pulls_in_producers_only_for_missing_inputs():
+    noop = lambda **kwargs: {}  # noqa: E731
+    pipeline = Pipeline([
+        Stage("clone", noop, inputs=["url"], outputs=["workspace"]),
+        Stage("detect", noop, inputs=["workspace"], outputs=["app_type"]),
+        Stage("dockerfile", noop, inputs=["workspace", "app_type"], outputs=["dockerfile"]),
+        Stage("yamls", noop, inputs=["workspace", "app_type"], outputs=["yamls"]),
+    ], max_workers=3)
+
+    assert set(pipeline.subset(["dockerfile"], ["url"]).stages) == {"clone", "detect", "dockerfile"}
+    assert set(pipeline.subset(["dockerfile"], ["workspace"]).stages) == {"detect", "dockerfile"}
+    assert set(pipeline.subset(["dockerfile", "yamls"], ["workspace", "app_type"]).stages) == {"dockerfile", "yamls"}
+    assert pipeline.subset(["yamls"], ["workspace"]).max_workers == 3
+
+
+def test_subset_runs_with_the_given_values():
+    pipeline = Pipeline([
+        Stage("clone", _fail, inputs=["url"], outputs=["workspace"]),
+        Stage("detect", lambda workspace: {"app_type": f"app in {workspace}"}, inputs=["workspace"],
+              outputs=["app_type"]),
+    ])
+    result = pipeline.subset(["detect"], ["workspace"]).run({"workspace": "/w"})
+
+    assert result["status"] == "success"
+    assert result["values"]["app_type"] == "app in /w"
+    assert _statuses(result) == {"detect": "success"}
+
+
+def test_invalid_pipelines_are_rejected():
+    noop = lambda **kwargs: {}  # noqa: E731
+    with pytest.raises(ValueError, match="produced by both"):
+        Pipeline([Stage("a", noop, outputs=["x"]), Stage("b", noop, outputs=["x"])])
+    with pytest.raises(ValueError, match="Cycle"):
+        Pipeline([Stage("a", noop, inputs=["y"], outputs=["x"]), Stage("b", noop, inputs=["x"], outputs=["y"])])
+    with pytest.raises(ValueError, match="not provided"):
+        Pipeline([Stage("a", noop, inputs=["seed"], outputs=["x"])]).run({})
@@ -1,7 +1,28 @@
 import os
+import re
 import json
-import subprocess
 from langchain_core.tools import tool
+from helpers.build_scheduler import get_build_scheduler, docker_env, repo_key_for_workspace, DOCKER_BIN
+from helpers.build_context import compute_context_hash, measure_context, CONTEXT_HASH_LABEL
+from helpers.image_helper import registry_image_labels, find_local_image_by_label, tag_image
+from helpers.image_report import build_image_report, check_size_gate, add_registry_size, record_image_size
+from helpers.progress import run_process, report
+from helpers.metrics import timed
+
+# "Step 3/12 : RUN ..." (classic builder) or "#7 [builder 3/8] RUN ..." (BuildKit)
+BUILD_STEP_RE = re.compile(r"^(?:Step (\d+)/(\d+)|#\d+ \[(?:[^\]]* )?(\d+)/(\d+)\])\s*:?\s*(.*)")
+
+# Build context size limits in MB (0 disables the check)
+BUILD_CONTEXT_WARN_MB = float(os.getenv("BUILD_CONTEXT_WARN_MB", 100))
+BUILD_CONTEXT_MAX_MB = float(os.getenv("BUILD_CONTEXT_MAX_MB", 0))
+
+
+def _report_build_step(line: str):
+    match = BUILD_STEP_RE.match(line)
+    if match:
+        step, total = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+        report("build", phase="build", step=int(step), total=int(total), line=match.group(5)[:120])
+
 
 @tool
 def build_push_tool(input_text: str) -> str:
@@ -12,8 +33,20 @@ def build_push_tool(input_text: str) -> str:
       "app_type": "Java",
       "image_name_tag": "shan5a6/myappimage:v1.0.0",
       "workspace_path": "/tmp/onboard-xyz",
-      "raw_dockerfile": "<optional dockerfile text>"
+      "raw_dockerfile": "<optional dockerfile text>",
+      "queue_timeout": <optional seconds to wait for a build slot>,
+      "force_rebuild": <optional bool, ignore images already carrying the context hash>,
+      "context_max_mb": <optional build context limit, overrides BUILD_CONTEXT_MAX_MB>,
+      "size_budget_mb": <optional compressed image budget, overrides IMAGE_SIZE_BUDGET_MB>,
+      "max_growth_pct": <optional allowed growth vs previous build, overrides IMAGE_SIZE_MAX_GROWTH_PCT>,
+      "repo": <optional scheduler affinity key, default the workspace's origin URL>,
+      "size_key": <optional size history key, default "repo"; one per image, e.g. per monorepo service>
     }
+    Builds go through the shared BuildScheduler (DOCKER_HOSTS / DOCKER_HOST_MAX_CONCURRENCY).
+    The build is skipped when an image labelled with the same context hash already exists
+    locally (retag + push) or in the registry under the same tag (nothing to do).
+    Before the push the image layers are reported and checked against the size budget;
+    only an image that passes is pushed and recorded as the size baseline.
     """
     try:
         try:
@@ -32,33 +65,117 @@ def build_push_tool(input_text: str) -> str:
 
         # If Dockerfile text is provided
         if dockerfile_text:
-            with open(dockerfile_path, "w") as f:
+            with timed("file_write", "dockerfile"), open(dockerfile_path, "w") as f:
                 f.write(dockerfile_text.strip())
             print(f"✅ Dockerfile written to {dockerfile_path}")
         elif not os.path.exists(dockerfile_path):
             return json.dumps({"status": "failed", "error": "No Dockerfile found or provided."})
 
-        # Docker build
-        build_cmd = ["docker", "build", "-t", image_name_tag, workspace_path]
-        print(f"🏗️  Building Docker image: {' '.join(build_cmd)}")
-        build_process = subprocess.run(build_cmd, capture_output=True, text=True)
-        if build_process.returncode != 0:
-            return json.dumps({"status": "failed", "step": "build", "stderr": build_process.stderr})
+        # Measure what docker would upload before doing anything expensive
+        context = measure_context(workspace_path)
+        context_mb = context["size_bytes"] / (1024 * 1024)
+        context_info = {"file_count": context["file_count"], "size_mb": round(context_mb, 2)}
+        print(f"📦 Build context: {context['file_count']} files, {context_mb:.2f} MB")
+        max_mb = float(data.get("context_max_mb") or BUILD_CONTEXT_MAX_MB)
+        if max_mb and context_mb > max_mb:
+            return json.dumps({"status": "failed", "step": "context", "context": context_info,
+                               "error": f"Build context is {context_mb:.2f} MB, above the {max_mb} MB limit. Check .dockerignore."})
+        if BUILD_CONTEXT_WARN_MB and context_mb > BUILD_CONTEXT_WARN_MB:
+            context_info["warning"] = f"Build context is {context_mb:.2f} MB, above {BUILD_CONTEXT_WARN_MB} MB."
+            print(f"⚠️ {context_info['warning']}")
+
+        # Content-addressed skip: identical context + Dockerfile -> identical image
+        context_hash = compute_context_hash(workspace_path, dockerfile_path, files=context["files"])
+        force_rebuild = bool(data.get("force_rebuild"))
+        skip_reason = None
+        print(f"🔑 Build context hash: {context_hash}")
+
+        scheduler = get_build_scheduler()
+        repo_key = data.get("repo") or repo_key_for_workspace(workspace_path)
+        size_key = data.get("size_key") or repo_key
+        docker_host, waited = None, 0.0
+        if not force_rebuild and registry_image_labels(image_name_tag).get(CONTEXT_HASH_LABEL) == context_hash:
+            skip_reason = "registry"
+            print(f"♻️  {image_name_tag} in registry already matches the context, skipping build and push")
+        else:
+            try:
+                with scheduler.slot(repo_key, timeout=data.get("queue_timeout")) as (docker_host, waited):
+                    env = docker_env(docker_host)
+
+                    local_image = None if force_rebuild else find_local_image_by_label(CONTEXT_HASH_LABEL, context_hash, docker_host)
+                    if local_image:
+                        skip_reason = "local"
+                        print(f"♻️  Reusing local image {local_image[:19]} for {image_name_tag}, skipping build")
+                        tag_process = tag_image(local_image, image_name_tag, docker_host)
+                        if tag_process.returncode != 0:
+                            return json.dumps({"status": "failed", "step": "tag", "docker_host": docker_host, "stderr": tag_process.stderr})
+                    else:
+                        # Docker build
+                        build_cmd = [DOCKER_BIN, "build", "-t", image_name_tag,
+                                     "--label", f"{CONTEXT_HASH_LABEL}={context_hash}", workspace_path]
+                        print(f"🏗️  Building Docker image on {docker_host or 'default host'}: {' '.join(build_cmd)}")
+                        # plain BuildKit output carries "#7 [3/8] RUN ..." lines we turn into step n/m
+                        with timed("docker", "build"):
+                            build_process = run_process(build_cmd, on_line=_report_build_step,
+                                                        env=dict(env, BUILDKIT_PROGRESS="plain"))
+                        if build_process.returncode != 0:
+                            return json.dumps({"status": "failed", "step": "build", "docker_host": docker_host, "stderr": build_process.stderr})
+
+                        print(f"✅ Build complete: {image_name_tag}")
+
+                    # Layer / size report and regression gate, before anything reaches the registry
+                    image_report = build_image_report(image_name_tag, size_key, docker_host or "", registry=False)
+                    size_error = check_size_gate(image_report, data.get("size_budget_mb"), data.get("max_growth_pct"))
+                    if size_error:
+                        print(f"❌ {size_error}")
+                        return json.dumps({"status": "failed", "step": "size_budget", "error": size_error,
+                                           "image": image_name_tag, "pushed": False, "image_report": image_report})
+
+                    # Docker push
+                    push_cmd = [DOCKER_BIN, "push", image_name_tag]
+                    print(f"📤 Pushing image: {' '.join(push_cmd)}")
+                    report("build", final=True, phase="push")
+                    with timed("docker", "push"):
+                        push_process = run_process(push_cmd, env=env)
+                    if push_process.returncode != 0:
+                        return json.dumps({"status": "failed", "step": "push", "docker_host": docker_host, "stderr": push_process.stderr})
+            except TimeoutError as e:
+                return json.dumps({"status": "failed", "step": "queue", "error": str(e), "queue": scheduler.stats()})
 
-        print(f"✅ Build complete: {image_name_tag}")
+        if skip_reason == "registry":
+            # already published: report and gate on the registry image
+            image_report = build_image_report(image_name_tag, size_key, docker_host or "")
+            size_error = check_size_gate(image_report, data.get("size_budget_mb"), data.get("max_growth_pct"))
+            if size_error:
+                print(f"❌ {size_error}")
+                return json.dumps({"status": "failed", "step": "size_budget", "error": size_error,
+                                   "image": image_name_tag, "pushed": False, "image_report": image_report})
+        else:
+            add_registry_size(image_report, image_name_tag, docker_host or "")
+        # only an image that passed the gate becomes the baseline for the next build
+        record_image_size(size_key, image_name_tag, image_report)
 
-        # Docker push
-        push_cmd = ["docker", "push", image_name_tag]
-        print(f"📤 Pushing image: {' '.join(push_cmd)}")
-        push_process = subprocess.run(push_cmd, capture_output=True, text=True)
-        if push_process.returncode != 0:
-            return json.dumps({"status": "failed", "step": "push", "stderr": push_process.stderr})
+        if skip_reason == "registry":
+            message = f"Docker image {image_name_tag} is already up to date in the registry."
+        elif skip_reason == "local":
+            message = f"Docker image {image_name_tag} reused from a local build and pushed."
+        else:
+            message = f"Docker image {image_name_tag} successfully built and pushed."
 
         result = {
             "status": "success",
             "image": image_name_tag,
             "workspace": workspace_path,
-            "message": f"Docker image {image_name_tag} successfully built and pushed."
+            "context_hash": context_hash,
+            "context": context_info,
+            "build_skipped": skip_reason is not None,
+            "skip_reason": skip_reason,
+            "pushed": skip_reason != "registry",
+            "docker_host": docker_host,
+            "queue_wait_seconds": round(waited, 3),
+            "queue": scheduler.stats(),
+            "image_report": image_report,
+            "message": message
         }
         print(json.dumps(result))
         return json.dumps(result)
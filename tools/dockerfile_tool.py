@@ -1,41 +1,139 @@
-from helpers.qdrant_helper import client
-from helpers.dockerfile_helper import save_dockerfile
-from sentence_transformers import SentenceTransformer
+from helpers.registry import register, get_resource, get_qdrant_client, get_embedder
+from helpers.dockerfile_helper import stream_dockerfile, save_dockerignore
+from helpers.dockerfile_renderer import render_dockerfile
+from helpers.llm_cache import LLMResponseCache
+from helpers.llm_router import model_for
+from helpers.repo_digest import build_repo_digest, estimate_tokens
+from helpers.app_type_detector import resolve_app_type
+from helpers.progress import report
 from langchain.tools import tool
 import os
-from langchain_groq import ChatGroq
+import time
+
+# The dockerfiles collection holds 384-dim MiniLM vectors
+DOCKERFILE_EMBED_MODEL = "all-MiniLM-L6-v2"
+
+
+def _embed(text: str):
+    return get_embedder(DOCKERFILE_EMBED_MODEL).encode(text).tolist()
+
+
+register("llm_cache", lambda: LLMResponseCache(embed_fn=_embed, client=get_qdrant_client()))
+
+
+class DockerfileGeneration:
+    """
+    One Dockerfile generation, iterable as text chunks so callers (the Streamlit page) can
+    render tokens as they arrive. Chunks are written to <workspace>/Dockerfile.partial while
+    streaming and renamed over the Dockerfile only once the text is complete.
+    After iteration: `file_path`, `source` (rendered|qdrant|cache|llm) and `metrics`
+    (time_to_first_token_s, total_s) are set.
+    """
+
+    collection_name = "dockerfiles"
+
+    def __init__(self, app_type: str, workspace_path: str, bypass_cache: bool = False):
+        self.app_type = resolve_app_type(app_type, workspace_path)
+        self.workspace_path = workspace_path
+        self.bypass_cache = bypass_cache
+        self.file_path = None
+        self.source = None
+        self.metrics = {}
+
+    def _chunks(self):
+        rendered = render_dockerfile(self.app_type, self.workspace_path)
+        if rendered:
+            self.source = "rendered"
+            print(f"✅ Rendered layer-cache-aware Dockerfile for '{self.app_type}'")
+            yield rendered
+            return
+
+        # Embed the app_type to do a vector-based semantic search
+        query_vector = _embed(self.app_type)
+
+        # Search the most similar Dockerfile (typed filter: local-mode Qdrant rejects dict filters)
+        from qdrant_client.http import models
+        search_results = get_qdrant_client().search(
+            collection_name=self.collection_name,
+            query_vector=query_vector,
+            query_filter=models.Filter(
+                must=[models.FieldCondition(key="app_type", match=models.MatchValue(value=self.app_type.lower()))]
+            ),
+            limit=1
+        )
+
+        if search_results:
+            self.source = "qdrant"
+            print(f"✅ Retrieved Dockerfile from Qdrant for '{self.app_type}'")
+            yield search_results[0].payload.get("file_content", "")
+            return
+
+        print(f"⚠️ No Dockerfile found for '{self.app_type}', generating via LLM...")
+        prompt = f"Generate a production-ready Dockerfile for a {self.app_type} app deployable in Kubernetes."
+        # Ground the model in the actual repo without pasting the whole tree into the prompt
+        digest = build_repo_digest(self.workspace_path)
+        if digest["files"]:
+            prompt += (
+                "\nBase it on this repository digest (build manifests, entrypoints, config):\n"
+                f"{digest['text']}\nReturn only the Dockerfile."
+            )
+        self.metrics["prompt_tokens_estimate"] = estimate_tokens(prompt)
+        self.metrics["digest"] = digest["stats"]
+        llm_cache = get_resource("llm_cache")
+        # only reuse answers for this stack from this model, matched on the repo digest rather
+        # than on the shared instruction text
+        cache_scope = {"app_type": self.app_type.lower(), "model": model_for("dockerfile_generation")}
+        similarity_text = digest["text"] if digest["files"] else self.app_type
+        cached = llm_cache.get(prompt, bypass=self.bypass_cache, scope=cache_scope, similarity_text=similarity_text)
+        if cached is not None:
+            self.source = "cache"
+            print(f"♻️  Using cached LLM Dockerfile for '{self.app_type}' ({llm_cache.stats()})")
+            yield cached
+            return
+
+        self.source = "llm"
+        parts = []
+        # Dockerfile synthesis is the one call that needs the large model
+        for chunk in get_resource("llm:dockerfile_generation").stream([{"role": "user", "content": prompt}]):
+            text = chunk.content if isinstance(chunk.content, str) else str(chunk.content)
+            if text:
+                parts.append(text)
+                yield text
+        llm_cache.put(prompt, "".join(parts), scope=cache_scope, similarity_text=similarity_text)
+
+    def __iter__(self):
+        start = time.perf_counter()
+        first = None
+        chars = 0
+        for chunk in stream_dockerfile(self.workspace_path, self._chunks()):
+            if first is None:
+                first = time.perf_counter() - start
+            chars += len(chunk)
+            report("dockerfile", source=self.source, chars=chars)
+            yield chunk
+        self.file_path = os.path.join(self.workspace_path, "Dockerfile")
+        save_dockerignore(self.workspace_path, self.app_type)
+        self.metrics.update({
+            "source": self.source,
+            "time_to_first_token_s": round(first if first is not None else 0.0, 3),
+            "total_s": round(time.perf_counter() - start, 3),
+        })
+        print(f"📄 Dockerfile saved to {self.file_path} ({self.metrics})")
+
+    def run(self) -> str:
+        """Consume the stream without rendering it; returns the Dockerfile path."""
+        for _ in self:
+            pass
+        return self.file_path
 
-llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
 
 @tool("fetch_or_generate_dockerfile")
-def fetch_or_generate_dockerfile(app_type: str, workspace_path: str) -> str:
+def fetch_or_generate_dockerfile(app_type: str, workspace_path: str, bypass_cache: bool = False) -> str:
     """
     Fetch or generate Dockerfile template based on app_type.
+    A multi-stage, dependency-first Dockerfile is rendered from the workspace's build
+    manifests when possible; otherwise the Qdrant template or the LLM is used.
+    LLM answers are cached (exact prompt, then similar prompt); bypass_cache skips the cache lookup.
     """
-    collection_name = "dockerfiles"
     print(f"🧩 fetch_or_generate_dockerfile: workspace={workspace_path}, app_type={app_type}")
-
-    # Embed the app_type to do a vector-based semantic search
-    query_vector = embedder.encode(app_type).tolist()
-
-    # Search the most similar Dockerfile
-    search_results = client.search(
-        collection_name=collection_name,
-        query_vector=query_vector,
-        query_filter={"must": [{"key": "app_type", "match": {"value": app_type.lower()}}]},
-        limit=1
-    )
-
-    if search_results:
-        content = search_results[0].payload.get("file_content", "")
-        print(f"✅ Retrieved Dockerfile from Qdrant for '{app_type}'")
-    else:
-        print(f"⚠️ No Dockerfile found for '{app_type}', generating via LLM...")
-        prompt = f"Generate a production-ready Dockerfile for a {app_type} app deployable in Kubernetes."
-        response = llm.chat([{"role": "user", "content": prompt}])
-        content = response.content if hasattr(response, "content") else str(response)
-
-    file_path = save_dockerfile(workspace_path, content)
-    print(f"📄 Dockerfile saved to {file_path}")
-    return file_path
+    return DockerfileGeneration(app_type, workspace_path, bypass_cache=bypass_cache).run()
@@ -2,13 +2,14 @@ import os
 import json
 from langchain.tools import tool
 from helpers.k8s_env_generator import generate_env_yamls
+from helpers.app_type_detector import resolve_app_type
 
 @tool
 def generate_env_yamls_tool(input_text: str) -> str:
     """
     Expects JSON string:
     {
-      "app_type": "python",
+      "app_type": "python",                 # or "auto" to detect from the workspace
       "app_name": "myapp",
       "envs": ["dev","uat"],
       "image_tag": "shan5a6/myapp:v1.0.0",
@@ -31,12 +32,17 @@ def generate_env_yamls_tool(input_text: str) -> str:
     workspace_path = data.get("workspace_path")
     image_tag = data.get("image_tag")
 
-    if not app_type or not app_name or not envs or not workspace_path:
+    if not app_name or not envs or not workspace_path:
         return json.dumps({"status":"failed","error":"missing required fields (app_type, app_name, envs, workspace_path, image_tag)"})
 
     if not os.path.exists(workspace_path):
         return json.dumps({"status":"failed","error":f"workspace_path not found: {workspace_path}"})
 
+    # empty / "auto" app_type -> detect from the workspace marker files
+    app_type = resolve_app_type(app_type, workspace_path)
+    if not app_type:
+        return json.dumps({"status":"failed","error":"app_type not given and could not be detected from the workspace"})
+
     try:
         generated = generate_env_yamls(app_type, app_name, envs, workspace_path, image_tag=image_tag)
         return json.dumps({"status":"success", "generated": generated})